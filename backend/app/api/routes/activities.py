@@ -10,10 +10,12 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core import tenancy
 from app.models.activity import LeadActivity
 from app.models.leads import Lead
 from app.models.user import User
 from app.api.routes.auth import get_current_user
+from app.services.lead_routing import lead_router
 
 router = APIRouter()
 
@@ -47,11 +49,8 @@ async def create_activity(
     Add an activity/note to a lead (requires authentication)
     """
     try:
-        # Verify lead exists and belongs to current user
-        lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        # Verify lead exists and belongs to (or is assigned to) current user
+        lead = tenancy.get_scoped(db, Lead, lead_id, current_user, shared=True)
         if not lead:
             raise HTTPException(status_code=404, detail="Lead not found")
         
@@ -72,8 +71,9 @@ async def create_activity(
         )
         db.add(db_activity)
         
-        # Update lead's last contact date
+        # Update lead's last contact date (stops the routing response timer)
         lead.last_contact_at = datetime.utcnow()
+        lead_router.responded(lead)
         
         db.commit()
         db.refresh(db_activity)
@@ -110,10 +110,7 @@ async def get_activities(
     """
     try:
         # Verify lead exists and belongs to current user
-        lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
         if not lead:
             raise HTTPException(status_code=404, detail="Lead not found")
         
@@ -159,10 +156,7 @@ async def update_activity(
     """
     try:
         # Verify lead belongs to current user
-        lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
         if not lead:
             raise HTTPException(status_code=404, detail="Lead not found")
         
@@ -217,10 +211,7 @@ async def delete_activity(
     """
     try:
         # Verify lead belongs to current user
-        lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
         if not lead:
             raise HTTPException(status_code=404, detail="Lead not found")
         
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core import tenancy
 from app.models.campaigns import Campaign, CampaignStep, CampaignEnrollment
 from app.models.user import User
 from app.api.routes.auth import get_current_user
@@ -46,9 +47,7 @@ async def get_campaigns(
     Get all campaigns for current user
     """
     try:
-        campaigns = db.query(Campaign).filter(
-            Campaign.user_id == current_user.id
-        ).all()
+        campaigns = tenancy.scoped(db, Campaign, current_user).all()
         
         return {
             "success": True,
@@ -69,10 +68,7 @@ async def get_campaign(
     Get a single campaign with all steps
     """
     try:
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -146,10 +142,7 @@ async def update_campaign(
     Update a campaign
     """
     try:
-        db_campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        db_campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not db_campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -195,10 +188,7 @@ async def delete_campaign(
     Delete a campaign
     """
     try:
-        db_campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        db_campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not db_campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -229,10 +219,7 @@ async def add_campaign_step(
     """
     try:
         # Verify campaign ownership
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -275,10 +262,7 @@ async def delete_campaign_step(
     """
     try:
         # Verify campaign ownership
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -326,10 +310,7 @@ async def enroll_leads(
     
     try:
         # Verify campaign ownership
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -340,10 +321,7 @@ async def enroll_leads(
         
         for lead_id in request.lead_ids:
             # Verify lead ownership
-            lead = db.query(Lead).filter(
-                Lead.id == lead_id,
-                Lead.user_id == current_user.id
-            ).first()
+            lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
             
             if not lead:
                 not_found.append(lead_id)
@@ -405,10 +383,7 @@ async def get_enrollments(
     
     try:
         # Verify campaign ownership
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -450,10 +425,7 @@ async def unenroll_lead(
     """
     try:
         # Verify campaign ownership
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -517,10 +489,7 @@ async def send_campaign_emails(
     
     try:
         # Verify campaign ownership and get campaign
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -529,8 +498,7 @@ async def send_campaign_emails(
             raise HTTPException(status_code=400, detail="Campaign is not active. Set status to 'active' first.")
         
         # Get Gmail token
-        gmail_token = db.query(GmailToken).filter(
-            GmailToken.user_id == current_user.id,
+        gmail_token = tenancy.scoped(db, GmailToken, current_user).filter(
             GmailToken.is_active == True
         ).first()
         
@@ -716,10 +684,7 @@ async def send_test_email(
     
     try:
         # Verify campaign ownership
-        campaign = db.query(Campaign).filter(
-            Campaign.id == campaign_id,
-            Campaign.user_id == current_user.id
-        ).first()
+        campaign = tenancy.get_scoped(db, Campaign, campaign_id, current_user)
         
         if not campaign:
             raise HTTPException(status_code=404, detail="Campaign not found")
@@ -734,8 +699,7 @@ async def send_test_email(
             raise HTTPException(status_code=400, detail="Campaign has no steps")
         
         # Get Gmail token
-        gmail_token = db.query(GmailToken).filter(
-            GmailToken.user_id == current_user.id,
+        gmail_token = tenancy.scoped(db, GmailToken, current_user).filter(
             GmailToken.is_active == True
         ).first()
         
@@ -4,10 +4,16 @@ Handles CRM connection, validation, and sync operations
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
-from app.crm.boldtrail import BoldTrailCRM
+from app.core.database import get_db
+from app.crm import CRMFactory
+from app.crm import store as crm_store
+from app.services.crm_import import crm_importer
+from app.models.user import User
+from app.api.routes.auth import get_current_user
 
 router = APIRouter()
 
@@ -15,8 +21,29 @@ class CRMConnectRequest(BaseModel):
     provider: str
     credentials: Dict[str, Any]
 
+class CRMRotateRequest(BaseModel):
+    credentials: Dict[str, Any]
+
+async def _validate_credentials(provider: str, credentials: Dict[str, Any]) -> Optional[str]:
+    """Build a throwaway handler and test it; returns an error message or None"""
+    try:
+        crm = CRMFactory.create_handler(provider, credentials)
+    except NotImplementedError:
+        return f"CRM provider '{provider}' not yet implemented"
+    except ValueError as e:
+        return str(e)
+    
+    if not await crm.validate_connection():
+        return f"Invalid {provider} credentials or connection failed"
+    
+    return None
+
 @router.post("/connect")
-async def connect_crm(request: CRMConnectRequest):
+async def connect_crm(
+    request: CRMConnectRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
     Connect a CRM provider
     
@@ -27,74 +54,152 @@ async def connect_crm(request: CRMConnectRequest):
     4. Return success + connection ID
     """
     try:
-        # Only BoldTrail is implemented for now
-        if request.provider.lower() == "boldtrail":
-            # Create BoldTrail handler with credentials
-            crm = BoldTrailCRM(request.credentials)
-            
-            # Validate connection
-            is_valid = await crm.validate_connection()
-            
-            if not is_valid:
-                return {
-                    "success": False,
-                    "error": "Invalid BoldTrail credentials or connection failed"
-                }
-            
-            # TODO: Encrypt and store credentials in database
-            
-            return {
-                "success": True,
-                "message": f"Successfully connected to {request.provider}",
-                "connection_id": "boldtrail-connection"
-            }
-        else:
+        error = await _validate_credentials(request.provider, request.credentials)
+        if error:
             return {
                 "success": False,
-                "error": f"CRM provider '{request.provider}' not yet implemented"
+                "error": error
             }
-            
-    except ValueError as e:
+        
+        connection = crm_store.save_connection(
+            db, current_user.id, request.provider, request.credentials
+        )
+        
         return {
-            "success": False,
-            "error": str(e)
+            "success": True,
+            "message": f"Successfully connected to {request.provider}",
+            "connection_id": connection.id
         }
+    
     except Exception as e:
+        db.rollback()
         return {
             "success": False,
             "error": f"Connection error: {str(e)}"
         }
 
+@router.put("/connections/{connection_id}/credentials")
+async def rotate_credentials(
+    connection_id: int,
+    request: CRMRotateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Replace the stored credentials for a connection (key rotation)
+    The cached handler is invalidated so the next request uses the new key
+    """
+    connection = crm_store.get_connection(db, current_user.id, connection_id=connection_id)
+    if not connection:
+        raise HTTPException(status_code=404, detail="CRM connection not found")
+    
+    error = await _validate_credentials(connection.crm_provider, request.credentials)
+    if error:
+        return {
+            "success": False,
+            "error": error
+        }
+    
+    connection = crm_store.save_connection(
+        db, current_user.id, connection.crm_provider, request.credentials
+    )
+    
+    return {
+        "success": True,
+        "connection": connection.to_dict()
+    }
+
 @router.get("/status")
-async def get_crm_status():
+async def get_crm_status(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
     Get current CRM connection status for authenticated user
     """
-    # TODO: Query crm_connections for user
+    connections = crm_store.get_connections(db, current_user.id)
+    primary = connections[0] if connections else None
+    
     return {
-        "connected": True,
-        "provider": "followupboss",
-        "last_sync": "2024-02-04T10:30:00Z"
+        "connected": any(c.is_connected for c in connections),
+        "provider": primary.crm_provider if primary else None,
+        "last_sync": primary.last_sync_at.isoformat() if primary and primary.last_sync_at else None,
+        "connections": [c.to_dict() for c in connections]
+    }
+
+@router.post("/validate")
+async def validate_connections(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Re-test every stored connection concurrently using the cached handlers
+    """
+    multi = crm_store.get_multi_handler(db, current_user.id, timeout=15.0)
+    if not multi:
+        return {
+            "success": True,
+            "providers": {}
+        }
+    
+    results = await multi.validate_connection()
+    
+    return {
+        "success": all(result.success for result in results.values()),
+        "providers": {name: result.to_dict() for name, result in results.items()}
     }
 
 @router.post("/sync")
-async def trigger_sync():
+async def trigger_sync(
+    full: bool = False,
+    current_user: User = Depends(get_current_user)
+):
     """
     Manually trigger a CRM sync (fetch latest leads)
+    
+    Imports leads updated since each connection's last sync into the leads
+    table; full=true re-imports everything.
     """
-    # TODO: Queue Celery job for immediate sync
+    results = await crm_importer.sync_user(current_user.id, full=full)
+    if not results:
+        return {
+            "success": False,
+            "error": "No connected CRM"
+        }
+    
     return {
-        "success": True,
-        "message": "Sync job queued"
+        "success": all(result["success"] for result in results.values()),
+        "inserted": sum(result["inserted"] for result in results.values()),
+        "updated": sum(result["updated"] for result in results.values()),
+        "providers": results
     }
 
 @router.delete("/disconnect")
-async def disconnect_crm():
+async def disconnect_crm(
+    provider: Optional[str] = None,
+    connection_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
     Disconnect CRM (delete encrypted credentials)
+    Without provider/connection_id every connection for the user is removed
     """
-    # TODO: Soft delete or hard delete from crm_connections
+    if provider or connection_id is not None:
+        connection = crm_store.get_connection(
+            db, current_user.id, provider=provider, connection_id=connection_id
+        )
+        if not connection:
+            raise HTTPException(status_code=404, detail="CRM connection not found")
+        connections = [connection]
+    else:
+        connections = crm_store.get_connections(db, current_user.id)
+    
+    for connection in connections:
+        crm_store.delete_connection(db, connection)
+    
     return {
         "success": True,
-        "message": "CRM disconnected"
+        "message": "CRM disconnected",
+        "disconnected": len(connections)
     }
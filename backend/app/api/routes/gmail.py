@@ -26,6 +26,7 @@ except ImportError:
     GMAIL_AVAILABLE = False
 
 from app.core.database import get_db
+from app.core import tenancy
 from app.models.gmail_oauth import GmailToken
 from app.models.user import User
 from app.api.routes.auth import get_current_user
@@ -204,8 +205,7 @@ async def get_gmail_status(
     Check if user has connected Gmail
     """
     try:
-        token = db.query(GmailToken).filter(
-            GmailToken.user_id == current_user.id,
+        token = tenancy.scoped(db, GmailToken, current_user).filter(
             GmailToken.is_active == True
         ).first()
         
@@ -233,9 +233,7 @@ async def disconnect_gmail(
     Disconnect Gmail account
     """
     try:
-        token = db.query(GmailToken).filter(
-            GmailToken.user_id == current_user.id
-        ).first()
+        token = tenancy.scoped(db, GmailToken, current_user).first()
         
         if token:
             # Actually delete the token to allow fresh reconnection
@@ -261,9 +259,7 @@ async def force_clear_gmail_tokens(
     """
     try:
         # Delete ALL tokens for this user
-        deleted_count = db.query(GmailToken).filter(
-            GmailToken.user_id == current_user.id
-        ).delete()
+        deleted_count = tenancy.scoped(db, GmailToken, current_user).delete()
         
         db.commit()
         
@@ -294,8 +290,7 @@ async def send_gmail(
             )
         
         # Get user's Gmail token
-        token = db.query(GmailToken).filter(
-            GmailToken.user_id == current_user.id,
+        token = tenancy.scoped(db, GmailToken, current_user).filter(
             GmailToken.is_active == True
         ).first()
         
@@ -372,8 +367,7 @@ async def get_gmail_quota(
     Check Gmail sending quota (10,000 emails/day per user)
     """
     try:
-        token = db.query(GmailToken).filter(
-            GmailToken.user_id == current_user.id,
+        token = tenancy.scoped(db, GmailToken, current_user).filter(
             GmailToken.is_active == True
         ).first()
         
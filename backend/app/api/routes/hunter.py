@@ -0,0 +1,160 @@
+"""
+The Hunter Routes
+Run FSBO crawls on demand and stream leads back as they are found
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Optional
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core import tenancy
+from app.core.sse import sse_response
+from app.models.user import User
+from app.models.hunter import HunterRun
+from app.api.routes.auth import get_current_user
+from app.services.hunter import hunter_scraper, CrawlStats
+from app.services.skip_trace import skip_tracer, SkipTraceRunStats
+from app.services.hunter_push import hunter_pusher
+
+router = APIRouter()
+
+class HunterRunRequest(BaseModel):
+    zip_codes: List[str] = []
+    craigslist_cities: List[List[str]] = []  # [["Austin", "TX"], ...]
+    new_only: bool = True  # Skip listings already seen (unchanged price)
+    skip_trace: bool = False
+    max_concurrency: Optional[int] = None
+
+class HunterPushRequest(BaseModel):
+    hunter_lead_ids: List[int]
+
+@router.post("/run")
+async def run_hunter(
+    run_request: HunterRunRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a crawl and stream leads as Server-Sent Events
+    
+    Events:
+        started  {"targets": N}                  sent immediately
+        lead     FSBOLead.to_dict()              one per listing, as soon as its page is parsed
+        done     {"leads": N, "crawl": {...}}     crawl stats at the end
+        error    {"error": "..."}
+    
+    Read it with fetch() and a stream reader (EventSource can't send the
+    Authorization header). Closing the connection cancels the crawl.
+    Streamed leads are a preview and aren't saved: with new_only they are not
+    marked seen, so the scheduled run still picks them up.
+    """
+    zip_codes = [z.strip() for z in run_request.zip_codes if z.strip()]
+    cities = [tuple(city) for city in run_request.craigslist_cities]
+    if any(len(city) != 2 for city in cities):
+        raise HTTPException(status_code=400, detail="craigslist_cities entries must be [city, state]")
+    
+    targets = len(zip_codes) + len(cities)
+    if not targets:
+        raise HTTPException(status_code=400, detail="Provide zip_codes or craigslist_cities")
+    if targets > settings.HUNTER_MAX_TARGETS_PER_RUN:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.HUNTER_MAX_TARGETS_PER_RUN} ZIP codes / cities per run"
+        )
+    
+    user_id = current_user.id
+    
+    async def events():
+        yield "started", {"targets": targets}
+        
+        crawl_stats = CrawlStats()
+        crawl_kwargs = {"max_concurrency": run_request.max_concurrency, "stats": crawl_stats}
+        if run_request.new_only:
+            # Small index batches so the first lead isn't held back for 100 listings.
+            # A preview: streamed leads aren't stored, so they stay unseen for scheduled runs
+            leads = hunter_scraper.crawl_new(
+                zip_codes, cities, user_id=user_id, index_batch_size=20, mark_seen=False, **crawl_kwargs
+            )
+        else:
+            leads = hunter_scraper.crawl(zip_codes, cities, **crawl_kwargs)
+        
+        trace_stats = SkipTraceRunStats()
+        if run_request.skip_trace and skip_tracer.provider is not None:
+            leads = skip_tracer.enrich_stream(leads, batch_size=20, stats=trace_stats)
+        
+        count = 0
+        try:
+            async for lead in leads:
+                count += 1
+                yield "lead", lead.to_dict(), str(count)
+        finally:
+            await leads.aclose()
+        
+        summary = {"leads": count, "crawl": crawl_stats.to_dict()}
+        if trace_stats.leads:
+            summary["skip_trace"] = trace_stats.to_dict()
+        yield "done", summary
+    
+    print(f"🔍 Hunter stream started for user {user_id}: {targets} targets")
+    return sse_response(request, events(), queue_size=settings.HUNTER_STREAM_BUFFER)
+
+@router.get("/runs")
+async def list_runs(
+    limit: int = 20,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Recent scheduled / manual Hunter runs for the current user"""
+    runs = tenancy.scoped(db, HunterRun, current_user).order_by(
+        HunterRun.started_at.desc()
+    ).limit(min(limit, 100)).all()
+    
+    return {
+        "success": True,
+        "runs": [run.to_dict() for run in runs]
+    }
+
+@router.post("/runs/{run_id}/push")
+async def push_run(
+    run_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Push a run's leads to your leads and every connected CRM
+    
+    Safe to retry: leads already created locally or in a CRM are skipped.
+    """
+    run = tenancy.get_scoped(db, HunterRun, run_id, current_user)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    
+    stats = await hunter_pusher.push_run(run_id)
+    if stats is None:
+        raise HTTPException(status_code=409, detail="This run is already being pushed")
+    
+    return {
+        "success": True,
+        "push": stats
+    }
+
+@router.post("/leads/push")
+async def push_leads(
+    push_request: HunterPushRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Push selected Hunter leads to your leads and every connected CRM"""
+    if not push_request.hunter_lead_ids:
+        raise HTTPException(status_code=400, detail="No leads selected")
+    
+    stats = await hunter_pusher.push_leads(current_user, push_request.hunter_lead_ids)
+    if stats is None:
+        raise HTTPException(status_code=409, detail="These leads are already being pushed")
+    
+    return {
+        "success": True,
+        "push": stats
+    }
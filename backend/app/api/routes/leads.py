@@ -10,9 +10,13 @@ import csv
 import io
 
 from app.core.database import get_db
-from app.models.leads import Lead
+from app.core import tenancy
+from app.models.leads import Lead, normalize_status
 from app.models.user import User
 from app.api.routes.auth import get_current_user
+from app.services import team_events
+from app.services.team_events import team_event_bus
+from app.services.lead_routing import lead_router
 
 router = APIRouter()
 
@@ -81,7 +85,7 @@ async def create_lead(
             last_name=lead.last_name,
             email=lead.email,
             phone=lead.phone,
-            status=lead.status or 'New',
+            status=normalize_status(lead.status) or 'New',
             tags=lead.tags or [],
             location=lead.location,
             address=lead.address,
@@ -131,11 +135,10 @@ async def get_lead_stats(
     """
     try:
         # Count total leads for this user
-        total = db.query(Lead).filter(Lead.user_id == current_user.id).count()
+        total = tenancy.scoped(db, Lead, current_user).count()
         
         # Count active leads for this user
-        active = db.query(Lead).filter(
-            Lead.user_id == current_user.id,
+        active = tenancy.scoped(db, Lead, current_user).filter(
             Lead.status.in_(['Active', 'New', 'active', 'new', 'Contacted', 'Qualified'])
         ).count()
         
@@ -173,14 +176,12 @@ async def update_lead(
     """
     try:
         # Find the lead - must belong to current user
-        db_lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        db_lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
         if not db_lead:
             raise HTTPException(status_code=404, detail="Lead not found")
         
         # Update only provided fields
+        status_event = None
         if lead_update.first_name is not None:
             db_lead.first_name = lead_update.first_name
         if lead_update.last_name is not None:
@@ -190,7 +191,10 @@ async def update_lead(
         if lead_update.phone is not None:
             db_lead.phone = lead_update.phone
         if lead_update.status is not None:
-            db_lead.status = lead_update.status
+            status_event = team_events.record_lead_status_changed(
+                db, db_lead, db_lead.status, normalize_status(lead_update.status), current_user
+            )
+            db_lead.status = normalize_status(lead_update.status)
         if lead_update.tags is not None:
             db_lead.tags = lead_update.tags
         if lead_update.location is not None:
@@ -206,6 +210,8 @@ async def update_lead(
         
         db.commit()
         db.refresh(db_lead)
+        if status_event is not None:
+            team_event_bus.notify(status_event.team_id)
         
         return {
             "success": True,
@@ -244,10 +250,7 @@ async def delete_lead(
     """
     try:
         # Find the lead - must belong to current user
-        db_lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        db_lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
         if not db_lead:
             raise HTTPException(status_code=404, detail="Lead not found")
         
@@ -276,10 +279,7 @@ async def get_lead(
     Get a single lead by ID (only your own)
     """
     try:
-        db_lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        db_lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
         if not db_lead:
             raise HTTPException(status_code=404, detail="Lead not found")
         
@@ -330,6 +330,7 @@ async def import_leads_csv(
         reader = csv.DictReader(csv_file)
         
         leads_imported = []
+        db_leads = []
         
         for row in reader:
             # Smart column mapping - find the right columns regardless of naming
@@ -450,7 +451,7 @@ async def import_leads_csv(
                     last_name=lead_data.get('last_name'),
                     email=lead_data.get('email'),
                     phone=lead_data.get('phone'),
-                    status=lead_data.get('status', 'New'),
+                    status=normalize_status(lead_data.get('status')) or 'New',
                     tags=lead_data.get('tags', []),
                     location=lead_data.get('location'),
                     price_min=lead_data.get('price_min'),
@@ -465,10 +466,14 @@ async def import_leads_csv(
                 )
                 db.add(db_lead)
                 leads_imported.append(lead_data)
+                db_leads.append(db_lead)
         
-        # Commit all leads to database
+        # Commit all leads to database, then hand them to the team's routing (if on)
         if leads_imported:
+            db.flush()
+            lead_ids = [db_lead.id for db_lead in db_leads]
             db.commit()
+            lead_router.route_leads(lead_ids)
         
         return {
             "success": True,
@@ -494,7 +499,7 @@ async def get_leads(
     """
     try:
         # Query database - filter by user_id
-        query = db.query(Lead).filter(Lead.user_id == current_user.id)
+        query = tenancy.scoped(db, Lead, current_user)
         
         # Filter by status if provided
         if status:
@@ -551,10 +556,7 @@ async def get_lead_campaigns(
     
     try:
         # Verify lead ownership
-        lead = db.query(Lead).filter(
-            Lead.id == lead_id,
-            Lead.user_id == current_user.id
-        ).first()
+        lead = tenancy.get_scoped(db, Lead, lead_id, current_user)
         
         if not lead:
             raise HTTPException(status_code=404, detail="Lead not found")
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core import tenancy
 from app.models.tasks import Task
 from app.models.user import User
 from app.api.routes.auth import get_current_user
@@ -47,7 +48,7 @@ async def get_tasks(
     Get all tasks for current user
     """
     try:
-        query = db.query(Task).filter(Task.user_id == current_user.id)
+        query = tenancy.scoped(db, Task, current_user)
         
         # Filter by completion status
         if completed is not None:
@@ -124,10 +125,7 @@ async def update_task(
     Update a task
     """
     try:
-        db_task = db.query(Task).filter(
-            Task.id == task_id,
-            Task.user_id == current_user.id
-        ).first()
+        db_task = tenancy.get_scoped(db, Task, task_id, current_user)
         
         if not db_task:
             raise HTTPException(status_code=404, detail="Task not found")
@@ -181,10 +179,7 @@ async def delete_task(
     Delete a task
     """
     try:
-        db_task = db.query(Task).filter(
-            Task.id == task_id,
-            Task.user_id == current_user.id
-        ).first()
+        db_task = tenancy.get_scoped(db, Task, task_id, current_user)
         
         if not db_task:
             raise HTTPException(status_code=404, detail="Task not found")
@@ -3,17 +3,25 @@ Team Lead Management Routes
 Assign leads to team members and track performance
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Depends, Request, Header, Query, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core import tenancy
+from app.core.sse import sse_response
 from app.models.user import User
 from app.models.leads import Lead
 from app.models.team_simple import Team
 from app.api.routes.auth import get_current_user
+from app.services import team_stats, team_events, lead_assignment, team_board
+from app.services.team_events import team_event_bus
+from app.services.lead_routing import lead_router, STRATEGIES
 
 router = APIRouter()
 
@@ -25,6 +33,19 @@ class AssignMultipleLeadsRequest(BaseModel):
     lead_ids: List[int]
     assignee_id: int
 
+class BulkAssignRequest(BaseModel):
+    assignee_id: int
+    lead_ids: Optional[List[int]] = None
+    # Filters (ANDed with lead_ids and each other)
+    current_assignee_id: Optional[int] = None
+    unassigned_only: bool = False
+    tag: Optional[str] = None
+    status: Optional[str] = None
+
+class RoutingSettingsRequest(BaseModel):
+    strategy: Optional[str] = None  # round_robin, weighted, least_loaded; None turns routing off
+    weights: Dict[int, int] = {}  # user_id -> weight (default 1, 0 skips the member)
+
 @router.post("/assign-lead")
 async def assign_lead_to_member(
     request: AssignLeadRequest,
@@ -40,8 +61,8 @@ async def assign_lead_to_member(
             detail="Only team leaders can assign leads"
         )
     
-    # Get lead
-    lead = db.query(Lead).filter(Lead.id == request.lead_id).first()
+    # Get lead (owned by or assigned to someone on the team)
+    lead = tenancy.get_scoped(db, Lead, request.lead_id, current_user, shared=True, team=True)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     
@@ -57,9 +78,14 @@ async def assign_lead_to_member(
         )
     
     # Assign lead
+    team_stats.record_leads_reassigned(db, [lead.assigned_to], request.assignee_id)
+    lead_router.release(lead)
     lead.assigned_to = request.assignee_id
     lead.assigned_at = datetime.utcnow()
+    team_events.record_leads_assigned(db, [lead], assignee, actor_id=current_user.id)
     db.commit()
+    team_stats.invalidate_team(current_user.team_id)
+    team_event_bus.notify(assignee.team_id)
     
     return {
         "success": True,
@@ -92,16 +118,13 @@ async def assign_multiple_leads(
             detail="Can only assign to members of your team"
         )
     
-    # Assign all leads
-    assigned_count = 0
-    for lead_id in request.lead_ids:
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
-        if lead:
-            lead.assigned_to = request.assignee_id
-            lead.assigned_at = datetime.utcnow()
-            assigned_count += 1
-    
-    db.commit()
+    # One chunked, set-based UPDATE (leads outside the team are skipped)
+    result = await asyncio.to_thread(
+        lead_assignment.bulk_assign,
+        current_user.team_id, assignee, current_user.id,
+        lead_ids=request.lead_ids
+    )
+    assigned_count = result["assigned"] + result["already_assigned"]
     
     return {
         "success": True,
@@ -109,6 +132,115 @@ async def assign_multiple_leads(
         "message": f"Assigned {assigned_count} leads to {assignee.full_name or assignee.email}"
     }
 
+@router.post("/bulk-assign")
+async def bulk_assign_leads(
+    request: BulkAssignRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Assign leads by id list and/or filter to one team member
+    
+    e.g. hand a departing agent's leads to someone else:
+        {"assignee_id": 12, "current_assignee_id": 7}
+    Only leads owned by or assigned to your team are touched.
+    """
+    
+    if not current_user.is_team_leader or not current_user.team_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only team leaders can assign leads"
+        )
+    
+    if request.lead_ids is None and request.current_assignee_id is None and not (
+        request.unassigned_only or request.tag or request.status
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Give lead_ids or at least one filter (current_assignee_id, unassigned_only, tag, status)"
+        )
+    
+    assignee = db.query(User).filter(User.id == request.assignee_id).first()
+    if not assignee:
+        raise HTTPException(status_code=404, detail="Assignee not found")
+    
+    if assignee.team_id != current_user.team_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Can only assign to members of your team"
+        )
+    
+    result = await asyncio.to_thread(
+        lead_assignment.bulk_assign,
+        current_user.team_id, assignee, current_user.id,
+        lead_ids=request.lead_ids,
+        current_assignee_id=request.current_assignee_id,
+        unassigned_only=request.unassigned_only,
+        tag=request.tag,
+        status=request.status
+    )
+    
+    return {
+        "success": True,
+        **result,
+        "message": f"Assigned {result['assigned']} leads to {assignee.full_name or assignee.email}"
+    }
+
+@router.get("/routing")
+async def get_routing_settings(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Automatic lead routing settings for your team"""
+    
+    team = db.query(Team).filter(Team.id == current_user.team_id).first() if current_user.team_id else None
+    if not team:
+        raise HTTPException(status_code=404, detail="Not part of any team")
+    
+    return {
+        "success": True,
+        "strategy": team.routing_strategy,
+        "weights": team.routing_weights or {},
+        "strategies": list(STRATEGIES),
+        "response_timeout_minutes": settings.LEAD_RESPONSE_TIMEOUT_MINUTES,
+        "max_reassignments": settings.LEAD_ROUTING_MAX_REASSIGNMENTS,
+        "engine": lead_router.get_stats()
+    }
+
+@router.put("/routing")
+async def update_routing_settings(
+    request: RoutingSettingsRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Turn automatic lead routing on or off and set member weights (leaders only)"""
+    
+    team = db.query(Team).filter(Team.id == current_user.team_id).first() if current_user.team_id else None
+    if not team:
+        raise HTTPException(status_code=404, detail="Not part of any team")
+    if team.leader_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the team leader can change lead routing"
+        )
+    if request.strategy is not None and request.strategy not in STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid strategy. Must be one of: {', '.join(STRATEGIES)}"
+        )
+    if any(weight < 0 for weight in request.weights.values()):
+        raise HTTPException(status_code=400, detail="Weights must be 0 or more")
+    
+    team.routing_strategy = request.strategy
+    team.routing_weights = {str(user_id): weight for user_id, weight in request.weights.items()}
+    db.commit()
+    
+    return {
+        "success": True,
+        "strategy": team.routing_strategy,
+        "weights": team.routing_weights
+    }
+
 @router.get("/my-assigned-leads")
 async def get_my_assigned_leads(
     current_user: User = Depends(get_current_user),
@@ -131,7 +263,7 @@ async def get_unassigned_leads(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get unassigned leads (team leaders only)"""
+    """Get the team's unassigned leads (team leaders only)"""
     
     if not current_user.is_team_leader:
         raise HTTPException(
@@ -139,7 +271,7 @@ async def get_unassigned_leads(
             detail="Only team leaders can view unassigned leads"
         )
     
-    leads = db.query(Lead).filter(
+    leads = tenancy.scoped(db, Lead, current_user, team=True).filter(
         Lead.assigned_to.is_(None)
     ).order_by(Lead.created_at.desc()).all()
     
@@ -149,6 +281,51 @@ async def get_unassigned_leads(
         "leads": [lead.to_dict() for lead in leads]
     }
 
+@router.get("/team-board")
+async def get_team_board(
+    assignee_id: Optional[int] = None,
+    unassigned: bool = False,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    tag: Optional[str] = None,
+    limit: int = 50,
+    before: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Every lead across the team, as lightweight cards (team leaders only)
+    
+    Newest first; pass next_cursor back as before= to load the next page.
+    """
+    
+    if not current_user.is_team_leader:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only team leaders can view the team board"
+        )
+    
+    if not current_user.team_id:
+        return {
+            "success": True,
+            "message": "Not part of any team",
+            "leads": [],
+            "next_cursor": None
+        }
+    
+    leads, next_cursor = team_board.page(
+        db, current_user.team_id, limit=limit, before=before,
+        current_assignee_id=assignee_id,
+        unassigned_only=unassigned,
+        tag=tag,
+        status=status_filter
+    )
+    
+    return {
+        "success": True,
+        "leads": leads,
+        "next_cursor": next_cursor
+    }
+
 @router.get("/team-performance")
 async def get_team_performance(
     current_user: User = Depends(get_current_user),
@@ -163,38 +340,8 @@ async def get_team_performance(
             "performance": []
         }
     
-    # Get all team members
-    members = db.query(User).filter(User.team_id == current_user.team_id).all()
-    
-    performance = []
-    for member in members:
-        # Count assigned leads
-        assigned_leads = db.query(Lead).filter(
-            Lead.assigned_to == member.id
-        ).count()
-        
-        # Count completed tasks
-        from app.models.team_simple import TaskAssignment
-        completed_tasks = db.query(TaskAssignment).filter(
-            TaskAssignment.assignee_id == member.id,
-            TaskAssignment.status == "completed"
-        ).count()
-        
-        # Count pending tasks
-        pending_tasks = db.query(TaskAssignment).filter(
-            TaskAssignment.assignee_id == member.id,
-            TaskAssignment.status == "pending"
-        ).count()
-        
-        performance.append({
-            'user_id': member.id,
-            'name': member.full_name or member.email,
-            'email': member.email,
-            'is_leader': member.is_team_leader,
-            'assigned_leads': assigned_leads,
-            'completed_tasks': completed_tasks,
-            'pending_tasks': pending_tasks
-        })
+    # One grouped query for every member (cached per team for a few seconds)
+    performance = team_stats.get_team_performance(db, current_user.team_id)
     
     return {
         "success": True,
@@ -204,59 +351,51 @@ async def get_team_performance(
 @router.get("/team-activity")
 async def get_team_activity(
     limit: int = 20,
+    before: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get recent team activity feed"""
+    """
+    Team activity feed, newest first
+    
+    Pass next_cursor back as before= to load the next page.
+    """
     
     if not current_user.team_id:
         return {
             "success": True,
             "message": "Not part of any team",
-            "activity": []
+            "activity": [],
+            "next_cursor": None
         }
     
-    activity = []
-    
-    # Recent lead assignments
-    recent_assignments = db.query(Lead).filter(
-        Lead.assigned_to.isnot(None),
-        Lead.assigned_at.isnot(None)
-    ).order_by(Lead.assigned_at.desc()).limit(10).all()
-    
-    for lead in recent_assignments:
-        assignee = db.query(User).filter(User.id == lead.assigned_to).first()
-        if assignee and assignee.team_id == current_user.team_id:
-            activity.append({
-                'type': 'lead_assigned',
-                'timestamp': lead.assigned_at.isoformat() if lead.assigned_at else None,
-                'message': f"{assignee.full_name or assignee.email} was assigned lead: {lead.first_name} {lead.last_name}",
-                'user_name': assignee.full_name or assignee.email
-            })
-    
-    # Recent task completions
-    from app.models.team_simple import TaskAssignment, Task
-    recent_completions = db.query(TaskAssignment).filter(
-        TaskAssignment.status == "completed",
-        TaskAssignment.completed_at.isnot(None)
-    ).order_by(TaskAssignment.completed_at.desc()).limit(10).all()
-    
-    for assignment in recent_completions:
-        task = db.query(Task).filter(Task.id == assignment.task_id).first()
-        assignee = db.query(User).filter(User.id == assignment.assignee_id).first()
-        
-        if task and assignee and assignee.team_id == current_user.team_id:
-            activity.append({
-                'type': 'task_completed',
-                'timestamp': assignment.completed_at.isoformat() if assignment.completed_at else None,
-                'message': f"{assignee.full_name or assignee.email} completed task: {task.title}",
-                'user_name': assignee.full_name or assignee.email
-            })
-    
-    # Sort by timestamp
-    activity.sort(key=lambda x: x['timestamp'] or '', reverse=True)
+    activity, next_cursor = team_events.page(db, current_user.team_id, limit=limit, before=before)
     
     return {
         "success": True,
-        "activity": activity[:limit]
+        "activity": activity,
+        "next_cursor": next_cursor
     }
+
+@router.get("/team-activity/stream")
+async def stream_team_activity(
+    request: Request,
+    after: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Live team activity as Server-Sent Events
+    
+    Sends an "activity" event (same shape as the feed items, id = event id)
+    for each new event. Starts after the given id, or the Last-Event-ID a
+    reconnecting EventSource sends, or else from now.
+    """
+    
+    if not current_user.team_id:
+        raise HTTPException(status_code=404, detail="Not part of any team")
+    
+    if after is None and last_event_id and last_event_id.isdigit():
+        after = int(last_event_id)
+    
+    return sse_response(request, team_event_bus.stream(current_user.team_id, after=after))
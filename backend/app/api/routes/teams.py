@@ -2,16 +2,22 @@
 Team Management API Routes
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, status
 from pydantic import BaseModel
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, insert_ignore
+from app.core import tenancy
 from app.models.user import User
 from app.models.team_simple import Team, Task, TaskAssignment
 from app.api.routes.auth import get_current_user
+from app.services import team_stats, team_events
+from app.services.team_events import team_event_bus
+from app.services.task_calendar import sync_task_invites
+from app.services.calendar_sync import calendar_sync
 
 router = APIRouter()
 
@@ -43,6 +49,9 @@ class UpdateTaskStatusRequest(BaseModel):
     status: str  # pending, accepted, declined, completed
     notes: Optional[str] = None
 
+class CalendarSyncRequest(BaseModel):
+    task_ids: Optional[List[int]] = None  # Re-read these tasks' invites now; None syncs your calendar
+
 @router.post("/create")
 async def create_team(
     request: CreateTeamRequest,
@@ -64,9 +73,12 @@ async def create_team(
         db.refresh(new_team)
         
         # Make user a team leader
+        previous_team_id = current_user.team_id
+        team_stats.record_member_moved(db, current_user.id, previous_team_id, new_team.id)
         current_user.is_team_leader = True
         current_user.team_id = new_team.id
         db.commit()
+        team_stats.invalidate_team(previous_team_id)
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -112,8 +124,11 @@ async def invite_member(
         raise HTTPException(status_code=404, detail=f"User with email {request.email} not found")
     
     # Add to team
+    previous_team_id = user_to_invite.team_id
+    team_stats.record_member_moved(db, user_to_invite.id, previous_team_id, team.id)
     user_to_invite.team_id = team.id
     db.commit()
+    team_stats.invalidate_team(team.id, previous_team_id)
     
     return {
         "success": True,
@@ -187,6 +202,8 @@ async def create_task(
         team_id=request.team_id or current_user.team_id
     )
     
+    # Seed the team's rollup row before the commit so its count doesn't already include this task
+    team_stats.prepare(new_task.team_id)
     db.add(new_task)
     db.commit()
     db.refresh(new_task)
@@ -198,7 +215,9 @@ async def create_task(
         status="accepted"  # Creator auto-accepts their own task
     )
     db.add(assignment)
+    team_stats.record(db, {new_task.team_id: {"total_tasks": 1}})
     db.commit()
+    team_stats.invalidate_team(new_task.team_id)
     
     return {
         "success": True,
@@ -208,10 +227,16 @@ async def create_task(
 @router.post("/tasks/assign")
 async def assign_task(
     request: AssignTaskRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Assign task to team members"""
+    """
+    Assign task to team members
+    
+    One INSERT ... ON CONFLICT DO NOTHING for all assignees; the unique
+    (task_id, assignee_id) constraint skips anyone already assigned.
+    """
     
     # Find task
     task = db.query(Task).filter(Task.id == request.task_id).first()
@@ -225,25 +250,27 @@ async def assign_task(
             detail="You don't have permission to assign this task"
         )
     
-    # Create assignments
+    # Create assignments (rows already present are skipped by the database)
+    assignee_ids = list(dict.fromkeys(request.assignee_ids))
     assignments_created = []
-    for assignee_id in request.assignee_ids:
-        # Check if already assigned
-        existing = db.query(TaskAssignment).filter(
-            TaskAssignment.task_id == request.task_id,
-            TaskAssignment.assignee_id == assignee_id
-        ).first()
-        
-        if not existing:
-            assignment = TaskAssignment(
-                task_id=request.task_id,
-                assignee_id=assignee_id,
-                status="pending"
-            )
-            db.add(assignment)
-            assignments_created.append(assignee_id)
+    if assignee_ids:
+        team_stats.prepare(task.team_id)
+        assignments_created = db.scalars(
+            insert_ignore(TaskAssignment, db.get_bind()).returning(TaskAssignment.assignee_id),
+            [
+                {"task_id": task.id, "assignee_id": assignee_id, "status": "pending"}
+                for assignee_id in assignee_ids
+            ]
+        ).all()
     
+    if assignments_created:
+        team_stats.record(db, {task.team_id: {"pending_tasks": len(assignments_created)}})
     db.commit()
+    team_stats.invalidate_team(task.team_id, current_user.team_id)
+    
+    # One calendar event for the task, inviting every assignee
+    if assignments_created and task.due_date:
+        background_tasks.add_task(sync_task_invites, task.id)
     
     return {
         "success": True,
@@ -251,6 +278,36 @@ async def assign_task(
         "assigned_to": assignments_created
     }
 
+@router.post("/tasks/calendar-sync")
+async def sync_task_calendar(
+    request: CalendarSyncRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Pull task invite RSVPs from Google Calendar into assignment statuses
+    
+    Without task_ids, syncs what changed on your calendar since the last sync.
+    With task_ids (tasks you created or your team's), re-reads their events
+    in batch requests.
+    """
+    
+    if request.task_ids:
+        task_ids = [
+            task_id for (task_id,) in db.query(Task.id).filter(
+                Task.id.in_(request.task_ids),
+                or_(tenancy.tenant_filter(Task, current_user), Task.creator_id == current_user.id)
+            )
+        ]
+        result = await calendar_sync.sync_tasks(task_ids)
+    else:
+        result = await calendar_sync.sync_user(current_user.id)
+    
+    return {
+        "success": "error" not in result,
+        **result
+    }
+
 @router.post("/tasks/update-status")
 async def update_task_status(
     request: UpdateTaskStatusRequest,
@@ -274,7 +331,12 @@ async def update_task_status(
             detail="You can only update your own assignments"
         )
     
-    # Update status
+    # Update status (counted on the dashboard of the task's team)
+    task = db.query(Task).filter(Task.id == assignment.task_id).first()
+    task_team_id = task.team_id if task else None
+    team_stats.record(db, {task_team_id: team_stats.status_deltas(assignment.status, request.status)})
+    if request.status == "completed" and assignment.status != "completed":
+        team_events.record_task_completed(db, assignment, current_user, task)
     assignment.status = request.status
     assignment.responded_at = datetime.utcnow()
     
@@ -285,76 +347,143 @@ async def update_task_status(
         assignment.notes = request.notes
     
     db.commit()
+    team_stats.invalidate_team(current_user.team_id, task_team_id)
+    team_event_bus.notify(current_user.team_id)
     
     return {
         "success": True,
         "assignment": assignment.to_dict()
     }
 
+def _parse_due(value: Optional[str], name: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO date, e.g. 2025-01-31")
+
+def _due_filters(due_after: Optional[str], due_before: Optional[str]) -> list:
+    criteria = []
+    after = _parse_due(due_after, "due_after")
+    before = _parse_due(due_before, "due_before")
+    if after:
+        criteria.append(Task.due_date >= after)
+    if before:
+        criteria.append(Task.due_date < before)
+    return criteria
+
+def _page(rows: list, limit: int, offset: int) -> tuple:
+    """(rows on this page, next offset or None); rows was fetched with limit + 1"""
+    has_more = len(rows) > limit
+    return rows[:limit], (offset + limit if has_more else None)
+
 @router.get("/tasks/my-tasks")
 async def get_my_tasks(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    due_after: Optional[str] = None,
+    due_before: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get tasks assigned to current user"""
-    
-    assignments = db.query(TaskAssignment).filter(
-        TaskAssignment.assignee_id == current_user.id
-    ).all()
-    
-    tasks_with_status = []
-    for assignment in assignments:
-        # Manually fetch the task (no relationship in simple model)
-        task = db.query(Task).filter(Task.id == assignment.task_id).first()
-        if task:
-            tasks_with_status.append({
+    """
+    Get tasks assigned to current user (soonest due first)
+    
+    One joined query per page; pass next_offset back as offset= for more.
+    """
+    
+    query = db.query(TaskAssignment, Task).join(
+        Task, Task.id == TaskAssignment.task_id
+    ).filter(
+        TaskAssignment.assignee_id == current_user.id,
+        *_due_filters(due_after, due_before)
+    )
+    if status_filter:
+        query = query.filter(TaskAssignment.status == status_filter)
+    
+    rows = query.order_by(
+        Task.due_date.is_(None), Task.due_date, TaskAssignment.id
+    ).offset(offset).limit(limit + 1).all()
+    rows, next_offset = _page(rows, limit, offset)
+    
+    return {
+        "success": True,
+        "tasks": [
+            {
                 'assignment_id': assignment.id,
                 'task': task.to_dict(),
                 'status': assignment.status,
                 'responded_at': assignment.responded_at.isoformat() if assignment.responded_at else None,
                 'completed_at': assignment.completed_at.isoformat() if assignment.completed_at else None,
                 'notes': assignment.notes
-            })
-    
-    return {
-        "success": True,
-        "tasks": tasks_with_status
+            }
+            for assignment, task in rows
+        ],
+        "next_offset": next_offset
     }
 
 @router.get("/tasks/team-tasks")
 async def get_team_tasks(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    due_after: Optional[str] = None,
+    due_before: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all tasks for current user's team"""
+    """
+    Get all tasks for current user's team (soonest due first)
+    
+    status= keeps tasks with at least one assignment in that status. Two
+    queries per page: the tasks, then all of their assignments at once.
+    """
     
     if not current_user.team_id:
         return {
             "success": True,
             "tasks": [],
-            "message": "Not part of any team"
+            "message": "Not part of any team",
+            "next_offset": None
         }
     
-    tasks = db.query(Task).filter(
-        Task.team_id == current_user.team_id,
-        Task.share_with_team == True
-    ).all()
+    query = tenancy.scoped(db, Task, current_user).filter(
+        Task.share_with_team == True,
+        *_due_filters(due_after, due_before)
+    )
+    if status_filter:
+        query = query.filter(
+            db.query(TaskAssignment.id).filter(
+                TaskAssignment.task_id == Task.id,
+                TaskAssignment.status == status_filter
+            ).exists()
+        )
     
-    tasks_data = []
-    for task in tasks:
-        # Get assignments for this task
-        assignments = db.query(TaskAssignment).filter(
-            TaskAssignment.task_id == task.id
-        ).all()
-        
-        tasks_data.append({
-            'task': task.to_dict(),
-            'assignments': [a.to_dict() for a in assignments]
-        })
+    tasks = query.order_by(
+        Task.due_date.is_(None), Task.due_date, Task.id
+    ).offset(offset).limit(limit + 1).all()
+    tasks, next_offset = _page(tasks, limit, offset)
+    
+    # Assignments for the whole page in one IN query (what selectinload would do)
+    assignments_by_task = {task.id: [] for task in tasks}
+    if tasks:
+        for assignment in db.query(TaskAssignment).filter(
+            TaskAssignment.task_id.in_(list(assignments_by_task))
+        ).order_by(TaskAssignment.id):
+            assignments_by_task[assignment.task_id].append(assignment.to_dict())
     
     return {
         "success": True,
-        "tasks": tasks_data
+        "tasks": [
+            {
+                'task': task.to_dict(),
+                'assignments': assignments_by_task[task.id]
+            }
+            for task in tasks
+        ],
+        "next_offset": next_offset
     }
 
 @router.get("/dashboard")
@@ -371,37 +500,40 @@ async def get_team_dashboard(
             "dashboard": None
         }
     
-    team = db.query(Team).filter(Team.id == current_user.team_id).first()
-    members = db.query(User).filter(User.team_id == current_user.team_id).all()
-    
-    # Get task stats
-    total_tasks = db.query(Task).filter(Task.team_id == current_user.team_id).count()
-    
-    pending_assignments = db.query(TaskAssignment).join(Task).filter(
-        Task.team_id == current_user.team_id,
-        TaskAssignment.status == "pending"
-    ).count()
-    
-    completed_assignments = db.query(TaskAssignment).join(Task).filter(
-        Task.team_id == current_user.team_id,
-        TaskAssignment.status == "completed"
-    ).count()
-    
-    # Get lead stats
-    from app.models.leads import Lead
-    total_leads = db.query(Lead).count()
+    # One read of the team_stats rollup (kept current by the routes above)
+    row = team_stats.get_team_stats(db, current_user.team_id)
+    team, stats = row if row else (None, None)
     
     return {
         "success": True,
         "dashboard": {
             "team": team.to_dict() if team else None,
-            "member_count": len(members),
+            "member_count": stats.member_count if stats else 0,
             "stats": {
-                "total_tasks": total_tasks,
-                "pending_tasks": pending_assignments,
-                "completed_tasks": completed_assignments,
-                "total_leads": total_leads
+                "total_tasks": stats.total_tasks if stats else 0,
+                "pending_tasks": stats.pending_tasks if stats else 0,
+                "completed_tasks": stats.completed_tasks if stats else 0,
+                "total_leads": stats.total_leads if stats else 0
             },
             "is_leader": team.leader_id == current_user.id if team else False
         }
     }
+
+@router.post("/dashboard/reconcile")
+async def reconcile_team_dashboard(
+    current_user: User = Depends(get_current_user)
+):
+    """Recount the team's dashboard counters now (leaders only)"""
+    
+    if not current_user.team_id or not current_user.is_team_leader:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only team leaders can reconcile team stats"
+        )
+    
+    result = await team_stats.team_stats_reconciler.run([current_user.team_id])
+    
+    return {
+        "success": True,
+        "repaired": result["repaired"].get(current_user.team_id, {})
+    }
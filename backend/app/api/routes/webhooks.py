@@ -3,56 +3,111 @@ Webhook Routes
 Receives data from external services (Zapier, etc.)
 """
 
-from fastapi import APIRouter, Request, HTTPException
-from typing import Dict, Any
-import hmac
+from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi.responses import JSONResponse
+from typing import Dict, Any, Optional
 import hashlib
+import json
+
+from app.core.config import settings
+from app.models.user import User
+from app.api.routes.auth import get_current_user
+from app.services.webhook_ingest import webhook_ingestor, verify_signature, user_webhook_secret, map_webhook_lead
 
 router = APIRouter()
 
-@router.post("/boldtrail")
-async def boldtrail_webhook(request: Request):
+@router.post("/boldtrail", status_code=202)
+async def boldtrail_webhook(request: Request, user_id: int):
     """
     Receive leads from BoldTrail via Zapier
     
     Setup in Zapier:
     1. Trigger: BoldTrail (New Lead, Updated Contact, etc.)
     2. Action: Webhooks by Zapier → POST
-    3. URL: https://agentassist-1.onrender.com/api/webhooks/boldtrail
-    4. Send lead data as JSON
+    3. URL: https://agentassist-1.onrender.com/api/webhooks/boldtrail?user_id=YOUR_USER_ID
+    4. Send lead data as JSON (one lead object, or a list of them)
+    5. Send X-Webhook-Signature: sha256=<HMAC-SHA256 of the body>, keyed with
+       your webhook secret (GET /api/webhooks/boldtrail/secret)
+    
+    The signing key is per user, so a valid signature also proves the leads
+    belong to user_id. Without WEBHOOK_SECRET configured every webhook is
+    rejected. Leads are queued and written in batches by the background
+    flusher, so this returns 202 as soon as the payload is accepted.
     """
+    if not settings.WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Webhooks are not configured")
+    
+    body = await request.body()
+    
+    if not verify_signature(
+        body, request.headers.get("X-Webhook-Signature"), user_webhook_secret(user_id, settings.WEBHOOK_SECRET)
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    
     try:
-        # Get the JSON payload
-        data = await request.json()
-        
-        # Log the incoming lead
-        print(f"📥 Received BoldTrail lead via Zapier:")
-        print(f"   {data}")
-        
-        # Extract lead information
-        lead_info = {
-            "first_name": data.get("first_name") or data.get("firstName"),
-            "last_name": data.get("last_name") or data.get("lastName"),
-            "email": data.get("email"),
-            "phone": data.get("phone") or data.get("phoneNumber"),
-            "status": data.get("status") or "New",
-            "source": "BoldTrail (Zapier)",
-            "raw_data": data
-        }
-        
-        # TODO: Store in database
-        # TODO: Trigger AI message generation
-        # TODO: Assign to team member
-        
-        return {
-            "success": True,
-            "message": "Lead received successfully",
-            "lead_id": data.get("id") or "new-lead"
-        }
+        data = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    
+    records = data if isinstance(data, list) else [data]
+    header_key = request.headers.get("Idempotency-Key")
+    
+    counts = {"queued": 0, "duplicate": 0, "full": 0}
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise HTTPException(status_code=400, detail="Each lead must be a JSON object")
         
-    except Exception as e:
-        print(f"❌ Webhook error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
+        key = _idempotency_key(user_id, record, header_key, index)
+        counts[webhook_ingestor.enqueue(key, map_webhook_lead(record, user_id))] += 1
+    
+    if counts["full"]:
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "5"},
+            content={
+                "success": False,
+                "error": "Webhook queue is full, retry shortly",
+                "queued": counts["queued"]
+            }
+        )
+    
+    return {
+        "success": True,
+        "message": "Lead received successfully",
+        "queued": counts["queued"],
+        "duplicates": counts["duplicate"]
+    }
+
+def _idempotency_key(user_id: int, record: Dict[str, Any], header_key: Optional[str], index: int) -> str:
+    """Idempotency-Key header, else the CRM's lead id, else a hash of the lead itself"""
+    if header_key:
+        return f"{user_id}:hdr:{header_key}:{index}"
+    if record.get("id"):
+        updated = record.get("updated_at") or record.get("updatedAt") or ""
+        return f"{user_id}:id:{record['id']}:{updated}"
+    digest = hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{user_id}:sha:{digest}"
+
+@router.get("/boldtrail/secret")
+async def boldtrail_webhook_secret(current_user: User = Depends(get_current_user)):
+    """
+    The current user's webhook URL and signing secret for Zapier
+    """
+    if not settings.WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Webhooks are not configured")
+    return {
+        "success": True,
+        "webhook_url": f"https://agentassist-1.onrender.com/api/webhooks/boldtrail?user_id={current_user.id}",
+        "signature_header": "X-Webhook-Signature",
+        "secret": user_webhook_secret(current_user.id, settings.WEBHOOK_SECRET)
+    }
+
+@router.get("/metrics")
+async def webhook_metrics(current_user: User = Depends(get_current_user)):
+    """
+    Queue depth, lag and flush counters for the webhook pipeline
+    """
+    return webhook_ingestor.get_metrics()
 
 @router.get("/boldtrail/test")
 async def test_boldtrail_webhook():
@@ -61,16 +116,17 @@ async def test_boldtrail_webhook():
     """
     return {
         "message": "BoldTrail webhook endpoint is active!",
-        "webhook_url": "https://agentassist-1.onrender.com/api/webhooks/boldtrail",
+        "webhook_url": "https://agentassist-1.onrender.com/api/webhooks/boldtrail?user_id=YOUR_USER_ID",
         "instructions": {
             "step_1": "Go to zapier.com and create a new Zap",
             "step_2": "Trigger: Search for 'BoldTrail' and select your trigger event",
             "step_3": "Connect your BoldTrail account with your Zapier API key",
             "step_4": "Action: Choose 'Webhooks by Zapier' → 'POST'",
-            "step_5": "URL: https://agentassist-1.onrender.com/api/webhooks/boldtrail",
+            "step_5": "URL: https://agentassist-1.onrender.com/api/webhooks/boldtrail?user_id=YOUR_USER_ID",
             "step_6": "Method: POST",
             "step_7": "Data: Map BoldTrail fields to JSON",
-            "step_8": "Test it and turn on your Zap!"
+            "step_8": "Header: X-Webhook-Signature: sha256=<HMAC-SHA256 of the body with your secret from /api/webhooks/boldtrail/secret>",
+            "step_9": "Test it and turn on your Zap!"
         }
     }
 
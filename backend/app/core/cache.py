@@ -0,0 +1,89 @@
+"""
+In-memory TTL cache
+Small process-local cache for objects that are expensive to rebuild per request
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """
+    Dictionary-like cache whose entries expire after a fixed number of seconds
+    
+    Safe to share between the event loop and FastAPI's threadpool (sync routes).
+    When max_entries is reached the entry closest to expiry is dropped.
+    """
+    
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the soonest-to-expire entry if full"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._evict_one()
+            self._entries[key] = (time.monotonic() + ttl, value)
+    
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop one entry; returns True if it was cached"""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+    
+    def invalidate_where(self, predicate) -> int:
+        """Drop every entry whose key matches predicate(key); returns the count"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def _evict_one(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        if expired:
+            for key in expired:
+                del self._entries[key]
+            return
+        oldest = min(self._entries, key=lambda key: self._entries[key][0])
+        del self._entries[oldest]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for health and debugging endpoints"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
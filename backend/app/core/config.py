@@ -4,7 +4,7 @@ Uses pydantic-settings for environment variable loading
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Dict, Any
 
 class Settings(BaseSettings):
     # App
@@ -14,12 +14,13 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "change-me-in-production"  # For JWT signing
-    ENCRYPTION_KEY: str = "change-me-in-production"  # For AES-256 encryption of CRM credentials (32 bytes base64)
+    ENCRYPTION_KEY: str = ""  # For AES-256 encryption of CRM credentials (32 bytes base64, required)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     
     # Database
     DATABASE_URL: str = "sqlite:///./agentassist_v2.db"  # New database file to force reset
+    TENANT_INDEX_STRICT: bool = False  # Refuse to start if a tenant column has no composite index (else warn)
     
     # CORS
     CORS_ORIGINS: List[str] = [
@@ -49,6 +50,20 @@ class Settings(BaseSettings):
     HUBSPOT_CLIENT_SECRET: str = ""
     BOOMTOWN_API_KEY: str = ""
     BOLDTRAIL_API_KEY: str = ""
+    CRM_HANDLER_CACHE_TTL_SECONDS: int = 300  # How long decrypted CRM handlers stay cached
+    
+    # Teams
+    TEAM_STATS_CACHE_TTL_SECONDS: int = 30  # Team performance cached per team (dropped on assignment / status changes)
+    TEAM_STATS_RECONCILE_INTERVAL_MINUTES: int = 60  # Recount team_stats rollups and repair drift (0 disables)
+    TEAM_EVENTS_PAGE_MAX: int = 100  # Largest activity feed page
+    TEAM_LEADS_PAGE_MAX: int = 200  # Largest team lead board page
+    TEAM_EVENTS_POLL_SECONDS: float = 5.0  # Live feed re-checks this often for events from other workers
+    TEAM_BULK_ASSIGN_CHUNK_SIZE: int = 1000  # Leads per transaction in bulk assignment
+    
+    # Google Calendar (task invites)
+    CALENDAR_SYNC_INTERVAL_MINUTES: int = 15  # Pull task invite RSVPs incrementally (0 disables)
+    CALENDAR_SYNC_CONCURRENCY: int = 4  # Users synced at once
+    CALENDAR_SYNC_USER_CONCURRENCY: int = 2  # Calendar API requests in flight per user
     
     # Social Media APIs
     FACEBOOK_APP_ID: str = ""
@@ -59,13 +74,50 @@ class Settings(BaseSettings):
     # Skip Trace API (for "The Hunter")
     SKIP_TRACE_API_KEY: str = ""
     SKIP_TRACE_API_URL: str = "https://api.skiptrace.example.com"
+    SKIP_TRACE_PROVIDER: str = "http"  # http (bulk API above) or stub (local stand-in, no spend)
+    SKIP_TRACE_BATCH_SIZE: int = 100  # Addresses per bulk request
+    SKIP_TRACE_MAX_CONCURRENCY: int = 4  # Bulk requests in flight
+    SKIP_TRACE_CACHE_TTL_DAYS: int = 180  # Reuse a found owner this long
+    SKIP_TRACE_NEGATIVE_TTL_DAYS: int = 30  # Don't re-pay for a miss this long
+    
+    # Icebreakers (generated with SCRAPER_MODEL)
+    ICEBREAKER_PROVIDER: str = "openai"  # openai or stub (local stand-in, no spend); no API key = plain template
+    ICEBREAKER_API_URL: str = "https://api.openai.com/v1"
+    ICEBREAKER_BATCH_SIZE: int = 25  # Leads per model request
+    ICEBREAKER_MAX_CONCURRENCY: int = 4  # Model requests in flight
+    ICEBREAKER_TOKENS_PER_MINUTE: int = 60000  # Token budget shared by all requests; 0 = unlimited
     
     # Scraper settings
     HUNTER_CRON_TIME: str = "8:00"  # Daily at 8:00 AM
+    HUNTER_SCHEDULER_ENABLED: bool = False  # Run the daily crawl inside the API process
+    HUNTER_STAGGER_WINDOW_MINUTES: int = 60  # Spread market start times over this window after HUNTER_CRON_TIME
+    # Markets to crawl, as JSON: [{"name": "austin", "user_id": 1, "zip_codes": ["78701"], "craigslist_cities": [["austin", "tx"]]}]
+    HUNTER_MARKETS: List[Dict[str, Any]] = []
     SCRAPER_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    HUNTER_MAX_CONCURRENCY: int = 10  # Requests in flight across all sources
+    HUNTER_HOST_CONCURRENCY: int = 2  # Requests in flight per host
+    HUNTER_HOST_MIN_INTERVAL_SECONDS: float = 2.0  # Politeness gap between requests to one host
+    HUNTER_PARSER_BACKEND: str = "auto"  # selectolax, lxml, bs4 or auto (fastest installed)
+    HUNTER_PARSE_PROCESS_THRESHOLD_BYTES: int = 200000  # Parse pages this big in a process pool; 0 disables
+    HUNTER_PARSE_WORKERS: int = 0  # Parser processes; 0 = CPU count
+    HUNTER_HTTP_CACHE_DIR: str = ".cache/hunter_http"  # On-disk page cache for conditional requests; empty disables
+    HUNTER_HTTP_CACHE_MAX_MB: int = 256
+    HUNTER_MAX_TARGETS_PER_RUN: int = 50  # ZIPs + cities allowed in one on-demand /api/hunter/run
+    HUNTER_STREAM_BUFFER: int = 200  # Leads buffered for a slow SSE client before the crawl pauses
+    HUNTER_AUTO_PUSH: bool = False  # Push each scheduled run's new leads to leads + connected CRMs
+    HUNTER_PUSH_CRM_CONCURRENCY: int = 4  # create_lead calls in flight per CRM
+    HUNTER_PUSH_CRM_MIN_INTERVAL_SECONDS: float = 0.25  # Gap between create_lead calls to one CRM
+    HUNTER_PUSH_CLAIM_TTL_MINUTES: int = 30  # A push's claim on its rows expires after this (if it crashed)
+    
+    # Webhooks (Zapier / BoldTrail)
+    WEBHOOK_SECRET: str = ""  # Master key for the per-user X-Webhook-Signature keys; empty rejects all webhooks
+    WEBHOOK_FLUSH_MAX_RECORDS: int = 500  # Write a batch once this many leads are queued
+    WEBHOOK_FLUSH_INTERVAL_MS: int = 1000  # ...or once the oldest queued lead is this old
+    WEBHOOK_QUEUE_MAX: int = 50000  # Answer 503 above this queue depth
     
     # Team routing
     LEAD_RESPONSE_TIMEOUT_MINUTES: int = 5  # Re-assign if no response in 5 min
+    LEAD_ROUTING_MAX_REASSIGNMENTS: int = 3  # Stop passing an unanswered lead on after this many timeouts
     
     # SMS/Notifications
     TWILIO_ACCOUNT_SID: str = ""
@@ -53,15 +53,16 @@ def get_db() -> Generator[Session, None, None]:
 def migrate_add_column(table_name: str, column_name: str, column_type: str = "TEXT"):
     """
     Add a column to an existing table if it doesn't exist.
-    Simple migration helper for SQLite.
+    Works on SQLite and PostgreSQL (columns are read through the SQLAlchemy inspector).
     """
     try:
-        from sqlalchemy import text
+        from sqlalchemy import text, inspect
+        inspector = inspect(engine)
+        if not inspector.has_table(table_name):
+            return
+        columns = [column["name"] for column in inspector.get_columns(table_name)]
+        
         with engine.connect() as conn:
-            # Check if column exists
-            result = conn.execute(text(f"PRAGMA table_info({table_name})"))
-            columns = [row[1] for row in result]
-            
             if column_name not in columns:
                 conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
                 conn.commit()
@@ -71,6 +72,74 @@ def migrate_add_column(table_name: str, column_name: str, column_type: str = "TE
     except Exception as e:
         print(f"⚠️ Migration warning: {e}")
 
+def migrate_add_index(index_name: str, table_name: str, columns: str):
+    """
+    Create an index on an existing table if it doesn't exist.
+    create_all only indexes tables it creates, so new indexes go through here.
+    """
+    try:
+        from sqlalchemy import text
+        with engine.connect() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"))
+            conn.commit()
+    except Exception as e:
+        print(f"⚠️ Index migration warning ({index_name}): {e}")
+
+def migrate_add_unique_index(index_name: str, table_name: str, columns: str, dedupe_sql: str = None):
+    """
+    Create a unique index on an existing table if it doesn't exist.
+    dedupe_sql runs first (in the same transaction) to remove rows that would violate it.
+    """
+    try:
+        from sqlalchemy import text, inspect
+        inspector = inspect(engine)
+        existing = {index["name"] for index in inspector.get_indexes(table_name)}
+        existing |= {constraint["name"] for constraint in inspector.get_unique_constraints(table_name)}
+        if index_name in existing:
+            return
+        with engine.connect() as conn:
+            if dedupe_sql:
+                removed = conn.execute(text(dedupe_sql)).rowcount
+                if removed:
+                    print(f"✅ Removed {removed} duplicate rows from '{table_name}'")
+            conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns})"))
+            conn.commit()
+    except Exception as e:
+        print(f"⚠️ Unique index migration warning ({index_name}): {e}")
+
+def insert_ignore(model, bind):
+    """
+    INSERT that skips rows violating a unique constraint (ON CONFLICT DO NOTHING)
+    
+    PostgreSQL and SQLite (3.24+) both support it; chain .returning() to see
+    which rows were actually inserted.
+    """
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model).on_conflict_do_nothing()
+
+def migrate_normalize_lead_statuses():
+    """
+    Rewrite lead statuses stored before normalize_status was applied on write
+    (one UPDATE per distinct non-canonical value, so it is a no-op once done)
+    """
+    try:
+        from app.models.leads import Lead, normalize_status
+        with SessionLocal() as db:
+            statuses = [row[0] for row in db.query(Lead.status).distinct() if row[0]]
+            for status in statuses:
+                normalized = normalize_status(status)
+                if normalized != status:
+                    db.query(Lead).filter(Lead.status == status).update(
+                        {"status": normalized}, synchronize_session=False
+                    )
+                    print(f"✅ Normalized lead status '{status}' -> '{normalized}'")
+            db.commit()
+    except Exception as e:
+        print(f"⚠️ Lead status migration warning: {e}")
+
 def init_db():
     """
     Initialize database - create all tables
@@ -81,10 +150,12 @@ def init_db():
         from app.models.user import User
         from app.models.leads import Lead
         from app.models.activity import LeadActivity
-        from app.models.team_simple import Team, Task as TeamTask, TaskAssignment
+        from app.models.team_simple import Team, TeamStats, TeamEvent, Task as TeamTask, TaskAssignment
         from app.models.tasks import Task as UserTask
         from app.models.campaigns import Campaign, CampaignStep, CampaignEnrollment
         from app.models.gmail_oauth import GmailToken
+        from app.models.crm_connection import CRMConnection
+        from app.models.hunter import SeenListing, SkipTraceResult, IcebreakerResult, HunterRun, HunterLead
         
         # Create all tables (only creates missing ones)
         Base.metadata.create_all(bind=engine)
@@ -96,7 +167,64 @@ def init_db():
         # Run migrations for new columns on existing tables
         migrate_add_column("users", "phone", "TEXT")
         migrate_add_column("leads", "address", "TEXT")
+        migrate_add_column("hunter_leads", "lead_id", "INTEGER")
+        migrate_add_column("hunter_leads", "crm_ids", "JSON")
+        migrate_add_column("hunter_leads", "pushed_at", "TIMESTAMP")
+        migrate_add_column("hunter_leads", "icebreaker", "TEXT")
+        migrate_add_column("hunter_leads", "push_claimed_at", "TIMESTAMP")
+        migrate_add_column("teams", "routing_strategy", "TEXT")
+        migrate_add_column("teams", "routing_weights", "JSON")
+        migrate_add_column("leads", "response_due_at", "TIMESTAMP")
+        migrate_add_column("leads", "routing_attempts", "INTEGER DEFAULT 0")
+        migrate_add_column("tasks", "google_calendar_event_id", "TEXT")
+        migrate_add_column("gmail_tokens", "calendar_sync_token", "TEXT")
+        migrate_add_column("gmail_tokens", "calendar_synced_at", "TIMESTAMP")
+        
+        # Indexes for the team performance / dashboard aggregates
+        migrate_add_index("ix_users_team_id", "users", "team_id")
+        migrate_add_index("ix_leads_assigned_to", "leads", "assigned_to")
+        migrate_add_index("ix_task_assignments_assignee_status", "task_assignments", "assignee_id, status")
+        migrate_add_index("ix_leads_response_due_at", "leads", "response_due_at")
+        
+        # Indexes for the task listings (assignee_id is covered by ix_task_assignments_assignee_status)
+        migrate_add_index("ix_task_assignments_task_id", "task_assignments", "task_id")
+        migrate_add_index("ix_tasks_team_id_due_date", "tasks", "team_id, due_date")
+        migrate_add_index("ix_tasks_google_calendar_event_id", "tasks", "google_calendar_event_id")
         
+        # Composite indexes led by each tenant column (checked at startup, see app/core/tenancy.py)
+        migrate_add_index("ix_leads_user_id_created_at", "leads", "user_id, created_at")
+        migrate_add_index("ix_leads_assigned_to_assigned_at", "leads", "assigned_to, assigned_at")
+        migrate_add_index("ix_leads_user_id_assigned_to_status", "leads", "user_id, assigned_to, status")
+        migrate_add_index("ix_leads_assigned_to_status_id", "leads", "assigned_to, status, id")
+        migrate_add_index("ix_leads_user_id_email_lower", "leads", "user_id, lower(email)")
+        migrate_add_index("ix_user_tasks_user_id_due_date", "user_tasks", "user_id, due_date, due_time")
+        migrate_add_index("ix_campaigns_user_id_status", "campaigns", "user_id, status")
+        migrate_add_index("ix_hunter_runs_user_id_started_at", "hunter_runs", "user_id, started_at")
+        migrate_add_index("ix_hunter_leads_user_id_scraped_at", "hunter_leads", "user_id, scraped_at")
+        migrate_add_index("ix_hunter_seen_listings_user_id_listing_url", "hunter_seen_listings", "user_id, listing_url")
+        migrate_add_index("ix_gmail_tokens_user_id_is_active", "gmail_tokens", "user_id, is_active")
+        
+        # Lead filters compare status exactly (see normalize_status in app/models/leads.py)
+        migrate_normalize_lead_statuses()
+        
+        # One assignment per (task, assignee): keep the furthest-along duplicate, then the oldest
+        migrate_add_unique_index(
+            "uq_task_assignments_task_assignee", "task_assignments", "task_id, assignee_id",
+            dedupe_sql="""
+                DELETE FROM task_assignments WHERE id NOT IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY task_id, assignee_id
+                            ORDER BY CASE status
+                                WHEN 'completed' THEN 0 WHEN 'accepted' THEN 1
+                                WHEN 'pending' THEN 2 ELSE 3 END, id
+                        ) AS row_num
+                        FROM task_assignments
+                    ) ranked WHERE row_num = 1
+                )
+            """
+        )
+    
     except Exception as e:
         print(f"❌ Database initialization error: {e}")
         import traceback
@@ -0,0 +1,64 @@
+"""
+Credential encryption
+AES-256-GCM encryption of CRM credentials at rest
+"""
+
+import base64
+import json
+import os
+from typing import Dict, Any, Tuple
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.core.config import settings
+
+NONCE_SIZE = 12  # 96-bit nonce, the recommended size for GCM
+
+def _load_key(raw_key: str) -> bytes:
+    """
+    Decode settings.ENCRYPTION_KEY into a 32-byte AES key
+    
+    The key must be 32 random bytes, base64 encoded (see backend/README.md).
+    Anything else, including the .env.example placeholder, is refused at
+    startup rather than quietly stretched into a guessable key.
+    
+    Raises:
+        RuntimeError: If the key is missing or not base64 of exactly 32 bytes
+    """
+    try:
+        key = base64.b64decode(raw_key or "", validate=True)
+    except ValueError:
+        key = b""
+    
+    if len(key) != 32:
+        raise RuntimeError(
+            "ENCRYPTION_KEY must be 32 random bytes, base64 encoded. Generate one with: "
+            "python -c \"import os, base64; print(base64.b64encode(os.urandom(32)).decode())\""
+        )
+    return key
+
+_aesgcm = AESGCM(_load_key(settings.ENCRYPTION_KEY))
+
+def encrypt_credentials(credentials: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Encrypt a credentials dictionary
+    
+    Returns:
+        (encrypted_blob, iv) both base64 encoded, matching the
+        crm_connections.encrypted_credentials / encryption_iv columns
+    """
+    nonce = os.urandom(NONCE_SIZE)
+    plaintext = json.dumps(credentials).encode()
+    ciphertext = _aesgcm.encrypt(nonce, plaintext, None)
+    return base64.b64encode(ciphertext).decode(), base64.b64encode(nonce).decode()
+
+def decrypt_credentials(encrypted_blob: str, iv: str) -> Dict[str, Any]:
+    """
+    Decrypt credentials produced by encrypt_credentials
+    
+    Raises:
+        cryptography.exceptions.InvalidTag: If the blob was tampered with
+            or encrypted under a different key
+    """
+    plaintext = _aesgcm.decrypt(base64.b64decode(iv), base64.b64decode(encrypted_blob), None)
+    return json.loads(plaintext)
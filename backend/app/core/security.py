@@ -7,6 +7,7 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.encryption import encrypt_credentials, decrypt_credentials  # Re-exported for callers
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -0,0 +1,99 @@
+"""
+Server-Sent Events helpers
+Stream (event, data) pairs from an async iterator to the browser
+
+The source runs in its own task and feeds a bounded queue, so a slow
+client applies backpressure to the source, heartbeats keep proxies from
+closing idle connections, and the source is cancelled as soon as the
+client disconnects.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """One SSE message; data is JSON-encoded"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    payload = json.dumps(data, default=str)
+    lines.extend(f"data: {line}" for line in payload.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+async def sse_events(
+    request: Request,
+    source: AsyncIterator[Tuple[str, Any]],
+    queue_size: int = 100,
+    heartbeat_seconds: float = 15.0
+) -> AsyncIterator[str]:
+    """
+    Drive source and yield formatted SSE messages
+    
+    Args:
+        source: Async iterator of (event, data); may also yield (event, data, id)
+        queue_size: Messages buffered before the source is paused
+        heartbeat_seconds: Send a comment line when nothing was sent for this long
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    done = object()
+    
+    async def produce() -> None:
+        try:
+            async for item in source:
+                await queue.put(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(("error", {"error": str(e)}))
+        finally:
+            await queue.put(done)
+    
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            
+            if item is done:
+                break
+            event, data = item[0], item[1]
+            event_id = item[2] if len(item) > 2 else None
+            yield format_sse(data, event=event, event_id=event_id)
+    finally:
+        # Client went away (or we finished): stop the source and whatever it started
+        producer.cancel()
+        try:
+            await producer
+        except (asyncio.CancelledError, Exception):
+            pass
+        aclose = getattr(source, "aclose", None)
+        if aclose:
+            await aclose()
+
+def sse_response(
+    request: Request,
+    source: AsyncIterator[Tuple[str, Any]],
+    queue_size: int = 100,
+    heartbeat_seconds: float = 15.0
+) -> StreamingResponse:
+    """StreamingResponse with the headers SSE needs behind proxies"""
+    return StreamingResponse(
+        sse_events(request, source, queue_size=queue_size, heartbeat_seconds=heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable nginx response buffering
+            "Connection": "keep-alive"
+        }
+    )
@@ -0,0 +1,97 @@
+"""
+Tenant Scoping
+Owner / team predicates in one place, plus a startup index check
+
+Tenant-scoped models name their tenant columns, owner first:
+
+    __tenant_columns__ = ("user_id", "assigned_to")
+
+A "team_id" column is matched against the user's team; any other column
+against user ids. scoped(db, Lead, user) is db.query(Lead) limited to the
+user's own rows; shared=True also admits rows where a later column names
+them (leads assigned to them), and team=True widens it to everyone on the
+user's team.
+
+check_tenant_indexes() runs at startup: every tenant column must lead a
+composite index in the live database, so scoped queries are index range
+scans rather than table scans as tables grow.
+"""
+
+import warnings
+from typing import List, Optional
+
+from sqlalchemy import inspect, select, or_, false, exc
+from sqlalchemy.orm import Session, Query
+
+from app.core.database import Base, engine
+from app.models.user import User
+
+def tenant_models() -> list:
+    """Mapped classes that declare __tenant_columns__"""
+    return [
+        mapper.class_ for mapper in Base.registry.mappers
+        if getattr(mapper.class_, "__tenant_columns__", None)
+    ]
+
+def _columns(model, shared: bool) -> list:
+    names = model.__tenant_columns__
+    return [getattr(model, name) for name in (names if shared else names[:1])]
+
+def team_filter(model, team_id: Optional[int], shared: bool = True):
+    """Rows belonging to anyone on the team"""
+    if team_id is None:
+        return false()
+    members = select(User.id).where(User.team_id == team_id).scalar_subquery()
+    clauses = []
+    for column in _columns(model, shared):
+        if column.key == "team_id":
+            clauses.append(column == team_id)
+        else:
+            clauses.append(column.in_(members))
+    return or_(*clauses)
+
+def tenant_filter(model, user: User, shared: bool = False, team: bool = False):
+    """Rows belonging to user (or, with team=True, to their whole team)"""
+    if team:
+        return team_filter(model, user.team_id, shared)
+    clauses = []
+    for column in _columns(model, shared):
+        if column.key == "team_id":
+            clauses.append(column == user.team_id if user.team_id is not None else false())
+        else:
+            clauses.append(column == user.id)
+    return or_(*clauses)
+
+def scoped(db: Session, model, user: User, shared: bool = False, team: bool = False) -> Query:
+    """db.query(model) limited to the user's rows"""
+    return db.query(model).filter(tenant_filter(model, user, shared, team))
+
+def get_scoped(db: Session, model, row_id: int, user: User, shared: bool = False, team: bool = False):
+    """One row by id, or None if it doesn't exist or belongs to another tenant"""
+    return scoped(db, model, user, shared, team).filter(model.id == row_id).first()
+
+def check_tenant_indexes(bind=None) -> List[str]:
+    """
+    Tenant columns with no composite index leading on them in the database
+    
+    Returns "table.column" for each; empty when every scoped query has an index.
+    """
+    inspector = inspect(bind or engine)
+    missing = []
+    for model in tenant_models():
+        table = model.__tablename__
+        if not inspector.has_table(table):
+            continue
+        leading = set()
+        with warnings.catch_warnings():
+            # Expression indexes (lower(email)) can't be reflected on SQLite; they never lead on a plain column
+            warnings.simplefilter("ignore", exc.SAWarning)
+            indexes = inspector.get_indexes(table) + inspector.get_unique_constraints(table)
+        for index in indexes:
+            columns = index.get("column_names") or []
+            if len(columns) > 1:
+                leading.add(columns[0])
+        for name in model.__tenant_columns__:
+            if name not in leading:
+                missing.append(f"{table}.{name}")
+    return missing
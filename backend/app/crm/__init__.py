@@ -4,9 +4,10 @@ Factory for creating CRM handlers
 """
 
 from typing import Dict, Any
-from app.crm.base import CRM_Handler, CRMProvider
+from app.crm.base import CRM_Handler, CRMProvider, CRMError
 from app.crm.followupboss import FollowUpBossCRM
 from app.crm.boldtrail import BoldTrailCRM
+from app.crm.multi import MultiCRM, MultiCRMLeads, ProviderResult, merge_leads
 
 class CRMFactory:
     """
@@ -59,5 +60,29 @@ class CRMFactory:
         
         else:
             raise ValueError(f"Unsupported CRM provider: {provider}")
+    
+    @staticmethod
+    def create_multi(
+        connections: Dict[str, Dict[str, Any]],
+        timeout: float = 30.0
+    ) -> MultiCRM:
+        """
+        Create a MultiCRM over several connected providers
+        
+        Args:
+            connections: Provider name -> decrypted credentials
+            timeout: Per-provider timeout in seconds
+        
+        Returns:
+            MultiCRM keyed by provider name
+        """
+        return MultiCRM(
+            {provider.lower(): CRMFactory.create_handler(provider, credentials)
+             for provider, credentials in connections.items()},
+            timeout=timeout
+        )
 
-__all__ = ['CRM_Handler', 'CRMProvider', 'CRMFactory', 'FollowUpBossCRM', 'BoldTrailCRM']
+__all__ = [
+    'CRM_Handler', 'CRMProvider', 'CRMError', 'CRMFactory', 'FollowUpBossCRM', 'BoldTrailCRM',
+    'MultiCRM', 'MultiCRMLeads', 'ProviderResult', 'merge_leads'
+]
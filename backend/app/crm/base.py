@@ -3,9 +3,12 @@ CRM_Handler Base Class
 Standard interface for all CRM integrations
 """
 
+import asyncio
+import copy
+import httpx
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from datetime import datetime, timezone
 from enum import Enum
 
 class CRMProvider(str, Enum):
@@ -29,9 +32,36 @@ class LeadStatus(str, Enum):
     CLOSED_WON = "closed_won"
     CLOSED_LOST = "closed_lost"
 
+# Field order shared by CRMLead.__init__, CRMLead.to_row() and the batch
+# mappers (map_page_to_rows), so a row tuple can become a lead with CRMLead(*row)
+CRM_LEAD_COLUMNS = (
+    "crm_lead_id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "status",
+    "tags",
+    "price_range_min",
+    "price_range_max",
+    "location",
+    "last_activity_at",
+    "notes",
+    "custom_fields",
+)
+
+class CRMError(Exception):
+    """A CRM API call failed (bad status or unexpected payload)"""
+
+STATUS_INDEX = CRM_LEAD_COLUMNS.index("status")
+LAST_ACTIVITY_INDEX = CRM_LEAD_COLUMNS.index("last_activity_at")
+
 class CRMLead:
     """Standardized lead object across all CRMs"""
     
+    # No per-instance __dict__: a 50k-lead sync holds a lot of these
+    __slots__ = CRM_LEAD_COLUMNS
+    
     def __init__(
         self,
         crm_lead_id: str,
@@ -62,6 +92,31 @@ class CRMLead:
         self.notes = notes
         self.custom_fields = custom_fields or {}
     
+    def to_row(self) -> Tuple:
+        """Convert to a tuple in CRM_LEAD_COLUMNS order"""
+        return (
+            self.crm_lead_id,
+            self.first_name,
+            self.last_name,
+            self.email,
+            self.phone,
+            self.status,
+            self.tags,
+            self.price_range_min,
+            self.price_range_max,
+            self.location,
+            self.last_activity_at,
+            self.notes,
+            self.custom_fields
+        )
+    
+    def copy(self) -> "CRMLead":
+        """Copy with its own tags list and custom_fields (nested values included)"""
+        lead = CRMLead(*self.to_row())
+        lead.tags = list(self.tags)
+        lead.custom_fields = copy.deepcopy(self.custom_fields)
+        return lead
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
         return {
@@ -80,6 +135,55 @@ class CRMLead:
             "custom_fields": self.custom_fields
         }
 
+def is_older_than(value: Optional[datetime], since: Optional[datetime]) -> bool:
+    """
+    Compare a CRM timestamp against an incremental sync cutoff
+    Naive datetimes are treated as UTC so API values and local cutoffs compare cleanly
+    """
+    if value is None or since is None:
+        return False
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return value < since
+
+def filter_lead_rows(
+    rows: List[Tuple],
+    statuses: Optional[List[str]] = None,
+    updated_since: Optional[datetime] = None,
+    stop_at_cutoff: bool = False
+) -> Tuple[List[Tuple], bool]:
+    """
+    Apply status and incremental-sync filters to a page of lead rows
+    
+    Args:
+        stop_at_cutoff: Rows are sorted newest first, so the first row older
+            than updated_since ends the sync
+    
+    Returns:
+        (kept rows, whether the updated_since cutoff was reached)
+    """
+    if not statuses and updated_since is None:
+        return rows, False
+    
+    status_filter = {s.lower() for s in statuses} if statuses else None
+    kept = []
+    for row in rows:
+        if is_older_than(row[LAST_ACTIVITY_INDEX], updated_since):
+            if stop_at_cutoff:
+                return kept, True
+            continue
+        
+        if status_filter:
+            status = row[STATUS_INDEX]
+            if not (status and status.lower() in status_filter):
+                continue
+        
+        kept.append(row)
+    
+    return kept, False
+
 class CRM_Handler(ABC):
     """
     Abstract base class for all CRM integrations
@@ -95,6 +199,45 @@ class CRM_Handler(ABC):
         """
         self.credentials = credentials
         self.provider = None  # Set by subclass
+        
+        # Optional httpx transport override, e.g. httpx.MockTransport pointed at
+        # the fake CRM server in benchmarks/fake_crm.py
+        self.transport: Optional[httpx.AsyncBaseTransport] = None
+    
+    def _client(self) -> httpx.AsyncClient:
+        """HTTP client for a single API operation"""
+        return httpx.AsyncClient(transport=self.transport)
+    
+    async def _get_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        max_retries: int = 3,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        GET that waits out rate limits (429) and transient 5xx errors
+        
+        Used for paged syncs, where giving up on one page would silently
+        truncate the whole sync. Honours Retry-After when the CRM sends it.
+        """
+        delay = 1.0
+        for attempt in range(max_retries + 1):
+            response = await client.get(url, **kwargs)
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            if attempt == max_retries:
+                return response
+            
+            retry_after = response.headers.get("Retry-After")
+            try:
+                wait = float(retry_after) if retry_after else delay
+            except ValueError:
+                wait = delay
+            await asyncio.sleep(min(wait, 30.0))
+            delay *= 2
+        
+        return response
     
     @abstractmethod
     async def validate_connection(self) -> bool:
@@ -124,6 +267,54 @@ class CRM_Handler(ABC):
         """
         pass
     
+    async def iter_lead_pages(
+        self,
+        statuses: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        page_size: int = 100,
+        updated_since: Optional[datetime] = None
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream leads page by page as row tuples in CRM_LEAD_COLUMNS order
+        
+        Providers with paginated APIs override this so a full sync never holds
+        every lead in memory and never builds a CRMLead per record. The default
+        falls back to a single get_leads call.
+        
+        Args:
+            statuses: Filter by lead status
+            tags: Filter by tags
+            page_size: Number of leads requested per API page
+            updated_since: Only yield leads updated at or after this time (incremental sync)
+        """
+        leads = await self.get_leads(statuses=statuses, tags=tags, limit=page_size)
+        rows, _ = filter_lead_rows([lead.to_row() for lead in leads], updated_since=updated_since)
+        if rows:
+            yield rows
+    
+    async def iter_leads(
+        self,
+        statuses: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        page_size: int = 100,
+        updated_since: Optional[datetime] = None
+    ) -> AsyncIterator[CRMLead]:
+        """
+        Stream CRMLead objects; same arguments as iter_lead_pages
+        """
+        async for rows in self.iter_lead_pages(
+            statuses=statuses, tags=tags, page_size=page_size, updated_since=updated_since
+        ):
+            for row in rows:
+                yield CRMLead(*row)
+    
+    @abstractmethod
+    def map_page_to_rows(self, records: List[Dict[str, Any]]) -> List[Tuple]:
+        """
+        Map a page of raw provider JSON straight to lead row tuples
+        """
+        pass
+    
     @abstractmethod
     async def get_lead_by_id(self, lead_id: str) -> Optional[CRMLead]:
         """
@@ -3,11 +3,10 @@ BoldTrail CRM Integration
 API Documentation: https://developer.boldtrail.com/
 """
 
-import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime
 
-from app.crm.base import CRM_Handler, CRMLead, CRMProvider
+from app.crm.base import CRM_Handler, CRMLead, CRMProvider, CRMError, filter_lead_rows
 
 class BoldTrailCRM(CRM_Handler):
     """
@@ -36,7 +35,7 @@ class BoldTrailCRM(CRM_Handler):
     async def validate_connection(self) -> bool:
         """Test the API connection"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 # Method 1: Try Zapier export endpoint (simplest)
                 if self.zapier_key:
                     try:
@@ -97,7 +96,7 @@ class BoldTrailCRM(CRM_Handler):
         Fetch leads from BoldTrail via Zapier export endpoint
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 # Use Zapier export endpoint if available (simplest method)
                 if self.zapier_key:
                     response = await client.get(
@@ -150,8 +149,88 @@ class BoldTrailCRM(CRM_Handler):
             print(f"Error fetching BoldTrail leads: {e}")
             return []
     
+    async def iter_lead_pages(
+        self,
+        statuses: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        page_size: int = 100,
+        updated_since: Optional[datetime] = None
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream all BoldTrail contacts as lead rows page by page
+        
+        The Zapier export endpoint is paged by URL (/export/leads/{key}/{page});
+        both it and the OAuth API end with an empty page. The export has no
+        ordering guarantee, so updated_since filters each contact instead of
+        stopping early.
+        """
+        page = 1
+        
+        async with self._client() as client:
+            while True:
+                if self.zapier_key:
+                    response = await self._get_with_retry(
+                        client,
+                        f"{self.EXPORT_BASE_URL}/leads/{self.zapier_key}/{page}",
+                        timeout=30.0
+                    )
+                else:
+                    params = {
+                        "limit": page_size,
+                        "page": page,
+                        "sort": "-created_at"
+                    }
+                    
+                    if statuses:
+                        params["status"] = ",".join(statuses)
+                    
+                    if tags:
+                        params["tags"] = ",".join(tags)
+                    
+                    response = await self._get_with_retry(
+                        client,
+                        f"{self.BASE_URL}/public/leads",
+                        headers=self.headers,
+                        params=params,
+                        timeout=30.0
+                    )
+                
+                if response.status_code != 200:
+                    print(f"BoldTrail API error: {response.status_code} - {response.text}")
+                    raise CRMError(f"BoldTrail returned HTTP {response.status_code} on page {page}")
+                
+                data = response.json()
+                if isinstance(data, dict):
+                    data = data.get("contacts", data.get("leads"))
+                if not isinstance(data, list):
+                    raise CRMError(f"BoldTrail returned an unexpected payload on page {page}")
+                contacts_data = data
+                
+                if not contacts_data:
+                    return
+                
+                rows, _ = filter_lead_rows(
+                    self.map_page_to_rows(contacts_data),
+                    statuses=statuses,
+                    updated_since=updated_since
+                )
+                if rows:
+                    yield rows
+                
+                page += 1
+    
+    def map_page_to_rows(self, contacts: List[Dict[str, Any]]) -> List[Tuple]:
+        """Convert a page of BoldTrail contacts to lead rows"""
+        contact_to_row = self._contact_to_row
+        return [contact_to_row(contact) for contact in contacts]
+    
     def _map_contact_to_lead(self, contact: Dict[str, Any]) -> CRMLead:
         """Convert BoldTrail contact to CRMLead"""
+        return CRMLead(*self._contact_to_row(contact))
+    
+    @staticmethod
+    def _contact_to_row(contact: Dict[str, Any]) -> Tuple:
+        """Convert BoldTrail contact to a row in CRM_LEAD_COLUMNS order"""
         
         # Extract basic info
         first_name = contact.get("first_name")
@@ -191,25 +270,26 @@ class BoldTrailCRM(CRM_Handler):
         # Extract custom fields
         custom_fields = contact.get("custom_fields", {})
         
-        return CRMLead(
-            crm_lead_id=str(contact.get("id")),
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            phone=phone,
-            status=status,
-            tags=tags,
-            price_range_min=price_min,
-            price_range_max=price_max,
-            location=location,
-            last_activity_at=last_activity_dt,
-            custom_fields=custom_fields
+        return (
+            str(contact.get("id")),
+            first_name,
+            last_name,
+            email,
+            phone,
+            status,
+            tags or [],
+            price_min,
+            price_max,
+            location,
+            last_activity_dt,
+            None,  # notes
+            custom_fields or {}
         )
     
     async def get_lead_by_id(self, lead_id: str) -> Optional[CRMLead]:
         """Fetch a single lead by ID"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.get(
                     f"{self.BASE_URL}/contacts/{lead_id}",
                     headers=self.headers,
@@ -236,7 +316,7 @@ class BoldTrailCRM(CRM_Handler):
         Send an email via BoldTrail
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "contact_id": lead_id,
                     "subject": subject,
@@ -278,7 +358,7 @@ class BoldTrailCRM(CRM_Handler):
         Send an SMS via BoldTrail
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "contact_id": lead_id,
                     "body": body,
@@ -319,7 +399,7 @@ class BoldTrailCRM(CRM_Handler):
         Create a note in BoldTrail
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "contact_id": lead_id,
                     "body": note_text,
@@ -360,7 +440,7 @@ class BoldTrailCRM(CRM_Handler):
         Update the status of a lead
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "status": new_status
                 }
@@ -397,7 +477,7 @@ class BoldTrailCRM(CRM_Handler):
             if tag not in existing_tags:
                 existing_tags.append(tag)
             
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "tags": existing_tags
                 }
@@ -421,7 +501,7 @@ class BoldTrailCRM(CRM_Handler):
         Used by "The Hunter" to add FSBO/Expired leads
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 # Map lead_data to BoldTrail contact format
                 payload = {
                     "first_name": lead_data.get("first_name"),
@@ -4,10 +4,10 @@ API Documentation: https://api.followupboss.com/docs
 """
 
 import httpx
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime
 
-from app.crm.base import CRM_Handler, CRMLead, CRMProvider
+from app.crm.base import CRM_Handler, CRMLead, CRMProvider, CRMError, filter_lead_rows
 
 class FollowUpBossCRM(CRM_Handler):
     """
@@ -31,7 +31,7 @@ class FollowUpBossCRM(CRM_Handler):
     async def validate_connection(self) -> bool:
         """Test the API connection by fetching account info"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.get(
                     f"{self.BASE_URL}/users",
                     auth=self.auth,
@@ -57,7 +57,7 @@ class FollowUpBossCRM(CRM_Handler):
         - Tags are in the 'tags' array
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 params = {
                     "limit": limit,
                     "sort": "-created",  # Most recent first
@@ -98,8 +98,81 @@ class FollowUpBossCRM(CRM_Handler):
             print(f"Error fetching Follow Up Boss leads: {e}")
             return []
     
+    async def iter_lead_pages(
+        self,
+        statuses: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        page_size: int = 100,
+        updated_since: Optional[datetime] = None
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream all Follow Up Boss people as lead rows using offset pagination
+        
+        Pages are requested most-recently-updated first, so an incremental
+        sync stops as soon as it reaches a person older than updated_since.
+        """
+        offset = 0
+        
+        async with self._client() as client:
+            while True:
+                params = {
+                    "limit": page_size,
+                    "offset": offset,
+                    "sort": "-updated",
+                }
+                
+                if tags:
+                    params["tags"] = ",".join(tags)
+                
+                response = await self._get_with_retry(
+                    client,
+                    f"{self.BASE_URL}/people",
+                    auth=self.auth,
+                    params=params,
+                    timeout=30.0
+                )
+                
+                if response.status_code != 200:
+                    print(f"FUB API error: {response.status_code} - {response.text}")
+                    raise CRMError(f"Follow Up Boss returned HTTP {response.status_code} at offset {offset}")
+                
+                data = response.json()
+                people = data.get("people") if isinstance(data, dict) else None
+                if not isinstance(people, list):
+                    raise CRMError(f"Follow Up Boss returned an unexpected payload at offset {offset}")
+                
+                if not people:
+                    return
+                
+                rows, reached_cutoff = filter_lead_rows(
+                    self.map_page_to_rows(people),
+                    statuses=statuses,
+                    updated_since=updated_since,
+                    stop_at_cutoff=True
+                )
+                if rows:
+                    yield rows
+                if reached_cutoff:
+                    return
+                
+                # The API caps page size, so advance by what was actually returned
+                offset += len(people)
+                total = data.get("_metadata", {}).get("total")
+                if total is not None and offset >= total:
+                    return
+    
+    def map_page_to_rows(self, people: List[Dict[str, Any]]) -> List[Tuple]:
+        """Convert a page of FUB 'person' objects to lead rows"""
+        person_to_row = self._person_to_row
+        return [person_to_row(person) for person in people]
+    
     def _map_person_to_lead(self, person: Dict[str, Any]) -> CRMLead:
         """Convert FUB 'person' object to CRMLead"""
+        return CRMLead(*self._person_to_row(person))
+    
+    @staticmethod
+    def _person_to_row(person: Dict[str, Any]) -> Tuple:
+        """Convert FUB 'person' object to a row in CRM_LEAD_COLUMNS order"""
         
         # Extract name
         first_name = person.get("firstName")
@@ -139,25 +212,26 @@ class FollowUpBossCRM(CRM_Handler):
             except:
                 pass
         
-        return CRMLead(
-            crm_lead_id=str(person.get("id")),
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            phone=phone,
-            status=status,
-            tags=tags,
-            price_range_min=price_min,
-            price_range_max=price_max,
-            location=location,
-            last_activity_at=last_activity_dt,
-            custom_fields=custom_fields
+        return (
+            str(person.get("id")),
+            first_name,
+            last_name,
+            email,
+            phone,
+            status,
+            tags or [],
+            price_min,
+            price_max,
+            location,
+            last_activity_dt,
+            None,  # notes
+            custom_fields or {}
         )
     
     async def get_lead_by_id(self, lead_id: str) -> Optional[CRMLead]:
         """Fetch a single lead by ID"""
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.get(
                     f"{self.BASE_URL}/people/{lead_id}",
                     auth=self.auth,
@@ -184,7 +258,7 @@ class FollowUpBossCRM(CRM_Handler):
         Send an email via Follow Up Boss
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "personId": lead_id,
                     "subject": subject,
@@ -226,7 +300,7 @@ class FollowUpBossCRM(CRM_Handler):
         Send an SMS via Follow Up Boss
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "personId": lead_id,
                     "body": body,
@@ -267,7 +341,7 @@ class FollowUpBossCRM(CRM_Handler):
         Create a note in Follow Up Boss
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "personId": lead_id,
                     "body": note_text,
@@ -308,7 +382,7 @@ class FollowUpBossCRM(CRM_Handler):
         Update the stage/status of a lead
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "stage": new_status
                 }
@@ -345,7 +419,7 @@ class FollowUpBossCRM(CRM_Handler):
             if tag not in existing_tags:
                 existing_tags.append(tag)
             
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 payload = {
                     "tags": existing_tags
                 }
@@ -369,7 +443,7 @@ class FollowUpBossCRM(CRM_Handler):
         Used by "The Hunter" to add FSBO/Expired leads
         """
         try:
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 # Map lead_data to FUB person format
                 payload = {
                     "firstName": lead_data.get("first_name"),
@@ -0,0 +1,364 @@
+"""
+Multi-CRM Aggregator
+Runs CRM operations across several connected providers concurrently
+"""
+
+import asyncio
+import re
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Tuple, Union
+from datetime import datetime
+
+from app.crm.base import CRM_Handler, CRMLead
+
+class ProviderResult:
+    """Outcome of one operation against one provider"""
+    
+    def __init__(
+        self,
+        provider: str,
+        success: bool,
+        value: Any = None,
+        error: Optional[str] = None,
+        timed_out: bool = False,
+        elapsed_ms: float = 0.0
+    ):
+        self.provider = provider
+        self.success = success
+        self.value = value
+        self.error = error
+        self.timed_out = timed_out
+        self.elapsed_ms = elapsed_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for API responses (value omitted, it may be a lead list)"""
+        return {
+            "provider": self.provider,
+            "success": self.success,
+            "error": self.error,
+            "timed_out": self.timed_out,
+            "elapsed_ms": round(self.elapsed_ms, 1)
+        }
+
+class MultiCRMLeads:
+    """Merged leads from several providers plus the per-provider outcomes"""
+    
+    def __init__(self, leads: List[CRMLead], results: Dict[str, ProviderResult]):
+        self.leads = leads
+        self.results = results
+    
+    @property
+    def failed(self) -> List[str]:
+        """Providers that errored or timed out"""
+        return [name for name, result in self.results.items() if not result.success]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": len(self.leads),
+            "leads": [lead.to_dict() for lead in self.leads],
+            "providers": {name: result.to_dict() for name, result in self.results.items()},
+            "failed": self.failed
+        }
+
+def _normalize_email(email: Optional[str]) -> Optional[str]:
+    if not email:
+        return None
+    email = email.strip().lower()
+    return email or None
+
+def _normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Keep the last 10 digits so '+1 (512) 555-0100' and '512.555.0100' match"""
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) < 7:
+        return None
+    return digits[-10:]
+
+def lead_identity_keys(lead: CRMLead) -> List[Tuple[str, str]]:
+    """Keys used to recognise the same person across CRMs"""
+    keys = []
+    email = _normalize_email(lead.email)
+    if email:
+        keys.append(("email", email))
+    phone = _normalize_phone(lead.phone)
+    if phone:
+        keys.append(("phone", phone))
+    return keys
+
+def _merge_into(primary: CRMLead, duplicate: CRMLead) -> None:
+    """Fill gaps in the primary lead from a duplicate found in another CRM"""
+    for field in ("first_name", "last_name", "email", "phone", "status",
+                  "price_range_min", "price_range_max", "location", "notes"):
+        if getattr(primary, field) is None and getattr(duplicate, field) is not None:
+            setattr(primary, field, getattr(duplicate, field))
+    
+    for tag in duplicate.tags:
+        if tag not in primary.tags:
+            primary.tags.append(tag)
+    
+    if duplicate.last_activity_at and (
+        primary.last_activity_at is None or duplicate.last_activity_at > primary.last_activity_at
+    ):
+        primary.last_activity_at = duplicate.last_activity_at
+
+def merge_leads(leads_by_provider: Dict[str, List[CRMLead]]) -> List[CRMLead]:
+    """
+    Merge and dedupe leads from several providers by email/phone
+    
+    The first provider (in dict order) wins; duplicates fill in missing fields
+    and union their tags. Every merged lead records where it came from in
+    custom_fields["crm_sources"] as {provider: crm_lead_id}. Merged leads are
+    copies; the input leads are left untouched.
+    """
+    merged: List[CRMLead] = []
+    by_key: Dict[Tuple[str, str], CRMLead] = {}
+    
+    for provider, leads in leads_by_provider.items():
+        for lead in leads:
+            keys = lead_identity_keys(lead)
+            primary = next((by_key[key] for key in keys if key in by_key), None)
+            
+            if primary is None:
+                primary = lead.copy()
+                primary.custom_fields.setdefault("crm_sources", {})[provider] = lead.crm_lead_id
+                merged.append(primary)
+            else:
+                _merge_into(primary, lead)
+                primary.custom_fields.setdefault("crm_sources", {})[provider] = lead.crm_lead_id
+            
+            for key in lead_identity_keys(primary) + keys:
+                by_key.setdefault(key, primary)
+    
+    return merged
+
+class MultiCRM:
+    """
+    Fan-out wrapper over several CRM_Handler instances
+    
+    Every operation runs against all providers at once with a per-provider
+    timeout. One provider failing or hanging never fails the whole call;
+    its error is reported in the per-provider results instead.
+    
+    Usage:
+        multi = MultiCRM({"followupboss": fub, "boldtrail": boldtrail})
+        result = await multi.get_leads(tags=["Zillow Lead"])
+        result.leads, result.failed
+    """
+    
+    def __init__(
+        self,
+        handlers: Union[Dict[str, CRM_Handler], List[CRM_Handler]],
+        timeout: float = 30.0,
+        timeouts: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            handlers: Handlers keyed by name, or a list keyed by each handler's provider
+            timeout: Default per-provider timeout in seconds
+            timeouts: Optional per-provider overrides
+        """
+        if isinstance(handlers, dict):
+            self.handlers = dict(handlers)
+        else:
+            self.handlers = {}
+            for handler in handlers:
+                name = handler.provider.value if hasattr(handler.provider, "value") else str(handler.provider)
+                self.handlers[name] = handler
+        
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.last_stream_results: Dict[str, ProviderResult] = {}
+    
+    def _timeout_for(self, provider: str) -> float:
+        return self.timeouts.get(provider, self.timeout)
+    
+    async def _run(self, provider: str, operation: Callable[[], Awaitable[Any]]) -> ProviderResult:
+        """Run one provider call under its timeout and capture the outcome"""
+        started = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(operation(), timeout=self._timeout_for(provider))
+            return ProviderResult(provider, True, value=value,
+                                  elapsed_ms=(time.perf_counter() - started) * 1000)
+        except asyncio.TimeoutError:
+            return ProviderResult(provider, False, error="Timed out", timed_out=True,
+                                  elapsed_ms=(time.perf_counter() - started) * 1000)
+        except Exception as e:
+            return ProviderResult(provider, False, error=str(e),
+                                  elapsed_ms=(time.perf_counter() - started) * 1000)
+    
+    async def _fan_out(
+        self,
+        operation: Callable[[CRM_Handler], Awaitable[Any]],
+        providers: Optional[List[str]] = None
+    ) -> Dict[str, ProviderResult]:
+        names = [name for name in self.handlers if providers is None or name in providers]
+        results = await asyncio.gather(*[
+            self._run(name, lambda handler=self.handlers[name]: operation(handler))
+            for name in names
+        ])
+        return dict(zip(names, results))
+    
+    async def validate_connection(self) -> Dict[str, ProviderResult]:
+        """Validate every provider; result.value is the handler's bool"""
+        results = await self._fan_out(lambda handler: handler.validate_connection())
+        for result in results.values():
+            if result.success and not result.value:
+                result.success = False
+                result.error = result.error or "Invalid credentials or connection failed"
+        return results
+    
+    async def get_leads(
+        self,
+        statuses: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = 100
+    ) -> MultiCRMLeads:
+        """Fetch leads from all providers concurrently and merge them"""
+        results = await self._fan_out(
+            lambda handler: handler.get_leads(statuses=statuses, tags=tags, limit=limit)
+        )
+        leads_by_provider = {
+            name: result.value or [] for name, result in results.items() if result.success
+        }
+        return MultiCRMLeads(merge_leads(leads_by_provider), results)
+    
+    async def iter_leads(
+        self,
+        statuses: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        page_size: int = 100,
+        updated_since: Optional[datetime] = None
+    ) -> AsyncIterator[Tuple[str, CRMLead]]:
+        """
+        Stream (provider, lead) pairs from all providers as pages arrive
+        
+        Leads already seen under the same email/phone from another provider
+        are skipped. The timeout applies to each page (each wait for the
+        provider's next lead), not the whole stream, so a long but steady
+        export isn't cut off and time spent waiting on a slow consumer doesn't
+        count. The outcome per provider is left in self.last_stream_results.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=page_size * max(len(self.handlers), 1))
+        done = object()
+        self.last_stream_results = {}
+        
+        async def pump(name: str, handler: CRM_Handler) -> None:
+            count = 0
+            timeout = self._timeout_for(name)
+            started = time.perf_counter()
+            leads = handler.iter_leads(
+                statuses=statuses, tags=tags, page_size=page_size, updated_since=updated_since
+            )
+            try:
+                while True:
+                    try:
+                        lead = await asyncio.wait_for(leads.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    await queue.put((name, lead))
+                    count += 1
+                result = ProviderResult(name, True, value=count)
+            except asyncio.TimeoutError:
+                result = ProviderResult(name, False, value=count, error=f"Timed out waiting {timeout}s for a page",
+                                        timed_out=True)
+            except Exception as e:
+                result = ProviderResult(name, False, value=count, error=str(e))
+            finally:
+                await leads.aclose()
+            result.elapsed_ms = (time.perf_counter() - started) * 1000
+            self.last_stream_results[name] = result
+            await queue.put(done)
+        
+        tasks = [asyncio.create_task(pump(name, handler)) for name, handler in self.handlers.items()]
+        seen = set()
+        remaining = len(tasks)
+        
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                
+                name, lead = item
+                keys = lead_identity_keys(lead)
+                if any(key in seen for key in keys):
+                    continue
+                seen.update(keys)
+                yield name, lead
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def create_lead(
+        self,
+        lead_data: Dict[str, Any],
+        providers: Optional[List[str]] = None
+    ) -> Dict[str, ProviderResult]:
+        """Create the same lead in every (or the selected) provider; value is the CRM lead ID"""
+        results = await self._fan_out(lambda handler: handler.create_lead(lead_data), providers)
+        for result in results.values():
+            if result.success and not result.value:
+                result.success = False
+                result.error = result.error or "Lead creation failed"
+        return results
+    
+    async def _fan_out_by_lead_id(
+        self,
+        lead_ids: Dict[str, str],
+        operation: Callable[[CRM_Handler, str], Awaitable[Any]]
+    ) -> Dict[str, ProviderResult]:
+        """Writes against existing leads need each provider's own lead ID"""
+        return await self._fan_out(
+            lambda handler: operation(handler, lead_ids[self._name_of(handler)]),
+            providers=[name for name in lead_ids if name in self.handlers]
+        )
+    
+    def _name_of(self, handler: CRM_Handler) -> str:
+        for name, candidate in self.handlers.items():
+            if candidate is handler:
+                return name
+        raise KeyError("Handler is not part of this MultiCRM")
+    
+    async def create_note(self, lead_ids: Dict[str, str], note_text: str) -> Dict[str, ProviderResult]:
+        """
+        Log a note on the same person in each CRM
+        
+        Args:
+            lead_ids: Provider name -> that provider's lead ID (e.g. custom_fields["crm_sources"])
+        """
+        results = await self._fan_out_by_lead_id(
+            lead_ids, lambda handler, lead_id: handler.create_note(lead_id, note_text)
+        )
+        return self._check_dict_results(results)
+    
+    async def update_lead_status(self, lead_ids: Dict[str, str], new_status: str) -> Dict[str, ProviderResult]:
+        """Update the status of the same person in each CRM"""
+        results = await self._fan_out_by_lead_id(
+            lead_ids, lambda handler, lead_id: handler.update_lead_status(lead_id, new_status)
+        )
+        return self._check_bool_results(results)
+    
+    async def add_lead_tag(self, lead_ids: Dict[str, str], tag: str) -> Dict[str, ProviderResult]:
+        """Tag the same person in each CRM"""
+        results = await self._fan_out_by_lead_id(
+            lead_ids, lambda handler, lead_id: handler.add_lead_tag(lead_id, tag)
+        )
+        return self._check_bool_results(results)
+    
+    @staticmethod
+    def _check_bool_results(results: Dict[str, ProviderResult]) -> Dict[str, ProviderResult]:
+        for result in results.values():
+            if result.success and not result.value:
+                result.success = False
+                result.error = result.error or "Provider rejected the update"
+        return results
+    
+    @staticmethod
+    def _check_dict_results(results: Dict[str, ProviderResult]) -> Dict[str, ProviderResult]:
+        for result in results.values():
+            if result.success and not (result.value or {}).get("success"):
+                result.success = False
+                result.error = (result.value or {}).get("error") or "Provider rejected the request"
+        return results
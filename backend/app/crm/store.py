@@ -0,0 +1,123 @@
+"""
+CRM Credential Store
+Persists encrypted CRM credentials and caches the handlers built from them
+"""
+
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.encryption import encrypt_credentials, decrypt_credentials
+from app.crm import CRMFactory, CRM_Handler, MultiCRM
+from app.models.crm_connection import CRMConnection
+
+# Decrypted handlers keyed by connection id -> (credentials version, handler)
+# The version is the row's updated_at, so a rotation done by another worker
+# process is picked up on the next request even before the TTL runs out.
+_handler_cache = TTLCache(ttl_seconds=settings.CRM_HANDLER_CACHE_TTL_SECONDS, max_entries=1024)
+
+def save_connection(
+    db: Session,
+    user_id: int,
+    provider: str,
+    credentials: Dict[str, Any]
+) -> CRMConnection:
+    """
+    Encrypt and store credentials for a user's provider (insert or rotate)
+    
+    Any cached handler for the connection is invalidated.
+    """
+    provider = provider.lower()
+    encrypted_blob, iv = encrypt_credentials(credentials)
+    
+    connection = db.query(CRMConnection).filter(
+        CRMConnection.user_id == user_id,
+        CRMConnection.crm_provider == provider
+    ).first()
+    
+    if connection:
+        connection.encrypted_credentials = encrypted_blob
+        connection.encryption_iv = iv
+        connection.updated_at = datetime.utcnow()
+    else:
+        connection = CRMConnection(
+            user_id=user_id,
+            crm_provider=provider,
+            encrypted_credentials=encrypted_blob,
+            encryption_iv=iv
+        )
+        db.add(connection)
+    
+    connection.is_connected = True
+    connection.last_validated_at = datetime.utcnow()
+    connection.validation_error = None
+    
+    db.commit()
+    db.refresh(connection)
+    
+    invalidate_handler(connection.id)
+    return connection
+
+def get_connections(db: Session, user_id: int) -> List[CRMConnection]:
+    """All CRM connections for a user"""
+    return db.query(CRMConnection).filter(CRMConnection.user_id == user_id).all()
+
+def get_connection(
+    db: Session,
+    user_id: int,
+    provider: Optional[str] = None,
+    connection_id: Optional[int] = None
+) -> Optional[CRMConnection]:
+    """Look up one of the user's connections by id or provider"""
+    query = db.query(CRMConnection).filter(CRMConnection.user_id == user_id)
+    
+    if connection_id is not None:
+        query = query.filter(CRMConnection.id == connection_id)
+    if provider:
+        query = query.filter(CRMConnection.crm_provider == provider.lower())
+    
+    return query.first()
+
+def get_handler(connection: CRMConnection) -> CRM_Handler:
+    """
+    Return a ready CRM_Handler for a stored connection
+    
+    Credentials are decrypted and the handler built once per connection,
+    then reused until the TTL expires or the credentials change.
+    """
+    version = connection.updated_at
+    cached = _handler_cache.get(connection.id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    credentials = decrypt_credentials(connection.encrypted_credentials, connection.encryption_iv)
+    handler = CRMFactory.create_handler(connection.crm_provider, credentials)
+    _handler_cache.set(connection.id, (version, handler))
+    return handler
+
+def get_multi_handler(db: Session, user_id: int, timeout: float = 30.0) -> Optional[MultiCRM]:
+    """MultiCRM over every connected provider for a user, or None if there are none"""
+    connections = [c for c in get_connections(db, user_id) if c.is_connected]
+    if not connections:
+        return None
+    
+    return MultiCRM(
+        {connection.crm_provider: get_handler(connection) for connection in connections},
+        timeout=timeout
+    )
+
+def invalidate_handler(connection_id: int) -> None:
+    """Forget the cached handler for a connection (disconnect or rotation)"""
+    _handler_cache.invalidate(connection_id)
+
+def delete_connection(db: Session, connection: CRMConnection) -> None:
+    """Delete stored credentials and drop the cached handler"""
+    connection_id = connection.id
+    db.delete(connection)
+    db.commit()
+    invalidate_handler(connection_id)
+
+def handler_cache_stats() -> Dict[str, Any]:
+    return _handler_cache.stats()
@@ -1,12 +1,45 @@
 """
 Google Calendar Integration
 Two-way sync for team tasks and personal calendar
+
+Every instance shares one pooled httpx client (keep-alive connections to
+googleapis.com are reused across calls and users) and can be given a
+semaphore that bounds its requests in flight, e.g. one per user. Many event
+reads go out as Calendar API batch requests (up to 50 per HTTP call), and
+list_changes() follows a calendar incrementally with a syncToken.
 """
 
+import asyncio
+import json
+import re
+import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from urllib.parse import quote, urlencode
 import httpx
 
+BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+BATCH_MAX_REQUESTS = 50  # Calendar API limit per batch call
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def shared_client() -> httpx.AsyncClient:
+    """The pooled client every GoogleCalendarIntegration uses by default"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+    return _shared_client
+
+async def close_shared_client() -> None:
+    """Close the pooled client (app shutdown)"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
 class GoogleCalendarIntegration:
     """
     Google Calendar API integration for AgentAssist
@@ -23,10 +56,27 @@ class GoogleCalendarIntegration:
         'https://www.googleapis.com/auth/calendar.events'
     ]
     
-    def __init__(self, access_token: str, refresh_token: Optional[str] = None):
+    def __init__(
+        self,
+        access_token: str,
+        refresh_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[asyncio.Semaphore] = None
+    ):
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.base_url = "https://www.googleapis.com/calendar/v3"
+        self.client = client
+        self.limiter = limiter
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """One API call on the pooled client, within this instance's concurrency limit"""
+        headers = {'Authorization': f'Bearer {self.access_token}', **kwargs.pop('headers', {})}
+        client = self.client or shared_client()
+        if self.limiter is None:
+            return await client.request(method, url, headers=headers, **kwargs)
+        async with self.limiter:
+            return await client.request(method, url, headers=headers, **kwargs)
     
     async def create_event(
         self,
@@ -45,52 +95,48 @@ class GoogleCalendarIntegration:
             Event object with event_id
         """
         try:
-            async with httpx.AsyncClient() as client:
-                event = {
-                    'summary': title,
-                    'description': description,
-                    'start': {
-                        'dateTime': start_time.isoformat(),
-                        'timeZone': 'America/Los_Angeles',
-                    },
-                    'end': {
-                        'dateTime': end_time.isoformat(),
-                        'timeZone': 'America/Los_Angeles',
-                    },
-                    'attendees': [{'email': email} for email in attendees],
-                    'reminders': {
-                        'useDefault': False,
-                        'overrides': [
-                            {'method': 'email', 'minutes': 24 * 60},  # 1 day before
-                            {'method': 'popup', 'minutes': 30},  # 30 min before
-                        ],
-                    },
-                    'guestsCanModify': False,
-                    'guestsCanInviteOthers': False,
-                    'guestsCanSeeOtherGuests': True,
+            event = {
+                'summary': title,
+                'description': description,
+                'start': {
+                    'dateTime': start_time.isoformat(),
+                    'timeZone': 'America/Los_Angeles',
+                },
+                'end': {
+                    'dateTime': end_time.isoformat(),
+                    'timeZone': 'America/Los_Angeles',
+                },
+                'attendees': [{'email': email} for email in attendees],
+                'reminders': {
+                    'useDefault': False,
+                    'overrides': [
+                        {'method': 'email', 'minutes': 24 * 60},  # 1 day before
+                        {'method': 'popup', 'minutes': 30},  # 30 min before
+                    ],
+                },
+                'guestsCanModify': False,
+                'guestsCanInviteOthers': False,
+                'guestsCanSeeOtherGuests': True,
+            }
+            
+            response = await self._request(
+                'POST',
+                f"{self.base_url}/calendars/{calendar_id}/events",
+                json=event,
+                params={'sendUpdates': 'all' if send_notifications else 'none'}
+            )
+            
+            if response.status_code == 200:
+                return {
+                    'success': True,
+                    'event': response.json()
                 }
-                
-                response = await client.post(
-                    f"{self.base_url}/calendars/{calendar_id}/events",
-                    json=event,
-                    headers={
-                        'Authorization': f'Bearer {self.access_token}',
-                        'Content-Type': 'application/json'
-                    },
-                    params={'sendUpdates': 'all' if send_notifications else 'none'}
-                )
-                
-                if response.status_code == 200:
-                    return {
-                        'success': True,
-                        'event': response.json()
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'error': response.text
-                    }
-                    
+            else:
+                return {
+                    'success': False,
+                    'error': response.text
+                }
+        
         except Exception as e:
             return {
                 'success': False,
@@ -101,27 +147,27 @@ class GoogleCalendarIntegration:
         self,
         calendar_id: str,
         event_id: str,
-        updates: Dict[str, Any]
+        updates: Dict[str, Any],
+        send_notifications: bool = False
     ) -> Dict[str, Any]:
         """
         Update an existing calendar event
+        
+        With send_notifications, attendees (including newly added ones) are emailed.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    f"{self.base_url}/calendars/{calendar_id}/events/{event_id}",
-                    json=updates,
-                    headers={
-                        'Authorization': f'Bearer {self.access_token}',
-                        'Content-Type': 'application/json'
-                    }
-                )
-                
-                return {
-                    'success': response.status_code == 200,
-                    'event': response.json() if response.status_code == 200 else None
-                }
-                
+            response = await self._request(
+                'PATCH',
+                f"{self.base_url}/calendars/{calendar_id}/events/{event_id}",
+                json=updates,
+                params={'sendUpdates': 'all' if send_notifications else 'none'}
+            )
+            
+            return {
+                'success': response.status_code == 200,
+                'event': response.json() if response.status_code == 200 else None
+            }
+        
         except Exception as e:
             return {
                 'success': False,
@@ -137,14 +183,13 @@ class GoogleCalendarIntegration:
         Delete a calendar event
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.base_url}/calendars/{calendar_id}/events/{event_id}",
-                    headers={'Authorization': f'Bearer {self.access_token}'}
-                )
-                
-                return response.status_code == 204
-                
+            response = await self._request(
+                'DELETE',
+                f"{self.base_url}/calendars/{calendar_id}/events/{event_id}"
+            )
+            
+            return response.status_code == 204
+        
         except Exception as e:
             print(f"Error deleting event: {e}")
             return False
@@ -157,29 +202,136 @@ class GoogleCalendarIntegration:
     ) -> List[Dict[str, Any]]:
         """
         Get events in a date range
+        
+        For keeping up with a calendar, use list_changes() instead; it only
+        returns what changed since the last call.
+        """
+        try:
+            response = await self._request(
+                'GET',
+                f"{self.base_url}/calendars/{calendar_id}/events",
+                params={
+                    'timeMin': time_min.isoformat() + 'Z',
+                    'timeMax': time_max.isoformat() + 'Z',
+                    'singleEvents': True,
+                    'orderBy': 'startTime'
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                return data.get('items', [])
+            else:
+                return []
+        
+        except Exception as e:
+            print(f"Error fetching events: {e}")
+            return []
+    
+    async def list_changes(
+        self,
+        calendar_id: str,
+        sync_token: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
+        Events changed since sync_token (every event if None), all pages
+        
+        Returns:
+            {'success', 'events', 'next_sync_token'}; 'expired' is True when
+            Google no longer accepts the token (410) and a full sync is needed.
+        """
+        params = {'maxResults': 2500, 'showDeleted': 'true'}
+        if sync_token:
+            params['syncToken'] = sync_token
+        if fields:
+            params['fields'] = f"nextPageToken,nextSyncToken,items({fields})"
+        else:
+            params['fields'] = "nextPageToken,nextSyncToken,items"
+        
+        events = []
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
+            while True:
+                response = await self._request(
+                    'GET',
                     f"{self.base_url}/calendars/{calendar_id}/events",
-                    headers={'Authorization': f'Bearer {self.access_token}'},
-                    params={
-                        'timeMin': time_min.isoformat() + 'Z',
-                        'timeMax': time_max.isoformat() + 'Z',
-                        'singleEvents': True,
-                        'orderBy': 'startTime'
-                    }
+                    params=params
                 )
+                if response.status_code == 410:
+                    return {'success': False, 'expired': True, 'error': 'Sync token expired'}
+                if response.status_code != 200:
+                    return {'success': False, 'error': response.text}
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get('items', [])
-                else:
-                    return []
-                    
+                data = response.json()
+                events.extend(data.get('items', []))
+                if not data.get('nextPageToken'):
+                    return {
+                        'success': True,
+                        'events': events,
+                        'next_sync_token': data.get('nextSyncToken')
+                    }
+                params['pageToken'] = data['nextPageToken']
+        
         except Exception as e:
-            print(f"Error fetching events: {e}")
-            return []
+            return {'success': False, 'error': str(e)}
+    
+    async def batch_get_events(
+        self,
+        calendar_id: str,
+        event_ids: List[str],
+        fields: Optional[str] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch many events with batch requests (50 per HTTP call)
+        
+        Returns:
+            Dict mapping event_id -> event, or None if it couldn't be read
+        """
+        chunks = [event_ids[i:i + BATCH_MAX_REQUESTS] for i in range(0, len(event_ids), BATCH_MAX_REQUESTS)]
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for found in await asyncio.gather(*(
+            self._batch_get(calendar_id, chunk, fields) for chunk in chunks
+        )):
+            results.update(found)
+        return results
+    
+    async def _batch_get(
+        self,
+        calendar_id: str,
+        event_ids: List[str],
+        fields: Optional[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        query = f"?{urlencode({'fields': fields})}" if fields else ""
+        parts = []
+        for index, event_id in enumerate(event_ids):
+            path = f"/calendar/v3/calendars/{quote(calendar_id, safe='')}/events/{quote(event_id, safe='')}{query}"
+            parts.append(
+                f"--{boundary}\r\n"
+                f"Content-Type: application/http\r\n"
+                f"Content-ID: <item{index}>\r\n\r\n"
+                f"GET {path}\r\n\r\n"
+            )
+        body = "".join(parts) + f"--{boundary}--\r\n"
+        
+        results: Dict[str, Optional[Dict[str, Any]]] = {event_id: None for event_id in event_ids}
+        try:
+            response = await self._request(
+                'POST',
+                BATCH_URL,
+                content=body.encode(),
+                headers={'Content-Type': f'multipart/mixed; boundary={boundary}'}
+            )
+            if response.status_code != 200:
+                print(f"Error in calendar batch request: {response.status_code} {response.text[:200]}")
+                return results
+            
+            for index, (status_code, event) in _parse_batch_response(response).items():
+                if status_code == 200 and index < len(event_ids):
+                    results[event_ids[index]] = event
+        except Exception as e:
+            print(f"Error in calendar batch request: {e}")
+        return results
     
     async def get_attendee_status(
         self,
@@ -193,23 +345,17 @@ class GoogleCalendarIntegration:
             Dict mapping email -> status (accepted, declined, tentative, needsAction)
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/calendars/{calendar_id}/events/{event_id}",
-                    headers={'Authorization': f'Bearer {self.access_token}'}
-                )
-                
-                if response.status_code == 200:
-                    event = response.json()
-                    attendees = event.get('attendees', [])
-                    
-                    return {
-                        attendee['email']: attendee.get('responseStatus', 'needsAction')
-                        for attendee in attendees
-                    }
-                else:
-                    return {}
-                    
+            response = await self._request(
+                'GET',
+                f"{self.base_url}/calendars/{calendar_id}/events/{event_id}",
+                params={'fields': 'attendees(email,responseStatus)'}
+            )
+            
+            if response.status_code == 200:
+                return attendee_statuses(response.json())
+            else:
+                return {}
+        
         except Exception as e:
             print(f"Error getting attendee status: {e}")
             return {}
@@ -241,19 +387,47 @@ class GoogleCalendarIntegration:
         Exchange authorization code for access and refresh tokens
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://oauth2.googleapis.com/token",
-                    data={
-                        'code': code,
-                        'client_id': client_id,
-                        'client_secret': client_secret,
-                        'redirect_uri': redirect_uri,
-                        'grant_type': 'authorization_code'
-                    }
-                )
-                
-                return response.json()
-                
+            response = await shared_client().post(
+                "https://oauth2.googleapis.com/token",
+                data={
+                    'code': code,
+                    'client_id': client_id,
+                    'client_secret': client_secret,
+                    'redirect_uri': redirect_uri,
+                    'grant_type': 'authorization_code'
+                }
+            )
+            
+            return response.json()
+        
         except Exception as e:
             return {'error': str(e)}
+
+def attendee_statuses(event: Dict[str, Any]) -> Dict[str, str]:
+    """email -> responseStatus for an event's attendees"""
+    return {
+        attendee['email']: attendee.get('responseStatus', 'needsAction')
+        for attendee in event.get('attendees', [])
+        if attendee.get('email')
+    }
+
+def _parse_batch_response(response: httpx.Response) -> Dict[int, tuple]:
+    """multipart/mixed batch response -> {request index: (status code, JSON body)}"""
+    match = re.search(r'boundary="?([^";]+)"?', response.headers.get('content-type', ''))
+    if not match:
+        return {}
+    results = {}
+    for part in response.text.replace('\r\n', '\n').split(f"--{match.group(1)}"):
+        outer, _, inner = part.strip().partition('\n\n')
+        content_id = re.search(r'Content-ID:\s*<response-item(\d+)>', outer, re.IGNORECASE)
+        if not content_id:
+            continue
+        status_line, _, rest = inner.partition('\n')
+        _, _, payload = rest.partition('\n\n')
+        try:
+            status_code = int(status_line.split()[1])
+            body = json.loads(payload) if payload.strip() else None
+        except (IndexError, ValueError):
+            continue
+        results[int(content_id.group(1))] = (status_code, body)
+    return results
@@ -3,7 +3,7 @@ Campaign Database Models
 Drip email/SMS campaigns for lead nurturing
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -11,6 +11,10 @@ from app.core.database import Base
 
 class Campaign(Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        Index("ix_campaigns_user_id_status", "user_id", "status"),
+    )
+    __tenant_columns__ = ("user_id",)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)  # Owner
@@ -0,0 +1,50 @@
+"""
+CRM Connection Database Model
+Encrypted CRM credentials per user and provider
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, UniqueConstraint
+from datetime import datetime
+
+from app.core.database import Base
+
+class CRMConnection(Base):
+    __tablename__ = "crm_connections"
+    __table_args__ = (
+        UniqueConstraint("user_id", "crm_provider", name="uq_crm_connections_user_provider"),
+    )
+    __tenant_columns__ = ("user_id",)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)  # Owner
+    crm_provider = Column(String, nullable=False)  # followupboss, boldtrail, ...
+    
+    # Encrypted credentials (AES-256-GCM, see app/core/encryption.py)
+    encrypted_credentials = Column(Text, nullable=False)
+    encryption_iv = Column(String, nullable=False)
+    
+    # Connection status
+    is_connected = Column(Boolean, default=False)
+    last_validated_at = Column(DateTime, nullable=True)
+    validation_error = Column(Text, nullable=True)
+    
+    # Sync metadata
+    last_sync_at = Column(DateTime, nullable=True)
+    sync_frequency_minutes = Column(Integer, default=15)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert to dictionary for API responses (never includes credentials)"""
+        return {
+            'id': self.id,
+            'provider': self.crm_provider,
+            'is_connected': self.is_connected,
+            'last_validated_at': self.last_validated_at.isoformat() if self.last_validated_at else None,
+            'validation_error': self.validation_error,
+            'last_sync_at': self.last_sync_at.isoformat() if self.last_sync_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
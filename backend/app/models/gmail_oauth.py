@@ -3,13 +3,17 @@ Gmail OAuth Token Storage
 Securely store user Gmail access tokens
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Index
 from datetime import datetime
 
 from app.core.database import Base
 
 class GmailToken(Base):
     __tablename__ = "gmail_tokens"
+    __table_args__ = (
+        Index("ix_gmail_tokens_user_id_is_active", "user_id", "is_active"),
+    )
+    __tenant_columns__ = ("user_id",)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, unique=True, index=True)
@@ -26,6 +30,10 @@ class GmailToken(Base):
     # Gmail info
     email_address = Column(String, nullable=True)
     
+    # Google Calendar incremental sync state (see app/services/calendar_sync.py)
+    calendar_sync_token = Column(Text, nullable=True)
+    calendar_synced_at = Column(DateTime, nullable=True)
+    
     # Status
     is_active = Column(Boolean, default=True)
     
@@ -0,0 +1,201 @@
+"""
+Hunter Database Models
+Scheduled runs, the leads they found, seen listings and cached skip-trace / icebreaker results
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, JSON, Index, UniqueConstraint
+from datetime import datetime
+
+from app.core.database import Base
+
+class SeenListing(Base):
+    __tablename__ = "hunter_seen_listings"
+    __table_args__ = (
+        UniqueConstraint("user_id", "address_hash", name="uq_hunter_seen_listings_user_address"),
+        # Second identity key: listings are also matched on (user_id, listing_url)
+        Index("ix_hunter_seen_listings_user_id_listing_url", "user_id", "listing_url"),
+    )
+    __tenant_columns__ = ("user_id",)  # 0 = shared index
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, default=0, index=True)  # 0 = shared index
+    
+    # Identity: normalized address hash, with the listing URL as a second key
+    address_hash = Column(String(40), nullable=False, index=True)
+    normalized_address = Column(String, nullable=False)
+    listing_url = Column(String, nullable=True, index=True)
+    source = Column(String, nullable=True)
+    zip_code = Column(String, nullable=True)
+    
+    # Price history
+    last_price = Column(Integer, nullable=True)
+    previous_price = Column(Integer, nullable=True)
+    price_changed_at = Column(DateTime, nullable=True)
+    
+    # Sightings
+    first_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    times_seen = Column(Integer, default=1, nullable=False)
+    
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'id': self.id,
+            'address': self.normalized_address,
+            'listing_url': self.listing_url,
+            'source': self.source,
+            'zip_code': self.zip_code,
+            'last_price': self.last_price,
+            'previous_price': self.previous_price,
+            'price_changed_at': self.price_changed_at.isoformat() if self.price_changed_at else None,
+            'first_seen_at': self.first_seen_at.isoformat() if self.first_seen_at else None,
+            'last_seen_at': self.last_seen_at.isoformat() if self.last_seen_at else None,
+            'times_seen': self.times_seen
+        }
+
+class SkipTraceResult(Base):
+    """Owner contact info per normalized address, so no address is paid for twice"""
+    __tablename__ = "skip_trace_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    address_hash = Column(String(40), nullable=False, unique=True, index=True)
+    normalized_address = Column(String, nullable=False)
+    
+    found = Column(Boolean, default=False, nullable=False)  # Misses are cached too (shorter TTL)
+    owner_name = Column(String, nullable=True)
+    owner_phone = Column(String, nullable=True)
+    owner_email = Column(String, nullable=True)
+    provider = Column(String, nullable=True)
+    
+    traced_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+class IcebreakerResult(Base):
+    """Generated icebreaker per (template version, normalized address, price)"""
+    __tablename__ = "icebreaker_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(40), nullable=False, unique=True, index=True)
+    template_version = Column(String, nullable=False)
+    normalized_address = Column(String, nullable=False)
+    price = Column(Integer, nullable=True)
+    message = Column(Text, nullable=False)
+    model = Column(String, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class HunterRun(Base):
+    """One crawl of one market (scheduled or manual)"""
+    __tablename__ = "hunter_runs"
+    __table_args__ = (
+        Index("ix_hunter_runs_user_id_started_at", "user_id", "started_at"),
+    )
+    __tenant_columns__ = ("user_id",)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    market = Column(String, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False, default=0, index=True)
+    trigger = Column(String, default="schedule")  # schedule, manual
+    status = Column(String, default="running")  # running, completed, failed
+    
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    finished_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    
+    # Crawl stats
+    pages_fetched = Column(Integer, default=0)
+    cache_hits = Column(Integer, default=0)  # Pages unchanged since the last crawl
+    leads_found = Column(Integer, default=0)  # Every listing parsed
+    new_leads = Column(Integer, default=0)  # New or price-changed, stored in hunter_leads
+    errors = Column(Integer, default=0)
+    error_message = Column(Text, nullable=True)
+    stats = Column(JSON, nullable=True)  # Full CrawlStats / skip-trace stats
+    
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'id': self.id,
+            'market': self.market,
+            'user_id': self.user_id,
+            'trigger': self.trigger,
+            'status': self.status,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds,
+            'pages_fetched': self.pages_fetched,
+            'cache_hits': self.cache_hits,
+            'leads_found': self.leads_found,
+            'new_leads': self.new_leads,
+            'errors': self.errors,
+            'error_message': self.error_message,
+            'stats': self.stats
+        }
+
+class HunterLead(Base):
+    """An FSBOLead found by a run (only new or price-changed listings are stored)"""
+    __tablename__ = "hunter_leads"
+    __table_args__ = (
+        Index("ix_hunter_leads_zip_scraped", "zip_code", "scraped_at"),
+        Index("ix_hunter_leads_user_id_scraped_at", "user_id", "scraped_at"),
+    )
+    __tenant_columns__ = ("user_id",)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, nullable=True, index=True)
+    user_id = Column(Integer, nullable=False, default=0, index=True)
+    market = Column(String, nullable=True)
+    
+    # Property
+    address = Column(String, nullable=False)
+    city = Column(String, nullable=True)
+    state = Column(String, nullable=True)
+    zip_code = Column(String, nullable=True)
+    price = Column(Integer, nullable=True)
+    previous_price = Column(Integer, nullable=True)
+    bedrooms = Column(Integer, nullable=True)
+    bathrooms = Column(Float, nullable=True)
+    sqft = Column(Integer, nullable=True)
+    listing_url = Column(String, nullable=True)
+    source = Column(String, nullable=True)
+    listing_status = Column(String, nullable=True)  # new, price_changed
+    
+    # Owner (skip trace)
+    owner_name = Column(String, nullable=True)
+    owner_phone = Column(String, nullable=True)
+    owner_email = Column(String, nullable=True)
+    icebreaker = Column(Text, nullable=True)
+    
+    scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Push stage (set once, so retries never create duplicates)
+    lead_id = Column(Integer, nullable=True, index=True)  # Row created in leads
+    crm_ids = Column(JSON, nullable=True)  # {"followupboss": "123", ...}
+    pushed_at = Column(DateTime, nullable=True)
+    push_claimed_at = Column(DateTime, nullable=True)  # Set while a push (in any process) owns the row
+    
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'id': self.id,
+            'run_id': self.run_id,
+            'market': self.market,
+            'address': self.address,
+            'city': self.city,
+            'state': self.state,
+            'zip_code': self.zip_code,
+            'price': self.price,
+            'previous_price': self.previous_price,
+            'bedrooms': self.bedrooms,
+            'bathrooms': self.bathrooms,
+            'sqft': self.sqft,
+            'listing_url': self.listing_url,
+            'source': self.source,
+            'listing_status': self.listing_status,
+            'owner_name': self.owner_name,
+            'owner_phone': self.owner_phone,
+            'owner_email': self.owner_email,
+            'icebreaker': self.icebreaker,
+            'scraped_at': self.scraped_at.isoformat() if self.scraped_at else None,
+            'lead_id': self.lead_id,
+            'crm_ids': self.crm_ids or {},
+            'pushed_at': self.pushed_at.isoformat() if self.pushed_at else None
+        }
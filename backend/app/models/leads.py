@@ -3,14 +3,36 @@ Lead Database Models
 Persistent storage for imported leads
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Boolean, Index, text
 from datetime import datetime
+from typing import Optional
 
 # Import shared Base from database.py
 from app.core.database import Base
 
+def normalize_status(status: Optional[str]) -> Optional[str]:
+    """
+    Canonical form of a lead status: "attempted_contact", " new " -> "Attempted Contact", "New"
+    
+    Statuses are stored normalized so filters can compare Lead.status directly
+    and use the (..., status) indexes.
+    """
+    if not status:
+        return status
+    return " ".join(status.replace("_", " ").split()).title()
+
 class Lead(Base):
     __tablename__ = "leads"
+    __table_args__ = (
+        Index("ix_leads_user_id_created_at", "user_id", "created_at"),
+        Index("ix_leads_assigned_to_assigned_at", "assigned_to", "assigned_at"),
+        # Team lead board: owned-by-member and assigned-to-member halves of the team scope
+        Index("ix_leads_user_id_assigned_to_status", "user_id", "assigned_to", "status"),
+        Index("ix_leads_assigned_to_status_id", "assigned_to", "status", "id"),
+        # Webhook upserts match emails case-insensitively
+        Index("ix_leads_user_id_email_lower", "user_id", text("lower(email)")),
+    )
+    __tenant_columns__ = ("user_id", "assigned_to")  # Owner, then assignee (see app/core/tenancy.py)
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -41,8 +63,10 @@ class Lead(Base):
     user_id = Column(Integer, nullable=False, index=True)  # Owner of this lead
     
     # Assignment
-    assigned_to = Column(Integer, nullable=True)  # User ID assigned to
+    assigned_to = Column(Integer, nullable=True, index=True)  # User ID assigned to
     assigned_at = Column(DateTime, nullable=True)
+    response_due_at = Column(DateTime, nullable=True, index=True)  # Routed lead is reassigned if not contacted by then
+    routing_attempts = Column(Integer, default=0)  # Times the routing engine has (re)assigned it
     
     # Metadata
     imported_from = Column(String, default="CSV")  # CSV, API, Manual
@@ -3,13 +3,17 @@ Task Database Model
 Daily tasks for real estate agents
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index
 from datetime import datetime
 
 from app.core.database import Base
 
 class Task(Base):
     __tablename__ = "user_tasks"
+    __table_args__ = (
+        Index("ix_user_tasks_user_id_due_date", "user_id", "due_date", "due_time"),
+    )
+    __tenant_columns__ = ("user_id",)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)  # Owner
@@ -2,7 +2,7 @@
 Simplified Team Models - No Foreign Keys or Relationships
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, Index, UniqueConstraint
 from datetime import datetime
 from app.core.database import Base
 
@@ -14,6 +14,10 @@ class Team(Base):
     description = Column(Text, nullable=True)
     leader_id = Column(Integer, nullable=False)  # References users.id (no foreign key)
     
+    # Automatic lead routing (None = leaders assign by hand)
+    routing_strategy = Column(String, nullable=True)  # round_robin, weighted, least_loaded
+    routing_weights = Column(JSON, nullable=True)  # {"<user_id>": weight}; 0 takes a member out of rotation
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -23,11 +27,43 @@ class Team(Base):
             'name': self.name,
             'description': self.description,
             'leader_id': self.leader_id,
+            'routing_strategy': self.routing_strategy,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class TeamStats(Base):
+    """Rollup of a team's dashboard counters (kept current by the team routes)"""
+    __tablename__ = "team_stats"
+    
+    team_id = Column(Integer, primary_key=True)  # References teams.id
+    
+    member_count = Column(Integer, default=0, nullable=False)
+    total_tasks = Column(Integer, default=0, nullable=False)  # Tasks with this team_id
+    pending_tasks = Column(Integer, default=0, nullable=False)  # Their assignments, by status
+    completed_tasks = Column(Integer, default=0, nullable=False)
+    total_leads = Column(Integer, default=0, nullable=False)  # Leads assigned to team members
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    reconciled_at = Column(DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'team_id': self.team_id,
+            'member_count': self.member_count,
+            'total_tasks': self.total_tasks,
+            'pending_tasks': self.pending_tasks,
+            'completed_tasks': self.completed_tasks,
+            'total_leads': self.total_leads,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'reconciled_at': self.reconciled_at.isoformat() if self.reconciled_at else None
+        }
+
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_team_id_due_date", "team_id", "due_date"),
+    )
+    __tenant_columns__ = ("team_id",)
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -48,6 +84,9 @@ class Task(Base):
     creator_id = Column(Integer, nullable=False)  # References users.id
     team_id = Column(Integer, nullable=True)  # References teams.id
     
+    # One shared Google Calendar event per task (on the creator's calendar), all assignees invited
+    google_calendar_event_id = Column(String, nullable=True, index=True)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -68,10 +107,14 @@ class Task(Base):
 
 class TaskAssignment(Base):
     __tablename__ = "task_assignments"
+    __table_args__ = (
+        UniqueConstraint("task_id", "assignee_id", name="uq_task_assignments_task_assignee"),
+        Index("ix_task_assignments_assignee_status", "assignee_id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
-    task_id = Column(Integer, nullable=False)  # References tasks.id
+    task_id = Column(Integer, nullable=False, index=True)  # References tasks.id
     assignee_id = Column(Integer, nullable=False)  # References users.id
     
     status = Column(String, default="pending")  # pending, accepted, declined, completed
@@ -95,3 +138,40 @@ class TaskAssignment(Base):
             'notes': self.notes,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+class TeamEvent(Base):
+    """Append-only team activity feed (read newest first by id)"""
+    __tablename__ = "team_events"
+    __table_args__ = (
+        Index("ix_team_events_team_id_id", "team_id", "id"),
+    )
+    __tenant_columns__ = ("team_id",)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, nullable=False)  # References teams.id
+    
+    event_type = Column(String, nullable=False)  # lead_assigned, task_completed, lead_status_changed
+    user_id = Column(Integer, nullable=True)  # Member the event is about (assignee / completer)
+    actor_id = Column(Integer, nullable=True)  # Who made the change
+    lead_id = Column(Integer, nullable=True)
+    task_id = Column(Integer, nullable=True)
+    
+    # Rendered when written, so reading the feed needs no joins
+    user_name = Column(String, nullable=True)
+    message = Column(Text, nullable=False)
+    data = Column(JSON, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.event_type,
+            'timestamp': self.created_at.isoformat() if self.created_at else None,
+            'message': self.message,
+            'user_name': self.user_name,
+            'user_id': self.user_id,
+            'lead_id': self.lead_id,
+            'task_id': self.task_id,
+            'data': self.data
+        }
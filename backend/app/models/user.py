@@ -22,7 +22,7 @@ class User(Base):
     is_team_leader = Column(Boolean, default=False)
     
     # Team ID (no foreign key to avoid creation order issues)
-    team_id = Column(Integer, nullable=True)
+    team_id = Column(Integer, nullable=True, index=True)
     
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     last_login = Column(DateTime, nullable=True)
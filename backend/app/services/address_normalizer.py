@@ -0,0 +1,113 @@
+"""
+Address Normalization
+Canonical street addresses so the same property matches across sources
+
+"123 North Main Street, Apt. 4B" and "123 N Main St #4b" both become
+"123 N MAIN ST UNIT 4B". The address hash combines that with the 5-digit
+ZIP (or city/state when the source has no ZIP).
+
+Unit designators double as street names, so a trailing "LOT X" / "SPACE X"
+is only a unit when X has a # or starts with a digit (and isn't a suffix),
+or when the designator follows the street suffix:
+    "45 Lot Ave"            -> "45 LOT AVE"
+    "1 Space Rd"            -> "1 SPACE RD"
+    "9 Oak Rd Lot 12"       -> "9 OAK RD UNIT 12"
+    "700 Elm St Space C"    -> "700 ELM ST UNIT C"
+"""
+
+import hashlib
+import re
+from typing import Optional
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s#-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_UNIT_RE = re.compile(r"\s*(?:(#)|\b(?:APARTMENT|APT|UNIT|SUITE|STE|NO|NUM|NUMBER|BLDG|BUILDING|LOT|SPACE|SPC|RM|ROOM)\b)\s*(#?)\s*([\w-]+)\s*$")
+_ZIP_RE = re.compile(r"\d{5}")
+
+STREET_SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "AV": "AVE", "BOULEVARD": "BLVD", "BEND": "BND",
+    "CIRCLE": "CIR", "COURT": "CT", "COVE": "CV", "CREEK": "CRK", "CROSSING": "XING",
+    "DRIVE": "DR", "EXPRESSWAY": "EXPY", "FREEWAY": "FWY", "HIGHWAY": "HWY", "HOLLOW": "HOLW",
+    "LANE": "LN", "LOOP": "LOOP", "PARKWAY": "PKWY", "PLACE": "PL", "PLAZA": "PLZ",
+    "POINT": "PT", "RIDGE": "RDG", "ROAD": "RD", "SQUARE": "SQ", "STREET": "ST",
+    "TERRACE": "TER", "TRAIL": "TRL", "TRACE": "TRCE", "VIEW": "VW", "WAY": "WAY"
+}
+
+SUFFIX_WORDS = set(STREET_SUFFIXES) | set(STREET_SUFFIXES.values())
+
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW"
+}
+
+def _is_unit(match: re.Match, text: str) -> bool:
+    """Whether a trailing designator match is a unit rather than part of the street name"""
+    value = match.group(3)
+    if value in SUFFIX_WORDS:
+        # "45 Lot Ave", "1 Space Rd": the designator is the street name
+        return False
+    if match.group(1) or match.group(2) or value[0].isdigit():
+        return True
+    before = text[:match.start()].split(" ")
+    return before[-1] in SUFFIX_WORDS
+
+def normalize_street(street: Optional[str]) -> str:
+    """Uppercase, strip punctuation, abbreviate suffixes/directionals, canonical unit"""
+    if not street:
+        return ""
+    
+    text = _PUNCTUATION_RE.sub(" ", street.upper())
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    
+    unit = None
+    match = _UNIT_RE.search(text)
+    if match and match.start() > 0 and _is_unit(match, text):
+        unit = match.group(3).replace("-", "")
+        text = text[:match.start()].strip()
+    
+    words = [DIRECTIONALS.get(word, word) for word in text.split(" ")]
+    if len(words) > 1:
+        # Only the last word is a suffix ("Park Street" -> "PARK ST", "Street Rd" stays)
+        words[-1] = STREET_SUFFIXES.get(words[-1], words[-1])
+    
+    normalized = " ".join(words)
+    if unit:
+        normalized = f"{normalized} UNIT {unit}"
+    return normalized
+
+def normalize_zip(zip_code: Optional[str]) -> str:
+    """First five digits ("78701-1234" -> "78701"), or "" when there are none"""
+    if not zip_code:
+        return ""
+    match = _ZIP_RE.search(zip_code)
+    return match.group() if match else ""
+
+def normalize_address(
+    street: Optional[str],
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    zip_code: Optional[str] = None
+) -> str:
+    """
+    Canonical "STREET|ZIP" key
+    
+    City and state are only used when there is no ZIP, since listings often
+    disagree on city names ("Austin" vs "West Lake Hills") within one ZIP.
+    """
+    zip5 = normalize_zip(zip_code)
+    if zip5:
+        locality = zip5
+    else:
+        locality = " ".join(
+            _WHITESPACE_RE.sub(" ", part.upper()).strip() for part in (city, state) if part
+        )
+    return f"{normalize_street(street)}|{locality}"
+
+def address_hash(
+    street: Optional[str],
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    zip_code: Optional[str] = None
+) -> str:
+    """SHA-1 of normalize_address(), used as a compact lookup key"""
+    return hashlib.sha1(normalize_address(street, city, state, zip_code).encode()).hexdigest()
@@ -0,0 +1,300 @@
+"""
+Calendar Sync
+Pull task invite RSVPs back from Google Calendar
+
+Each assigned task with a due date has one shared event on its creator's
+calendar (see task_calendar.py). Syncing a creator's calendar is one
+incremental events.list with the syncToken saved from the last sync, so only
+events changed since come back; the first sync (or one after Google expires
+the token) lists the calendar once with trimmed fields to get a token.
+Refreshing specific tasks reads their events with batch requests, 50 events
+per HTTP call. Attendee responses become task assignment statuses in one
+UPDATE per status.
+
+All calls share the pooled client in app/integrations/google_calendar.py.
+Each user gets a semaphore of CALENDAR_SYNC_USER_CONCURRENCY requests in
+flight, and the periodic loop syncs CALENDAR_SYNC_CONCURRENCY users at a time.
+"""
+
+import asyncio
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+import httpx
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.gmail_oauth import GmailToken
+from app.models.team_simple import Task, TaskAssignment
+from app.integrations.google_calendar import GoogleCalendarIntegration, attendee_statuses
+from app.services import team_stats
+
+CALENDAR_ID = "primary"
+EVENT_FIELDS = "id,status,attendees(email,responseStatus)"
+
+# Google responseStatus -> task assignment status (tentative / needsAction leave it alone)
+RSVP_STATUSES = {"accepted": "accepted", "declined": "declined"}
+
+def calendar_credentials(db: Session, user_id: int) -> Optional[GmailToken]:
+    """The user's Google token if it has a calendar scope, refreshed if expired; None if not connected"""
+    token = db.query(GmailToken).filter(
+        GmailToken.user_id == user_id,
+        GmailToken.is_active == True
+    ).first()
+    if not token:
+        return None
+    try:
+        scopes = json.loads(token.scopes or "[]")
+    except ValueError:
+        return None
+    if not any(scope in GoogleCalendarIntegration.SCOPES for scope in scopes):
+        return None
+    
+    if token.expiry and token.expiry <= datetime.utcnow() and token.refresh_token:
+        response = httpx.post(token.token_uri, data={
+            "client_id": os.getenv("GOOGLE_CLIENT_ID"),
+            "client_secret": os.getenv("GOOGLE_CLIENT_SECRET"),
+            "refresh_token": token.refresh_token,
+            "grant_type": "refresh_token"
+        }, timeout=10)
+        if response.status_code != 200:
+            print(f"⚠️ Calendar token refresh failed for user {user_id}: {response.text}")
+            return None
+        data = response.json()
+        token.access_token = data["access_token"]
+        token.expiry = datetime.utcnow() + timedelta(seconds=data.get("expires_in", 3600))
+        token.updated_at = datetime.utcnow()
+        db.commit()
+    return token
+
+def apply_rsvps(events: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Copy attendee responses onto task assignments; returns assignments changed
+    
+    events maps Google event id -> event (with attendees). Completed
+    assignments are never changed.
+    """
+    if not events:
+        return 0
+    db = SessionLocal()
+    try:
+        tasks = {
+            row.google_calendar_event_id: row
+            for row in db.query(Task.id, Task.team_id, Task.google_calendar_event_id).filter(
+                Task.google_calendar_event_id.in_(list(events))
+            )
+        }
+        if not tasks:
+            return 0
+        responses = {
+            tasks[event_id].id: {email.lower(): status for email, status in attendee_statuses(event).items()}
+            for event_id, event in events.items()
+            if event_id in tasks
+        }
+        team_ids = {task.id: task.team_id for task in tasks.values()}
+        
+        changes: Dict[str, List[int]] = defaultdict(list)
+        deltas: Dict[Optional[int], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for assignment in db.query(
+            TaskAssignment.id, TaskAssignment.task_id, TaskAssignment.status, User.email
+        ).join(
+            User, User.id == TaskAssignment.assignee_id
+        ).filter(
+            TaskAssignment.task_id.in_(list(responses))
+        ):
+            rsvp = responses[assignment.task_id].get((assignment.email or "").lower())
+            new_status = RSVP_STATUSES.get(rsvp)
+            if not new_status or assignment.status in ("completed", new_status):
+                continue
+            changes[new_status].append(assignment.id)
+            for counter, delta in team_stats.status_deltas(assignment.status, new_status).items():
+                deltas[team_ids[assignment.task_id]][counter] += delta
+        
+        if not changes:
+            return 0
+        team_stats.record(db, deltas)
+        now = datetime.utcnow()
+        for new_status, assignment_ids in changes.items():
+            db.execute(
+                update(TaskAssignment).where(
+                    TaskAssignment.id.in_(assignment_ids)
+                ).values(status=new_status, responded_at=now).execution_options(synchronize_session=False)
+            )
+        db.commit()
+        team_stats.invalidate_team(*deltas)
+        return sum(len(assignment_ids) for assignment_ids in changes.values())
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def _load_user(user_id: int) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        token = calendar_credentials(db, user_id)
+        if not token:
+            return None
+        return {"access_token": token.access_token, "sync_token": token.calendar_sync_token}
+    finally:
+        db.close()
+
+def _save_sync_token(user_id: int, sync_token: Optional[str]) -> None:
+    db = SessionLocal()
+    try:
+        db.query(GmailToken).filter(GmailToken.user_id == user_id).update(
+            {"calendar_sync_token": sync_token, "calendar_synced_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+def _task_events(task_ids: List[int]) -> Dict[int, List[str]]:
+    """creator_id -> event ids for the tasks that have an invite"""
+    db = SessionLocal()
+    try:
+        by_creator = defaultdict(list)
+        for row in db.query(Task.creator_id, Task.google_calendar_event_id).filter(
+            Task.id.in_(task_ids),
+            Task.google_calendar_event_id.isnot(None)
+        ):
+            by_creator[row.creator_id].append(row.google_calendar_event_id)
+        return dict(by_creator)
+    finally:
+        db.close()
+
+def _calendar_users() -> List[int]:
+    """Users with a calendar-scoped token who created at least one task invite"""
+    db = SessionLocal()
+    try:
+        creators = db.query(Task.creator_id).filter(Task.google_calendar_event_id.isnot(None)).distinct()
+        return [
+            user_id for (user_id,) in db.query(GmailToken.user_id).filter(
+                GmailToken.is_active == True,
+                GmailToken.scopes.contains("calendar"),
+                GmailToken.user_id.in_(creators)
+            )
+        ]
+    finally:
+        db.close()
+
+class CalendarSync:
+    """
+    Incremental RSVP sync per user, with bounded concurrency
+    
+    The periodic loop is started from the app lifespan (off if
+    CALENDAR_SYNC_INTERVAL_MINUTES is 0).
+    """
+    
+    def __init__(self):
+        self._limiters: Dict[int, asyncio.Semaphore] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+    
+    def limiter(self, user_id: int) -> asyncio.Semaphore:
+        """Bounds one user's Calendar API requests in flight"""
+        if user_id not in self._limiters:
+            self._limiters[user_id] = asyncio.Semaphore(settings.CALENDAR_SYNC_USER_CONCURRENCY)
+        return self._limiters[user_id]
+    
+    def calendar(self, user_id: int, access_token: str) -> GoogleCalendarIntegration:
+        return GoogleCalendarIntegration(access_token, limiter=self.limiter(user_id))
+    
+    async def sync_user(self, user_id: int) -> Dict[str, Any]:
+        """Apply RSVPs from every task event changed on the user's calendar since the last sync"""
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        if lock.locked():
+            return {"user_id": user_id, "skipped": True}
+        async with lock:
+            state = await asyncio.to_thread(_load_user, user_id)
+            if not state:
+                return {"user_id": user_id, "connected": False}
+            
+            calendar = self.calendar(user_id, state["access_token"])
+            full = state["sync_token"] is None
+            result = await calendar.list_changes(CALENDAR_ID, state["sync_token"], fields=EVENT_FIELDS)
+            if result.get("expired"):
+                full = True
+                result = await calendar.list_changes(CALENDAR_ID, None, fields=EVENT_FIELDS)
+            if not result["success"]:
+                print(f"⚠️ Calendar sync failed for user {user_id}: {result.get('error')}")
+                return {"user_id": user_id, "error": result.get("error")}
+            
+            events = {
+                event["id"]: event for event in result["events"]
+                if event.get("status") != "cancelled" and event.get("attendees")
+            }
+            updated = await asyncio.to_thread(apply_rsvps, events)
+            await asyncio.to_thread(_save_sync_token, user_id, result.get("next_sync_token"))
+            return {"user_id": user_id, "full": full, "events": len(events), "updated": updated}
+    
+    async def sync_tasks(self, task_ids: List[int]) -> Dict[str, Any]:
+        """Re-read the given tasks' events now (batch requests per creator) and apply their RSVPs"""
+        by_creator = await asyncio.to_thread(_task_events, task_ids)
+        
+        async def fetch(creator_id: int, event_ids: List[str]) -> Dict[str, Any]:
+            state = await asyncio.to_thread(_load_user, creator_id)
+            if not state:
+                return {}
+            calendar = self.calendar(creator_id, state["access_token"])
+            return await calendar.batch_get_events(CALENDAR_ID, event_ids, fields=EVENT_FIELDS)
+        
+        events = {}
+        for found in await asyncio.gather(*(
+            fetch(creator_id, event_ids) for creator_id, event_ids in by_creator.items()
+        )):
+            events.update({event_id: event for event_id, event in found.items() if event})
+        updated = await asyncio.to_thread(apply_rsvps, events)
+        return {"tasks": sum(len(event_ids) for event_ids in by_creator.values()), "events": len(events), "updated": updated}
+    
+    def start(self) -> None:
+        if settings.CALENDAR_SYNC_INTERVAL_MINUTES <= 0:
+            return
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+        print(f"📅 Calendar sync started (every {settings.CALENDAR_SYNC_INTERVAL_MINUTES} min)")
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run()
+            except Exception as e:
+                print(f"❌ Calendar sync failed: {e}")
+            await asyncio.sleep(settings.CALENDAR_SYNC_INTERVAL_MINUTES * 60)
+    
+    async def run(self) -> Dict[str, Any]:
+        """Sync every connected task creator, CALENDAR_SYNC_CONCURRENCY at a time"""
+        user_ids = await asyncio.to_thread(_calendar_users)
+        semaphore = asyncio.Semaphore(settings.CALENDAR_SYNC_CONCURRENCY)
+        
+        async def bounded(user_id: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.sync_user(user_id)
+        
+        results = await asyncio.gather(*(bounded(user_id) for user_id in user_ids))
+        updated = sum(result.get("updated", 0) for result in results)
+        self.last_result = {"users": len(user_ids), "updated": updated, "finished_at": datetime.utcnow().isoformat()}
+        if updated:
+            print(f"📅 Calendar sync: {updated} task RSVPs updated across {len(user_ids)} users")
+        return self.last_result
+
+# Singleton instance
+calendar_sync = CalendarSync()
@@ -0,0 +1,136 @@
+"""
+CRM Lead Import
+Pulls leads from a user's connected CRMs into the leads table
+
+Handlers stream pages as row tuples in CRM_LEAD_COLUMNS order
+(iter_lead_pages / map_page_to_rows). Each page is mapped onto leads columns
+and written with one bulk upsert (matched on user_id + lower(email)), so a
+full sync never holds more than one page in memory. New leads go to team
+routing. After a clean pass, the connection's last_sync_at is set and the
+next sync only asks for leads updated since then.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.database import SessionLocal
+from app.crm import CRM_Handler, CRMError
+from app.crm import store as crm_store
+from app.crm.base import CRM_LEAD_COLUMNS
+from app.models.crm_connection import CRMConnection
+from app.models.leads import normalize_status
+from app.services.lead_routing import lead_router
+from app.services.webhook_ingest import upsert_leads
+
+(
+    CRM_ID, FIRST_NAME, LAST_NAME, EMAIL, PHONE, STATUS, TAGS,
+    PRICE_MIN, PRICE_MAX, LOCATION, LAST_ACTIVITY_AT, NOTES, CUSTOM_FIELDS
+) = range(len(CRM_LEAD_COLUMNS))
+
+def lead_from_row(row: Tuple, user_id: int, provider: str) -> Dict[str, Any]:
+    """Map a CRM lead row (CRM_LEAD_COLUMNS order) to leads table columns"""
+    email = row[EMAIL]
+    return {
+        "user_id": user_id,
+        "first_name": row[FIRST_NAME],
+        "last_name": row[LAST_NAME],
+        "email": email.strip().lower() if email else None,
+        "phone": row[PHONE],
+        "status": normalize_status(row[STATUS]),
+        "tags": list(row[TAGS] or []),
+        "price_min": row[PRICE_MIN],
+        "price_max": row[PRICE_MAX],
+        "location": row[LOCATION],
+        "notes": row[NOTES],
+        "source": provider,
+        "imported_from": "CRM",
+        "imported_by": user_id
+    }
+
+class CRMImporter:
+    """
+    Syncs leads from every connected CRM of a user into the leads table
+    """
+    
+    def __init__(self, page_size: int = 100):
+        self.page_size = page_size
+    
+    async def sync_user(self, user_id: int, full: bool = False) -> Dict[str, Any]:
+        """
+        Import leads from each of the user's connected CRMs
+        
+        Args:
+            user_id: Owner of the imported leads
+            full: Ignore last_sync_at and fetch every lead
+        
+        Returns:
+            {provider: {"success", "pages", "inserted", "updated", "error"?}}
+        """
+        connections = await asyncio.to_thread(self._load_connections, user_id)
+        results = {}
+        for connection_id, provider, handler, last_sync_at in connections:
+            results[provider] = await self._sync_connection(
+                user_id, connection_id, provider, handler, None if full else last_sync_at
+            )
+        return results
+    
+    async def _sync_connection(
+        self,
+        user_id: int,
+        connection_id: int,
+        provider: str,
+        handler: CRM_Handler,
+        updated_since: Optional[datetime]
+    ) -> Dict[str, Any]:
+        started = datetime.utcnow()
+        result = {"success": True, "pages": 0, "inserted": 0, "updated": 0}
+        try:
+            async for rows in handler.iter_lead_pages(page_size=self.page_size, updated_since=updated_since):
+                leads = [lead_from_row(row, user_id, provider) for row in rows]
+                inserted_ids, updated = await asyncio.to_thread(upsert_leads, leads)
+                result["pages"] += 1
+                result["inserted"] += len(inserted_ids)
+                result["updated"] += updated
+                
+                # New leads go to the owner's team routing (a no-op for teams without it)
+                if inserted_ids:
+                    await asyncio.to_thread(lead_router.route_leads, inserted_ids)
+        except CRMError as e:
+            # Pages already written stay; last_sync_at is not advanced, so the next sync retries them
+            print(f"❌ CRM import from {provider} failed after {result['pages']} pages: {e}")
+            result["success"] = False
+            result["error"] = str(e)
+            return result
+        
+        await asyncio.to_thread(self._mark_synced, connection_id, started)
+        print(f"✅ CRM import from {provider}: {result['inserted']} new, {result['updated']} updated")
+        return result
+    
+    @staticmethod
+    def _load_connections(user_id: int) -> List[Tuple[int, str, CRM_Handler, Optional[datetime]]]:
+        db = SessionLocal()
+        try:
+            return [
+                (connection.id, connection.crm_provider, crm_store.get_handler(connection), connection.last_sync_at)
+                for connection in crm_store.get_connections(db, user_id)
+                if connection.is_connected
+            ]
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _mark_synced(connection_id: int, synced_at: datetime) -> None:
+        db = SessionLocal()
+        try:
+            # Keep updated_at as is: it versions the cached handler in crm_store
+            db.query(CRMConnection).filter(CRMConnection.id == connection_id).update(
+                {"last_sync_at": synced_at, "updated_at": CRMConnection.updated_at},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+# Singleton instance
+crm_importer = CRMImporter()
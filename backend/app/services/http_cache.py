@@ -0,0 +1,268 @@
+"""
+HTTP Response Cache
+On-disk cache of crawled pages for conditional re-fetching
+
+Each URL is stored as two files named by the URL's SHA-256:
+    <key>.json  validators (ETag / Last-Modified), body hash, parsed listings
+    <key>.z     zlib-compressed response body
+
+Repeat crawls send If-None-Match / If-Modified-Since; a 304 (or a 200 whose
+body hash is unchanged) means the page can be skipped without parsing. A 200
+with the same body but new validators updates the stored ones, so the next
+crawl can get a 304.
+
+Everything here is blocking (file I/O, zlib, the directory scan on first
+use); async callers run get / get_body / store / update_* in
+asyncio.to_thread. The index is guarded by a threading lock for that.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+class CachedResponse:
+    """What the cache knows about one URL"""
+    
+    def __init__(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        body_sha256: Optional[str] = None,
+        body_bytes: int = 0,
+        parsed: Optional[List[Dict[str, Any]]] = None,
+        stored_at: Optional[float] = None
+    ):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body_sha256 = body_sha256
+        self.body_bytes = body_bytes
+        self.parsed = parsed
+        self.stored_at = stored_at or time.time()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "body_sha256": self.body_sha256,
+            "body_bytes": self.body_bytes,
+            "parsed": self.parsed,
+            "stored_at": self.stored_at
+        }
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send so the server can answer 304 Not Modified"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class HTTPResponseCache:
+    """
+    Size-bounded on-disk response cache keyed by URL
+    
+    When the total size on disk passes max_bytes the least recently used
+    entries are removed until it is back under 90% of the limit.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> [size_bytes, last_used]; built from disk on first use
+        self._index: Optional[Dict[str, List[float]]] = None
+        self._size_bytes = 0
+        
+        self.metrics = {
+            "hits": 0,  # 304 Not Modified
+            "unchanged": 0,  # 200 with the same body as last time
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0  # Body bytes a 304 avoided downloading
+        }
+    
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+    
+    def _paths(self, key: str):
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.z")
+    
+    def _load_index(self) -> Dict[str, List[float]]:
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            index: Dict[str, List[float]] = {}
+            for name in os.listdir(self.directory):
+                key, _, ext = name.partition(".")
+                if ext not in ("json", "z"):
+                    continue
+                stat = os.stat(os.path.join(self.directory, name))
+                entry = index.setdefault(key, [0, 0.0])
+                entry[0] += stat.st_size
+                entry[1] = max(entry[1], stat.st_mtime)
+            self._index = index
+            self._size_bytes = sum(int(size) for size, _ in index.values())
+        return self._index
+    
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Cached validators and parsed listings for a URL, or None"""
+        key = self.key_for(url)
+        meta_path, _ = self._paths(key)
+        with self._lock:
+            index = self._load_index()
+            if key not in index:
+                return None
+            try:
+                with open(meta_path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            index[key][1] = time.time()
+        return CachedResponse(**data)
+    
+    def record_response(self, entry: Optional[CachedResponse], response: httpx.Response) -> bool:
+        """
+        Count a fetch against the cache; returns True if the page is unchanged
+        
+        Unchanged means a 304, or a 200 whose body hashes the same as the
+        cached copy (for servers that send no validators).
+        """
+        if entry is not None and response.status_code == 304:
+            self.metrics["hits"] += 1
+            self.metrics["bytes_saved"] += entry.body_bytes
+            return True
+        
+        self.metrics["bytes_downloaded"] += len(response.content)
+        if entry is not None and entry.body_sha256 == hashlib.sha256(response.content).hexdigest():
+            self.metrics["unchanged"] += 1
+            return True
+        
+        self.metrics["misses"] += 1
+        return False
+    
+    def get_body(self, url: str) -> Optional[str]:
+        """Decompressed body of the cached response"""
+        _, body_path = self._paths(self.key_for(url))
+        try:
+            with open(body_path, "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error):
+            return None
+    
+    def store(
+        self,
+        url: str,
+        response: httpx.Response,
+        parsed: Optional[List[Dict[str, Any]]] = None
+    ) -> CachedResponse:
+        """Save a 200 response's validators, compressed body and parsed listings"""
+        body = response.content
+        entry = CachedResponse(
+            url=url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            body_sha256=hashlib.sha256(body).hexdigest(),
+            body_bytes=len(body),
+            parsed=parsed
+        )
+        self._write(entry, zlib.compress(body, 6))
+        return entry
+    
+    def update_validators(self, entry: CachedResponse, response: httpx.Response) -> bool:
+        """
+        Take the ETag / Last-Modified of a 200 whose body matched the cache
+        
+        Only the metadata file is rewritten, and only if they changed; returns
+        True if it was.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if (etag, last_modified) == (entry.etag, entry.last_modified):
+            return False
+        entry.etag = etag
+        entry.last_modified = last_modified
+        self._write(entry, None)
+        return True
+    
+    def update_parsed(self, entry: CachedResponse, parsed: List[Dict[str, Any]]) -> None:
+        """Attach parsed listings to an existing entry (body unchanged)"""
+        entry.parsed = parsed
+        self._write(entry, None)
+    
+    def _write(self, entry: CachedResponse, compressed_body: Optional[bytes]) -> None:
+        key = self.key_for(entry.url)
+        meta_path, body_path = self._paths(key)
+        with self._lock:
+            index = self._load_index()
+            meta = json.dumps(entry.to_dict(), default=str).encode()
+            
+            # Write-then-rename so a crash never leaves a half-written entry
+            tmp_path = f"{meta_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(meta)
+            os.replace(tmp_path, meta_path)
+            if compressed_body is not None:
+                tmp_path = f"{body_path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(compressed_body)
+                os.replace(tmp_path, body_path)
+            
+            body_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            size = len(meta) + body_size
+            self._size_bytes += size - int(index.get(key, [0, 0.0])[0])
+            index[key] = [size, time.time()]
+            self.metrics["stores"] += 1
+            
+            if self._size_bytes > self.max_bytes:
+                self._evict(keep=key)
+    
+    def _evict(self, keep: Optional[str] = None) -> None:
+        target = self.max_bytes * 0.9
+        for key in sorted(self._index, key=lambda k: self._index[k][1]):
+            if self._size_bytes <= target:
+                break
+            if key == keep:
+                continue
+            self._remove(key)
+            self.metrics["evictions"] += 1
+    
+    def _remove(self, key: str) -> None:
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        size, _ = self._index.pop(key, (0, 0.0))
+        self._size_bytes -= int(size)
+    
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            index = self._load_index()
+            lookups = self.metrics["hits"] + self.metrics["unchanged"] + self.metrics["misses"]
+            return {
+                **self.metrics,
+                "entries": len(index),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": round(
+                    (self.metrics["hits"] + self.metrics["unchanged"]) / lookups, 3
+                ) if lookups else 0.0
+            }
@@ -4,13 +4,18 @@ Automated lead generation from public sources
 """
 
 import httpx
-import re
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
 import asyncio
 
 from app.core.config import settings
+from app.services.http_cache import HTTPResponseCache
+from app.services.listing_index import listing_index
+from app.services.skip_trace import skip_tracer
+from app.services.icebreaker import icebreakers
+from app.services.listing_parser import ZILLOW_SOURCE, CRAIGSLIST_SOURCE, parse_listing_page_async
 
 class FSBOLead:
     """Represents a For Sale By Owner lead"""
@@ -30,7 +35,10 @@ class FSBOLead:
         owner_email: Optional[str] = None,
         listing_url: Optional[str] = None,
         source: str = "Unknown",
-        scraped_at: Optional[datetime] = None
+        scraped_at: Optional[datetime] = None,
+        listing_status: Optional[str] = None,
+        previous_price: Optional[int] = None,
+        icebreaker: Optional[str] = None
     ):
         self.address = address
         self.city = city
@@ -46,6 +54,11 @@ class FSBOLead:
         self.listing_url = listing_url
         self.source = source
         self.scraped_at = scraped_at or datetime.utcnow()
+        # Set by the seen-listings index: "new" or "price_changed"
+        self.listing_status = listing_status
+        self.previous_price = previous_price
+        # Set by the icebreaker stage
+        self.icebreaker = icebreaker
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -63,7 +76,10 @@ class FSBOLead:
             "owner_email": self.owner_email,
             "listing_url": self.listing_url,
             "source": self.source,
-            "scraped_at": self.scraped_at.isoformat()
+            "scraped_at": self.scraped_at.isoformat(),
+            "listing_status": self.listing_status,
+            "previous_price": self.previous_price,
+            "icebreaker": self.icebreaker
         }
     
     def to_crm_lead_data(self) -> Dict[str, Any]:
@@ -96,6 +112,119 @@ class FSBOLead:
             }
         }
 
+class HostRateLimiter:
+    """
+    Per-host politeness limits
+    
+    Each host gets its own concurrency cap and a minimum gap between request
+    starts, so a slow or strict site never holds up requests to other hosts.
+    """
+    
+    def __init__(
+        self,
+        min_interval: float = 2.0,
+        per_host_concurrency: int = 2,
+        host_intervals: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            min_interval: Default seconds between request starts to one host
+            per_host_concurrency: Default requests in flight per host
+            host_intervals: Optional per-host overrides of min_interval
+        """
+        self.min_interval = min_interval
+        self.per_host_concurrency = per_host_concurrency
+        self.host_intervals = host_intervals or {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+    
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._semaphores[host]
+    
+    async def _wait_turn(self, host: str) -> None:
+        # Reserve the next start time before sleeping so concurrent callers queue up
+        now = time.monotonic()
+        start = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = start + self.host_intervals.get(host, self.min_interval)
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    def penalize(self, host: str, seconds: float) -> None:
+        """Push the host's next slot back (e.g. after a 429 with Retry-After)"""
+        self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + seconds)
+    
+    def slot(self, host: str) -> "_HostSlot":
+        """Usage: async with limiter.slot(host): ..."""
+        return _HostSlot(self, host)
+
+class _HostSlot:
+    def __init__(self, limiter: HostRateLimiter, host: str):
+        self.limiter = limiter
+        self.semaphore = limiter._semaphore(host)
+        self.host = host
+    
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        try:
+            await self.limiter._wait_turn(self.host)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return self
+    
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+        return False
+
+class CrawlTarget:
+    """One page to fetch and how to parse it"""
+    
+    def __init__(self, source: str, url: str, zip_code: str = "", city: str = "", state: str = ""):
+        self.source = source
+        self.url = url
+        self.zip_code = zip_code
+        self.city = city
+        self.state = state
+    
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+class CrawlStats:
+    """Counters for one crawl run"""
+    
+    def __init__(self):
+        self.pages_requested = 0
+        self.pages_fetched = 0
+        self.pages_failed = 0
+        self.pages_unchanged = 0
+        self.rate_limited = 0
+        self.bytes_downloaded = 0
+        self.listings_found = 0
+        self.by_source: Dict[str, int] = {}
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pages_requested": self.pages_requested,
+            "pages_fetched": self.pages_fetched,
+            "pages_failed": self.pages_failed,
+            "pages_unchanged": self.pages_unchanged,
+            "rate_limited": self.rate_limited,
+            "bytes_downloaded": self.bytes_downloaded,
+            "listings_found": self.listings_found,
+            "by_source": dict(self.by_source),
+            "elapsed_seconds": round(self.elapsed_seconds, 2)
+        }
+
 class HunterScraper:
     """
     The Hunter - FSBO Lead Generation Engine
@@ -103,6 +232,9 @@ class HunterScraper:
     Scrapes FSBO listings from multiple sources and enriches with contact info
     """
     
+    ZILLOW_FSBO_URL = "https://www.zillow.com/homes/for_sale/fsbo/{zip_code}_rb/"
+    CRAIGSLIST_FSBO_URL = "https://{city_slug}.craigslist.org/search/reo"
+    
     def __init__(self):
         self.headers = {
             "User-Agent": settings.SCRAPER_USER_AGENT,
@@ -113,166 +245,267 @@ class HunterScraper:
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1"
         }
+        # Optional httpx transport override (benchmarks point this at a local stand-in)
+        self.transport: Optional[httpx.AsyncBaseTransport] = None
+        self.last_crawl_stats: Optional[CrawlStats] = None
+        # Conditional-request cache shared across crawls; None disables it
+        self.http_cache: Optional[HTTPResponseCache] = None
+        if settings.HUNTER_HTTP_CACHE_DIR:
+            self.http_cache = HTTPResponseCache(
+                settings.HUNTER_HTTP_CACHE_DIR,
+                max_bytes=settings.HUNTER_HTTP_CACHE_MAX_MB * 1024 * 1024
+            )
     
-    async def scrape_zillow_fsbo(self, zip_codes: List[str]) -> List[FSBOLead]:
+    def _client(self, max_connections: int) -> httpx.AsyncClient:
+        """One pooled client shared by every request in a crawl"""
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=30.0,
+            transport=self.transport,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+    
+    def build_targets(
+        self,
+        zip_codes: Optional[List[str]] = None,
+        craigslist_cities: Optional[List[Tuple[str, str]]] = None
+    ) -> List[CrawlTarget]:
         """
-        Scrape FSBO listings from Zillow
-        
-        Note: Zillow has anti-scraping measures. This is a simplified implementation.
-        Production should use rotating proxies and respect robots.txt.
+        Build the page list for a crawl
         
         Args:
-            zip_codes: List of ZIP codes to search
+            zip_codes: ZIP codes to search on Zillow FSBO
+            craigslist_cities: (city, state) pairs to search on Craigslist
+        """
+        targets = [
+            CrawlTarget(ZILLOW_SOURCE, self.ZILLOW_FSBO_URL.format(zip_code=zip_code), zip_code=zip_code)
+            for zip_code in zip_codes or []
+        ]
+        for city, state in craigslist_cities or []:
+            city_slug = city.lower().replace(' ', '')
+            targets.append(CrawlTarget(
+                CRAIGSLIST_SOURCE,
+                self.CRAIGSLIST_FSBO_URL.format(city_slug=city_slug),
+                city=city,
+                state=state
+            ))
+        return targets
+    
+    async def crawl(
+        self,
+        zip_codes: Optional[List[str]] = None,
+        craigslist_cities: Optional[List[Tuple[str, str]]] = None,
+        max_concurrency: Optional[int] = None,
+        limiter: Optional[HostRateLimiter] = None,
+        max_retries: int = 2,
+        include_unchanged: bool = True,
+        stats: Optional[CrawlStats] = None
+    ) -> AsyncIterator[FSBOLead]:
+        """
+        Crawl every source and ZIP concurrently, yielding leads as pages are parsed
         
-        Returns:
-            List of FSBOLead objects
+        A global semaphore caps requests in flight; HostRateLimiter spaces out
+        requests per host, so total time is set by the strictest host's rate
+        rather than the sum of all requests. Stats for the run are left in
+        self.last_crawl_stats.
+        
+        Args:
+            zip_codes: ZIP codes to search on Zillow FSBO
+            craigslist_cities: (city, state) pairs to search on Craigslist
+            max_concurrency: Global cap on requests in flight
+            limiter: Per-host limits (defaults from settings)
+            max_retries: Retries per page after a 429/5xx
+            include_unchanged: Yield the cached listings of pages that haven't
+                changed since the last crawl; False skips them entirely
+            stats: Collect stats here instead of a new CrawlStats (for
+                concurrent crawls that can't share last_crawl_stats)
         """
-        leads = []
+        targets = self.build_targets(zip_codes, craigslist_cities)
+        stats = stats or CrawlStats()
+        self.last_crawl_stats = stats
+        if not targets:
+            stats.finished_at = time.perf_counter()
+            return
+        
+        max_concurrency = max_concurrency or settings.HUNTER_MAX_CONCURRENCY
+        limiter = limiter or HostRateLimiter(
+            min_interval=settings.HUNTER_HOST_MIN_INTERVAL_SECONDS,
+            per_host_concurrency=settings.HUNTER_HOST_CONCURRENCY
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency * 50)
+        done = object()
         
-        for zip_code in zip_codes:
+        async with self._client(max_concurrency) as client:
+            
+            async def worker(target: CrawlTarget) -> None:
+                try:
+                    listings = await self._fetch_listings(
+                        client, target, semaphore, limiter, stats, max_retries, include_unchanged
+                    )
+                    for fields in listings:
+                        stats.listings_found += 1
+                        stats.by_source[target.source] = stats.by_source.get(target.source, 0) + 1
+                        await queue.put(FSBOLead(**fields))
+                except Exception as e:
+                    stats.pages_failed += 1
+                    print(f"Error crawling {target.url}: {e}")
+                finally:
+                    await queue.put(done)
+            
+            tasks = [asyncio.create_task(worker(target)) for target in targets]
+            remaining = len(tasks)
+            
             try:
-                # Zillow FSBO search URL pattern
-                # Note: Actual URL structure may vary
-                url = f"https://www.zillow.com/homes/for_sale/fsbo/{zip_code}_rb/"
-                
-                async with httpx.AsyncClient(headers=self.headers, timeout=30.0) as client:
-                    response = await client.get(url)
-                    
-                    if response.status_code != 200:
-                        print(f"Zillow scrape failed for {zip_code}: HTTP {response.status_code}")
+                while remaining:
+                    item = await queue.get()
+                    if item is done:
+                        remaining -= 1
                         continue
-                    
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Parse listing cards
-                    # Note: Zillow's HTML structure changes frequently
-                    # This is a placeholder - real implementation needs to adapt to current structure
-                    listings = soup.find_all('article', class_=re.compile('list-card'))
-                    
-                    for listing in listings:
-                        try:
-                            lead = self._parse_zillow_listing(listing, zip_code)
-                            if lead:
-                                leads.append(lead)
-                        except Exception as e:
-                            print(f"Error parsing Zillow listing: {e}")
-                            continue
-                
-                # Rate limiting - be respectful
-                await asyncio.sleep(2)
-                
-            except Exception as e:
-                print(f"Error scraping Zillow for {zip_code}: {e}")
-                continue
+                    yield item
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                stats.finished_at = time.perf_counter()
+    
+    async def crawl_new(
+        self,
+        zip_codes: Optional[List[str]] = None,
+        craigslist_cities: Optional[List[Tuple[str, str]]] = None,
+        user_id: int = 0,
+        index_batch_size: int = 100,
+        mark_seen: bool = True,
+        **crawl_kwargs
+    ) -> AsyncIterator[FSBOLead]:
+        """
+        crawl(), filtered through the seen-listings index
         
-        return leads
+        Yields only listings not seen before for this user, or whose price
+        changed (lead.listing_status says which). Everything else just has its
+        last-seen time bumped, so downstream cost tracks new listings only.
+        Smaller index_batch_size gets the first lead out sooner (streaming).
+        With mark_seen=False the caller records them (listing_index.mark_seen).
+        """
+        async for lead in listing_index.filter_new(
+            self.crawl(zip_codes, craigslist_cities, **crawl_kwargs),
+            user_id=user_id,
+            batch_size=index_batch_size,
+            mark_seen=mark_seen
+        ):
+            yield lead
     
-    def _parse_zillow_listing(self, listing_element, zip_code: str) -> Optional[FSBOLead]:
+    async def _fetch_listings(
+        self,
+        client: httpx.AsyncClient,
+        target: CrawlTarget,
+        semaphore: asyncio.Semaphore,
+        limiter: HostRateLimiter,
+        stats: CrawlStats,
+        max_retries: int,
+        include_unchanged: bool
+    ) -> List[Dict[str, Any]]:
         """
-        Parse a Zillow listing card into FSBOLead
+        Fetch and parse one page, going through the response cache
         
-        Note: This is a simplified parser. Real implementation needs to handle
-        Zillow's complex DOM structure and dynamic content.
+        Unchanged pages (304, or an identical body) are never re-parsed:
+        their listings come from the cache, or are skipped when
+        include_unchanged is False.
         """
-        try:
-            # Extract address
-            address_elem = listing_element.find('address')
-            if not address_elem:
-                return None
-            
-            address_text = address_elem.get_text(strip=True)
-            
-            # Parse address components
-            # Example: "123 Main St, Austin, TX 78701"
-            parts = address_text.split(',')
-            street = parts[0].strip() if len(parts) > 0 else ""
-            city = parts[1].strip() if len(parts) > 1 else ""
-            state_zip = parts[2].strip() if len(parts) > 2 else ""
-            
-            # Extract state and zip
-            state = ""
-            extracted_zip = zip_code
-            if state_zip:
-                state_zip_parts = state_zip.split()
-                state = state_zip_parts[0] if len(state_zip_parts) > 0 else ""
-                extracted_zip = state_zip_parts[1] if len(state_zip_parts) > 1 else zip_code
-            
-            # Extract price
-            price = None
-            price_elem = listing_element.find('span', class_=re.compile('price'))
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                price = self._extract_price(price_text)
-            
-            # Extract beds/baths
-            beds = None
-            baths = None
-            details_elem = listing_element.find('ul', class_=re.compile('list-card-details'))
-            if details_elem:
-                items = details_elem.find_all('li')
-                for item in items:
-                    text = item.get_text(strip=True).lower()
-                    if 'bd' in text:
-                        beds = self._extract_number(text)
-                    elif 'ba' in text:
-                        baths = self._extract_number(text)
-            
-            # Extract sqft
-            sqft = None
-            sqft_elem = listing_element.find('span', string=re.compile('sqft'))
-            if sqft_elem:
-                sqft_text = sqft_elem.get_text(strip=True)
-                sqft = self._extract_number(sqft_text)
-            
-            # Extract listing URL
-            link_elem = listing_element.find('a', href=True)
-            listing_url = None
-            if link_elem:
-                href = link_elem['href']
-                if href.startswith('/'):
-                    listing_url = f"https://www.zillow.com{href}"
-                else:
-                    listing_url = href
+        # Cache reads and writes hit the disk (and zlib), so they run in worker threads
+        cached = await asyncio.to_thread(self.http_cache.get, target.url) if self.http_cache else None
+        response = await self._fetch_page(
+            client, target, semaphore, limiter, stats, max_retries,
+            headers=cached.conditional_headers() if cached else None
+        )
+        if response is None:
+            return []
+        
+        if self.http_cache and self.http_cache.record_response(cached, response):
+            stats.pages_unchanged += 1
+            if response.status_code == 200:
+                await asyncio.to_thread(self.http_cache.update_validators, cached, response)
+            if not include_unchanged:
+                return []
+            if cached.parsed is None:
+                # Cached before its listings were saved; parse the stored body once
+                html = await asyncio.to_thread(self.http_cache.get_body, target.url)
+                if html is None:
+                    return []
+                parsed = await self._parse_page(target, html)
+                await asyncio.to_thread(self.http_cache.update_parsed, cached, parsed)
+            return cached.parsed
+        
+        listings = await self._parse_page(target, response.text)
+        if self.http_cache:
+            await asyncio.to_thread(self.http_cache.store, target.url, response, listings)
+        return listings
+    
+    async def _fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        target: CrawlTarget,
+        semaphore: asyncio.Semaphore,
+        limiter: HostRateLimiter,
+        stats: CrawlStats,
+        max_retries: int,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[httpx.Response]:
+        """
+        Fetch one page within the global and per-host limits; None if it failed
+        
+        The host slot (including its politeness wait) is taken first and the
+        global semaphore only around the request itself, so pages waiting on
+        a slow host don't hold global slots other hosts could use.
+        """
+        for attempt in range(max_retries + 1):
+            async with limiter.slot(target.host):
+                async with semaphore:
+                    stats.pages_requested += 1
+                    response = await client.get(target.url, headers=headers)
             
-            # Note: Zillow FSBO pages typically don't show owner contact info directly
-            # This would require:
-            # 1. Visiting individual listing pages
-            # 2. Using Skip Trace API to find contact info
-            # 3. County clerk records lookup
+            if response.status_code in (200, 304):
+                stats.pages_fetched += 1
+                stats.bytes_downloaded += len(response.content)
+                return response
             
-            return FSBOLead(
-                address=street,
-                city=city,
-                state=state,
-                zip_code=extracted_zip,
-                price=price,
-                bedrooms=beds,
-                bathrooms=baths,
-                sqft=sqft,
-                listing_url=listing_url,
-                source="Zillow FSBO"
-            )
+            if response.status_code == 429 or response.status_code >= 500:
+                if response.status_code == 429:
+                    stats.rate_limited += 1
+                if attempt < max_retries:
+                    try:
+                        delay = float(response.headers.get("Retry-After", ""))
+                    except ValueError:
+                        delay = limiter.min_interval * (2 ** attempt)
+                    limiter.penalize(target.host, min(delay, 60.0))
+                    continue
             
-        except Exception as e:
-            print(f"Error parsing Zillow listing: {e}")
-            return None
+            break
+        
+        stats.pages_failed += 1
+        print(f"{target.source} scrape failed for {target.zip_code or target.city}: HTTP {response.status_code}")
+        return None
     
-    def _extract_price(self, price_text: str) -> Optional[int]:
-        """Extract numeric price from text like '$450,000'"""
-        try:
-            # Remove non-numeric characters except digits
-            numeric = re.sub(r'[^\d]', '', price_text)
-            return int(numeric) if numeric else None
-        except:
-            return None
+    async def _parse_page(self, target: CrawlTarget, html: str) -> List[Dict[str, Any]]:
+        """Parse off the event loop when the page is big (see listing_parser)"""
+        return await parse_listing_page_async(
+            target.source, html, zip_code=target.zip_code, city=target.city, state=target.state
+        )
     
-    def _extract_number(self, text: str) -> Optional[float]:
-        """Extract first number from text"""
-        try:
-            match = re.search(r'[\d.]+', text)
-            return float(match.group()) if match else None
-        except:
-            return None
+    async def scrape_zillow_fsbo(self, zip_codes: List[str]) -> List[FSBOLead]:
+        """
+        Scrape FSBO listings from Zillow
+        
+        Note: Zillow has anti-scraping measures. This is a simplified implementation.
+        Production should use rotating proxies and respect robots.txt.
+        
+        Args:
+            zip_codes: List of ZIP codes to search
+        
+        Returns:
+            List of FSBOLead objects
+        """
+        return [lead async for lead in self.crawl(zip_codes=zip_codes)]
     
     async def scrape_craigslist_fsbo(self, city: str, state: str) -> List[FSBOLead]:
         """
@@ -285,89 +518,13 @@ class HunterScraper:
         Returns:
             List of FSBOLead objects
         """
-        leads = []
-        
-        try:
-            # Craigslist subdomain pattern: {city}.craigslist.org
-            # Real estate for sale by owner is in /reo/
-            city_slug = city.lower().replace(' ', '')
-            url = f"https://{city_slug}.craigslist.org/search/reo"
-            
-            async with httpx.AsyncClient(headers=self.headers, timeout=30.0) as client:
-                response = await client.get(url)
-                
-                if response.status_code != 200:
-                    print(f"Craigslist scrape failed: HTTP {response.status_code}")
-                    return leads
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Craigslist uses result-info class for listings
-                listings = soup.find_all('li', class_='result-row')
-                
-                for listing in listings:
-                    try:
-                        lead = self._parse_craigslist_listing(listing, city, state)
-                        if lead:
-                            leads.append(lead)
-                    except Exception as e:
-                        print(f"Error parsing Craigslist listing: {e}")
-                        continue
-            
-        except Exception as e:
-            print(f"Error scraping Craigslist: {e}")
-        
-        return leads
-    
-    def _parse_craigslist_listing(self, listing_element, city: str, state: str) -> Optional[FSBOLead]:
-        """Parse a Craigslist listing"""
-        try:
-            # Extract title and URL
-            title_elem = listing_element.find('a', class_='result-title')
-            if not title_elem:
-                return None
-            
-            title = title_elem.get_text(strip=True)
-            listing_url = title_elem['href']
-            
-            # Extract price
-            price = None
-            price_elem = listing_element.find('span', class_='result-price')
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                price = self._extract_price(price_text)
-            
-            # Extract neighborhood/location
-            hood_elem = listing_element.find('span', class_='result-hood')
-            neighborhood = hood_elem.get_text(strip=True).strip('()') if hood_elem else ""
-            
-            # Craigslist typically doesn't show full address in listings
-            # Would need to visit individual listing page
-            
-            return FSBOLead(
-                address=title,  # Title often contains address info
-                city=city,
-                state=state,
-                zip_code="",  # Not available in list view
-                price=price,
-                listing_url=listing_url,
-                source="Craigslist FSBO"
-            )
-            
-        except Exception as e:
-            print(f"Error parsing Craigslist listing: {e}")
-            return None
+        return [lead async for lead in self.crawl(craigslist_cities=[(city, state)])]
     
     async def enrich_with_skip_trace(self, lead: FSBOLead) -> FSBOLead:
         """
         Enrich lead with contact info using Skip Trace API
         
-        This is a placeholder for skip tracing integration.
-        In production, integrate with services like:
-        - BatchLeads
-        - REIReply
-        - PropStream
-        - TLOxp
+        Single-lead wrapper; prefer enrich_leads for anything more than one.
         
         Args:
             lead: FSBOLead with address info
@@ -375,53 +532,29 @@ class HunterScraper:
         Returns:
             FSBOLead with enriched contact info
         """
-        if not settings.SKIP_TRACE_API_KEY:
-            print("Skip trace API key not configured")
-            return lead
-        
-        try:
-            # Placeholder - actual implementation depends on chosen skip trace provider
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    settings.SKIP_TRACE_API_URL,
-                    headers={"Authorization": f"Bearer {settings.SKIP_TRACE_API_KEY}"},
-                    json={
-                        "address": lead.address,
-                        "city": lead.city,
-                        "state": lead.state,
-                        "zip": lead.zip_code
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    # Enrich lead with found data
-                    lead.owner_name = data.get("owner_name")
-                    lead.owner_phone = data.get("phone")
-                    lead.owner_email = data.get("email")
-                
-        except Exception as e:
-            print(f"Skip trace enrichment failed: {e}")
-        
+        await skip_tracer.enrich([lead])
         return lead
     
+    async def enrich_leads(self, leads: List[FSBOLead]) -> List[FSBOLead]:
+        """
+        Enrich many leads through the batched, cached skip-trace stage
+        
+        Providers (BatchLeads, REIReply, PropStream, TLOxp, ...) plug in as a
+        SkipTraceProvider; see app/services/skip_trace.py. Per-run throughput
+        and cache hit rate end up in skip_tracer.last_run_stats.
+        """
+        return await skip_tracer.enrich(leads)
+    
     async def generate_icebreaker_message(self, lead: FSBOLead) -> str:
         """
         Generate a personalized icebreaker message using AI
         
-        Uses the cheaper scraper model for cost efficiency
+        Uses the cheaper scraper model for cost efficiency. Single-lead
+        wrapper; prefer icebreakers.generate for a whole run, which packs many
+        leads into each model request (see app/services/icebreaker.py).
         """
-        # Simple template for now - can be enhanced with LLM
-        message = (
-            f"Hi! I noticed you're selling {lead.address} yourself. "
-            f"I work with buyers in {lead.city} and wanted to reach out. "
-            f"Would you be open to a buyer's agent bringing a qualified client to view the property?"
-        )
-        
-        # TODO: Use OpenAI/Anthropic to generate more personalized messages
-        # based on property details and market data
-        
-        return message
+        await icebreakers.generate([lead])
+        return lead.icebreaker
 
 # Singleton instance
 hunter_scraper = HunterScraper()
@@ -0,0 +1,341 @@
+"""
+Hunter Push Stage
+Moves a run's leads into the local leads table and the user's connected CRMs
+
+Local leads are created with one multi-row INSERT per chunk, and the new
+lead ids are written back to hunter_leads in the same transaction. CRM leads
+are created concurrently, with a per-provider concurrency cap and minimum
+gap between requests, and every CRM id is stored on its hunter_leads row as
+soon as its chunk finishes. A retried push only does what is still missing,
+so it never duplicates a lead locally or in a CRM.
+
+Before pushing, rows are claimed with one conditional UPDATE ... RETURNING
+(push_claimed_at), and only the returned rows are pushed, so two pushes of
+the same leads, in this process or another worker, never overlap. Claims are
+released when the push ends and expire after HUNTER_PUSH_CLAIM_TTL_MINUTES
+if it crashed.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import insert, update, or_
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core import tenancy
+from app.crm import CRM_Handler
+from app.crm import store as crm_store
+from app.models.hunter import HunterLead
+from app.models.leads import Lead
+from app.models.user import User
+from app.services.hunter import FSBOLead, HostRateLimiter
+from app.services.lead_routing import lead_router
+
+FSBO_FIELDS = (
+    "address", "city", "state", "zip_code", "price", "bedrooms", "bathrooms", "sqft",
+    "owner_name", "owner_phone", "owner_email", "listing_url", "source", "scraped_at",
+    "listing_status", "previous_price", "icebreaker"
+)
+
+class PushStats:
+    """Counters for one push"""
+    
+    def __init__(self):
+        self.leads = 0
+        self.local_created = 0
+        self.local_existing = 0  # Already pushed by an earlier attempt
+        self.crm_created: Dict[str, int] = {}
+        self.crm_existing: Dict[str, int] = {}
+        self.crm_failed: Dict[str, int] = {}
+        self.crm_unsupported: List[str] = []
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+    
+    @staticmethod
+    def _bump(counter: Dict[str, int], provider: str, n: int = 1) -> None:
+        counter[provider] = counter.get(provider, 0) + n
+    
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            "leads": self.leads,
+            "local_created": self.local_created,
+            "local_existing": self.local_existing,
+            "crm_created": self.crm_created,
+            "crm_existing": self.crm_existing,
+            "crm_failed": self.crm_failed,
+            "crm_unsupported": self.crm_unsupported,
+            "elapsed": round(elapsed, 3)
+        }
+
+def fsbo_from_row(row: HunterLead) -> FSBOLead:
+    return FSBOLead(**{field: getattr(row, field) for field in FSBO_FIELDS})
+
+def lead_mapping(fsbo: FSBOLead, user_id: int, now: datetime) -> Dict[str, Any]:
+    """leads row for an FSBO lead (built from to_crm_lead_data, like the CRM payload)"""
+    data = fsbo.to_crm_lead_data()
+    locality = " ".join(part for part in (fsbo.state, fsbo.zip_code) if part)
+    address = ", ".join(part for part in (fsbo.address, fsbo.city, locality) if part)
+    
+    details = [f"{fsbo.source} listing"]
+    if fsbo.price:
+        details.append(f"asking ${fsbo.price:,}")
+    if fsbo.previous_price:
+        details.append(f"was ${fsbo.previous_price:,}")
+    if fsbo.bedrooms is not None or fsbo.bathrooms is not None:
+        details.append(f"{fsbo.bedrooms or '?'} bd / {fsbo.bathrooms or '?'} ba")
+    if fsbo.sqft:
+        details.append(f"{fsbo.sqft:,} sqft")
+    notes = ", ".join(details)
+    if fsbo.listing_url:
+        notes += f"\n{fsbo.listing_url}"
+    if fsbo.icebreaker:
+        notes += f"\nIcebreaker: {fsbo.icebreaker}"
+    
+    return {
+        "user_id": user_id,
+        "first_name": data["first_name"],
+        "last_name": data["last_name"],
+        "email": data["email"],
+        "phone": data["phone"],
+        "address": address,
+        "location": fsbo.city,
+        "price_min": fsbo.price,
+        "price_max": fsbo.price,
+        "tags": [tag for tag in data["tags"] if tag],
+        "status": data["status"],
+        "source": fsbo.source,
+        "deal_type": "Seller",
+        "notes": notes,
+        "imported_from": "Hunter",
+        "imported_by": user_id,
+        "created_at": now,
+        "updated_at": now
+    }
+
+class HunterPusher:
+    """
+    Push hunter_leads rows to leads and the user's CRMs
+    
+    Usage:
+        stats = await hunter_pusher.push_run(run_id)
+    """
+    
+    def __init__(
+        self,
+        chunk_size: int = 100,
+        crm_concurrency: Optional[int] = None,
+        crm_min_interval: Optional[float] = None
+    ):
+        self.chunk_size = chunk_size
+        self.crm_concurrency = crm_concurrency or settings.HUNTER_PUSH_CRM_CONCURRENCY
+        self.crm_min_interval = (
+            settings.HUNTER_PUSH_CRM_MIN_INTERVAL_SECONDS if crm_min_interval is None else crm_min_interval
+        )
+    
+    async def push_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Push every lead of a run; None if that run is already being pushed"""
+        rows = await asyncio.to_thread(self._claim, HunterLead.run_id == run_id)
+        if rows is None:
+            print(f"⚠️  Hunter push of run {run_id} is already running, skipping")
+            return None
+        if not rows:
+            return PushStats().to_dict()
+        return await self._push(rows[0].user_id, rows)
+    
+    async def push_leads(self, user: User, hunter_lead_ids: List[int]) -> Optional[Dict[str, Any]]:
+        """Push selected hunter_leads rows (only the user's own are touched); None if all are being pushed"""
+        rows = await asyncio.to_thread(
+            self._claim, tenancy.tenant_filter(HunterLead, user), HunterLead.id.in_(hunter_lead_ids)
+        )
+        if rows is None:
+            print(f"⚠️  Hunter push of {len(hunter_lead_ids)} leads is already running, skipping")
+            return None
+        return await self._push(user.id, rows)
+    
+    async def _push(self, user_id: int, rows: List[HunterLead]) -> Dict[str, Any]:
+        stats = PushStats()
+        stats.leads = len(rows)
+        try:
+            await self._push_local(user_id, rows, stats)
+            await self._push_crm(user_id, rows, stats)
+        finally:
+            await asyncio.to_thread(self._release, [row.id for row in rows])
+            stats.finished_at = time.perf_counter()
+        
+        print(f"📤 Hunter push: {stats.local_created} local leads created, "
+              f"{sum(stats.crm_created.values())} CRM leads created, {sum(stats.crm_failed.values())} failed")
+        return stats.to_dict()
+    
+    # Local leads
+    
+    async def _push_local(self, user_id: int, rows: List[HunterLead], stats: PushStats) -> None:
+        pending = [row for row in rows if row.lead_id is None]
+        stats.local_existing = len(rows) - len(pending)
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start:start + self.chunk_size]
+            lead_ids = await asyncio.to_thread(self._insert_local, user_id, chunk)
+            for row, lead_id in zip(chunk, lead_ids):
+                row.lead_id = lead_id
+            stats.local_created += len(chunk)
+            await asyncio.to_thread(lead_router.route_leads, lead_ids)
+    
+    @staticmethod
+    def _insert_local(user_id: int, rows: List[HunterLead]) -> List[int]:
+        """One multi-row INSERT ... RETURNING id, linked back in the same transaction"""
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            lead_ids = db.scalars(
+                insert(Lead).returning(Lead.id, sort_by_parameter_order=True),
+                [lead_mapping(fsbo_from_row(row), user_id, now) for row in rows]
+            ).all()
+            db.bulk_update_mappings(HunterLead, [
+                {"id": row.id, "lead_id": lead_id, "pushed_at": now}
+                for row, lead_id in zip(rows, lead_ids)
+            ])
+            db.commit()
+            return list(lead_ids)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    # CRMs
+    
+    async def _push_crm(self, user_id: int, rows: List[HunterLead], stats: PushStats) -> None:
+        handlers = await asyncio.to_thread(self._load_handlers, user_id)
+        if not handlers:
+            return
+        
+        limiter = HostRateLimiter(
+            min_interval=self.crm_min_interval,
+            per_host_concurrency=self.crm_concurrency
+        )
+        unsupported: set = set()
+        
+        async def create(provider: str, handler: CRM_Handler, row: HunterLead) -> Optional[str]:
+            if provider in unsupported:
+                return None
+            async with limiter.slot(provider):
+                try:
+                    return await handler.create_lead(fsbo_from_row(row).to_crm_lead_data())
+                except NotImplementedError:
+                    unsupported.add(provider)
+                    return None
+                except Exception as e:
+                    print(f"Error creating {provider} lead for {row.address}: {e}")
+                    return None
+        
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start:start + self.chunk_size]
+            calls = []
+            for row in chunk:
+                existing = row.crm_ids or {}
+                for provider, handler in handlers.items():
+                    if existing.get(provider):
+                        PushStats._bump(stats.crm_existing, provider)
+                    else:
+                        calls.append((row, provider, handler))
+            if not calls:
+                continue
+            
+            results = await asyncio.gather(*[create(provider, handler, row) for row, provider, handler in calls])
+            
+            updated: Dict[int, HunterLead] = {}
+            for (row, provider, _), crm_id in zip(calls, results):
+                if crm_id:
+                    row.crm_ids = {**(row.crm_ids or {}), provider: str(crm_id)}
+                    updated[row.id] = row
+                    PushStats._bump(stats.crm_created, provider)
+                elif provider not in unsupported:
+                    PushStats._bump(stats.crm_failed, provider)
+            if updated:
+                # Saved per chunk so a crash or retry loses at most one chunk of ids
+                await asyncio.to_thread(self._save_crm_ids, list(updated.values()))
+        
+        stats.crm_unsupported = sorted(unsupported)
+    
+    @staticmethod
+    def _load_handlers(user_id: int) -> Dict[str, CRM_Handler]:
+        db = SessionLocal()
+        try:
+            return {
+                connection.crm_provider: crm_store.get_handler(connection)
+                for connection in crm_store.get_connections(db, user_id)
+                if connection.is_connected
+            }
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _save_crm_ids(rows: List[HunterLead]) -> None:
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            db.bulk_update_mappings(HunterLead, [
+                {"id": row.id, "crm_ids": row.crm_ids, "pushed_at": now} for row in rows
+            ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    # Claims
+    
+    @staticmethod
+    def _claim(*criteria) -> Optional[List[HunterLead]]:
+        """
+        Claim the matching rows no other push holds, and load them
+        
+        One UPDATE ... WHERE push_claimed_at IS NULL (or expired) RETURNING id,
+        so concurrent pushes each get a disjoint set. None if rows match but
+        all of them are claimed.
+        """
+        now = datetime.utcnow()
+        expired = now - timedelta(minutes=settings.HUNTER_PUSH_CLAIM_TTL_MINUTES)
+        db = SessionLocal()
+        try:
+            claimed = db.scalars(
+                update(HunterLead).where(
+                    *criteria,
+                    or_(HunterLead.push_claimed_at.is_(None), HunterLead.push_claimed_at < expired)
+                ).values(push_claimed_at=now).returning(HunterLead.id).execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+            if not claimed:
+                return None if db.query(HunterLead.id).filter(*criteria).first() else []
+            
+            rows = db.query(HunterLead).filter(HunterLead.id.in_(claimed)).order_by(HunterLead.id).all()
+            db.expunge_all()
+            return rows
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _release(hunter_lead_ids: List[int]) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(HunterLead).where(HunterLead.id.in_(hunter_lead_ids)).values(
+                    push_claimed_at=None
+                ).execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Could not release Hunter push claim (expires on its own): {e}")
+        finally:
+            db.close()
+
+# Singleton instance
+hunter_pusher = HunterPusher()
@@ -0,0 +1,294 @@
+"""
+Hunter Scheduler
+Runs The Hunter daily for every configured market and records each run
+
+Markets come from settings.HUNTER_MARKETS. Starting at HUNTER_CRON_TIME,
+market start times are spread evenly across HUNTER_STAGGER_WINDOW_MINUTES
+so every crawl doesn't hit the same sites at 8:00 exactly. Each run is
+stored in hunter_runs and its new / price-changed leads in hunter_leads;
+with HUNTER_AUTO_PUSH they then go on to leads and the user's CRMs.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.hunter import HunterRun, HunterLead
+from app.services.hunter import hunter_scraper, FSBOLead, CrawlStats
+from app.services.skip_trace import skip_tracer, SkipTraceRunStats
+from app.services.icebreaker import icebreakers, IcebreakerRunStats
+from app.services.hunter_push import hunter_pusher
+from app.services.listing_index import listing_index
+
+class HunterMarket:
+    """One market: the ZIPs / Craigslist cities crawled for one user"""
+    
+    def __init__(
+        self,
+        name: str,
+        zip_codes: Optional[List[str]] = None,
+        craigslist_cities: Optional[List[Tuple[str, str]]] = None,
+        user_id: int = 0
+    ):
+        self.name = name
+        self.zip_codes = [str(z) for z in zip_codes or []]
+        self.craigslist_cities = [tuple(c) for c in craigslist_cities or []]
+        self.user_id = user_id
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HunterMarket":
+        return cls(
+            name=data["name"],
+            zip_codes=data.get("zip_codes"),
+            craigslist_cities=data.get("craigslist_cities"),
+            user_id=int(data.get("user_id") or 0)
+        )
+
+def parse_cron_time(value: str) -> Tuple[int, int]:
+    """'8:00' -> (8, 0)"""
+    hour, _, minute = value.partition(":")
+    return int(hour), int(minute or 0)
+
+def next_run_at(now: datetime, cron_time: str) -> datetime:
+    """Next occurrence of HH:MM (server local time) strictly after now"""
+    hour, minute = parse_cron_time(cron_time)
+    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    return candidate
+
+def stagger_offsets(count: int, window_minutes: int) -> List[float]:
+    """Evenly spaced start offsets in seconds, first market at 0"""
+    if count <= 1:
+        return [0.0] * count
+    step = window_minutes * 60 / count
+    return [i * step for i in range(count)]
+
+class HunterScheduler:
+    """
+    In-process daily scheduler (started from the app lifespan)
+    
+    A market is never run twice at once; a manual run while the scheduled
+    one is in progress is rejected.
+    """
+    
+    def __init__(self, insert_batch_size: int = 200):
+        self.insert_batch_size = insert_batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._running_markets: set = set()
+    
+    @property
+    def markets(self) -> List[HunterMarket]:
+        return [HunterMarket.from_dict(market) for market in settings.HUNTER_MARKETS]
+    
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+        print(f"🕗 Hunter scheduler started ({len(self.markets)} markets, daily at {settings.HUNTER_CRON_TIME})")
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _loop(self) -> None:
+        while True:
+            start_at = next_run_at(datetime.now(), settings.HUNTER_CRON_TIME)
+            await asyncio.sleep(max(0.0, (start_at - datetime.now()).total_seconds()))
+            await self.run_all()
+    
+    async def run_all(self, trigger: str = "schedule") -> List[Dict[str, Any]]:
+        """Run every market, staggered across the window; returns the run records"""
+        markets = self.markets
+        offsets = stagger_offsets(len(markets), settings.HUNTER_STAGGER_WINDOW_MINUTES)
+        
+        async def delayed(market: HunterMarket, offset: float):
+            await asyncio.sleep(offset)
+            return await self.run_market(market, trigger=trigger)
+        
+        results = await asyncio.gather(
+            *[delayed(market, offset) for market, offset in zip(markets, offsets)],
+            return_exceptions=True
+        )
+        return [result for result in results if isinstance(result, dict)]
+    
+    async def run_market(self, market: HunterMarket, trigger: str = "manual") -> Optional[Dict[str, Any]]:
+        """
+        Crawl one market: new / price-changed listings -> skip trace -> icebreakers -> hunter_leads
+        
+        Returns the finished HunterRun as a dict, or None if the market is
+        already running or its run couldn't be recorded.
+        """
+        if market.name in self._running_markets:
+            print(f"⚠️  Hunter market '{market.name}' is already running, skipping")
+            return None
+        self._running_markets.add(market.name)
+        
+        run_id = None
+        started = time.perf_counter()
+        new_leads = 0
+        error_message = None
+        # Per-run stats objects: markets overlap, so the singletons' last_* can't be used
+        crawl_stats = CrawlStats()
+        trace_stats = SkipTraceRunStats()
+        icebreaker_stats = IcebreakerRunStats()
+        
+        try:
+            run_id = await asyncio.to_thread(self._start_run, market, trigger)
+            leads = hunter_scraper.crawl_new(
+                zip_codes=market.zip_codes,
+                craigslist_cities=market.craigslist_cities,
+                user_id=market.user_id,
+                mark_seen=False,  # _insert_leads marks them seen with the hunter_leads insert
+                stats=crawl_stats
+            )
+            if skip_tracer.provider is not None:
+                leads = skip_tracer.enrich_stream(leads, stats=trace_stats)
+            leads = icebreakers.generate_stream(leads, stats=icebreaker_stats)
+            
+            batch: List[FSBOLead] = []
+            async for lead in leads:
+                batch.append(lead)
+                if len(batch) >= self.insert_batch_size:
+                    new_leads += await asyncio.to_thread(self._insert_leads, batch, run_id, market)
+                    batch = []
+            if batch:
+                new_leads += await asyncio.to_thread(self._insert_leads, batch, run_id, market)
+        except Exception as e:
+            error_message = str(e)
+            print(f"❌ Hunter run for '{market.name}' failed: {e}")
+        finally:
+            self._running_markets.discard(market.name)
+        
+        if run_id is None:
+            # The run row couldn't be created (database down or locked); nothing to finish
+            return None
+        
+        crawl_stats.finished_at = crawl_stats.finished_at or time.perf_counter()
+        stats = {"crawl": crawl_stats.to_dict()}
+        if trace_stats.leads:
+            trace_stats.finished_at = time.perf_counter()
+            stats["skip_trace"] = trace_stats.to_dict()
+        if icebreaker_stats.leads:
+            icebreaker_stats.finished_at = time.perf_counter()
+            stats["icebreakers"] = icebreaker_stats.to_dict()
+        
+        run = await asyncio.to_thread(
+            self._finish_run, run_id, time.perf_counter() - started, new_leads, stats, error_message
+        )
+        print(f"🔍 Hunter '{market.name}': {run['leads_found']} listings, {run['new_leads']} new "
+              f"in {run['duration_seconds']}s")
+        
+        if settings.HUNTER_AUTO_PUSH and run["new_leads"] and market.user_id:
+            try:
+                run["push"] = await hunter_pusher.push_run(run_id)
+            except Exception as e:
+                print(f"❌ Hunter push for '{market.name}' failed: {e}")
+        return run
+    
+    # Persistence (sync, run in worker threads)
+    
+    @staticmethod
+    def _start_run(market: HunterMarket, trigger: str) -> int:
+        db = SessionLocal()
+        try:
+            run = HunterRun(market=market.name, user_id=market.user_id, trigger=trigger, status="running")
+            db.add(run)
+            db.commit()
+            return run.id
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _insert_leads(leads: List[FSBOLead], run_id: int, market: HunterMarket) -> int:
+        """
+        One multi-row INSERT per batch, committed together with marking the listings seen
+        
+        If the run fails before this, its listings stay unseen and the next
+        run picks them up again. Returns the number of leads stored (ones
+        another run recorded in the meantime are dropped).
+        """
+        db = SessionLocal()
+        try:
+            try:
+                fresh = listing_index.mark_seen(db, leads, market.user_id)
+                db.flush()
+            except IntegrityError:
+                # Another run inserted one of these addresses first; retry against its rows
+                db.rollback()
+                fresh = listing_index.mark_seen(db, leads, market.user_id)
+            if not fresh:
+                db.commit()
+                return 0
+            db.bulk_insert_mappings(HunterLead, [
+                {
+                    "run_id": run_id,
+                    "user_id": market.user_id,
+                    "market": market.name,
+                    "address": lead.address,
+                    "city": lead.city,
+                    "state": lead.state,
+                    "zip_code": lead.zip_code,
+                    "price": lead.price,
+                    "previous_price": lead.previous_price,
+                    "bedrooms": int(lead.bedrooms) if lead.bedrooms is not None else None,
+                    "bathrooms": lead.bathrooms,
+                    "sqft": int(lead.sqft) if lead.sqft is not None else None,
+                    "listing_url": lead.listing_url,
+                    "source": lead.source,
+                    "listing_status": lead.listing_status,
+                    "owner_name": lead.owner_name,
+                    "owner_phone": lead.owner_phone,
+                    "owner_email": lead.owner_email,
+                    "icebreaker": lead.icebreaker,
+                    "scraped_at": lead.scraped_at
+                }
+                for lead in fresh
+            ])
+            db.commit()
+            return len(fresh)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _finish_run(
+        run_id: int,
+        duration: float,
+        new_leads: int,
+        stats: Dict[str, Any],
+        error_message: Optional[str]
+    ) -> Dict[str, Any]:
+        crawl = stats.get("crawl", {})
+        db = SessionLocal()
+        try:
+            run = db.query(HunterRun).filter(HunterRun.id == run_id).first()
+            run.status = "failed" if error_message else "completed"
+            run.finished_at = datetime.utcnow()
+            run.duration_seconds = round(duration, 2)
+            run.pages_fetched = crawl.get("pages_fetched", 0)
+            run.cache_hits = crawl.get("pages_unchanged", 0)
+            run.leads_found = crawl.get("listings_found", 0)
+            run.new_leads = new_leads
+            run.errors = crawl.get("pages_failed", 0) + (1 if error_message else 0)
+            run.error_message = error_message
+            run.stats = stats
+            db.commit()
+            return run.to_dict()
+        finally:
+            db.close()
+
+# Singleton instance
+hunter_scheduler = HunterScheduler()
@@ -0,0 +1,464 @@
+"""
+Icebreaker Generation
+Batched, cached first-touch messages for Hunter leads
+
+Many leads are packed into each SCRAPER_MODEL request, which answers with
+structured JSON (one message per lead reference). Requests run concurrently
+under a limit and a shared tokens-per-minute budget. Messages are cached by
+(template version, normalized address, price), so a listing is only written
+for again when its price or the prompt changes. Without a model every lead
+gets the plain template.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Tuple
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.hunter import IcebreakerResult
+from app.services.address_normalizer import normalize_address
+
+# Bump when the prompt or template changes so cached messages are regenerated
+TEMPLATE_VERSION = "v1"
+
+SYSTEM_PROMPT = (
+    "You write short first-touch text messages from a real estate agent to homeowners "
+    "selling their home themselves (FSBO). For each lead in the input, write one friendly, "
+    "specific message of at most 300 characters: mention the property (street, a detail such "
+    "as beds or a recent price drop), offer to bring a qualified buyer, and end with a simple "
+    "question. Use the owner's first name when given. No emojis, no pressure, no links. "
+    'Reply with JSON only: {"icebreakers": [{"reference": "<reference>", "message": "<text>"}]} '
+    "with exactly one entry per input reference."
+)
+
+PROMPT_TOKENS = len(SYSTEM_PROMPT) // 4 + 20
+MESSAGE_TOKENS = 90  # Expected output per lead, including JSON overhead
+
+def template_icebreaker(lead: Any) -> str:
+    """The plain template, used when no model is configured or a request fails"""
+    return (
+        f"Hi! I noticed you're selling {lead.address} yourself. "
+        f"I work with buyers in {lead.city} and wanted to reach out. "
+        f"Would you be open to a buyer's agent bringing a qualified client to view the property?"
+    )
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+class TokenBudget:
+    """
+    Tokens-per-minute budget shared by concurrent requests
+    
+    acquire() reserves a request's estimated tokens, waiting for the budget
+    to refill if needed; settle() corrects the reservation with the actual
+    usage the API reported.
+    """
+    
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = tokens_per_minute
+        self.tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+    
+    async def acquire(self, tokens: int) -> None:
+        if not self.capacity:
+            return
+        tokens = min(tokens, self.capacity)  # A single oversized request still gets through
+        while True:
+            # Only the check-and-reserve holds the lock; waiters sleep outside it
+            # and re-check, so a small request can go as soon as it fits
+            async with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) * 60 / self.capacity
+            await asyncio.sleep(wait)
+    
+    def settle(self, estimated: int, actual: int) -> None:
+        if self.capacity:
+            self.tokens -= actual - min(estimated, self.capacity)
+
+class IcebreakerModel(ABC):
+    """
+    Batch message generator
+    
+    generate_batch receives a list of {"reference", "address", "city", ...}
+    and returns ({reference: message}, tokens used).
+    """
+    
+    name = "base"
+    
+    @abstractmethod
+    async def generate_batch(
+        self,
+        client: httpx.AsyncClient,
+        items: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, str], int]:
+        pass
+
+class OpenAIIcebreakerModel(IcebreakerModel):
+    """SCRAPER_MODEL through the chat completions API, in JSON mode"""
+    
+    name = "openai"
+    
+    def __init__(self, api_key: str, model: str, api_url: str = "https://api.openai.com/v1"):
+        self.api_key = api_key
+        self.model = model
+        self.api_url = api_url.rstrip("/")
+    
+    async def generate_batch(self, client, items):
+        response = await client.post(
+            f"{self.api_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": self.model,
+                "temperature": 0.7,
+                "max_tokens": len(items) * MESSAGE_TOKENS + 50,
+                "response_format": {"type": "json_object"},
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": json.dumps({"leads": items})}
+                ]
+            },
+            timeout=120.0
+        )
+        response.raise_for_status()
+        data = response.json()
+        
+        content = json.loads(data["choices"][0]["message"]["content"])
+        references = {item["reference"] for item in items}
+        messages = {}
+        for entry in content.get("icebreakers", []):
+            reference = entry.get("reference")
+            message = (entry.get("message") or "").strip()
+            if reference in references and message:
+                messages[reference] = message
+        return messages, int(data.get("usage", {}).get("total_tokens", 0))
+
+class StubIcebreakerModel(IcebreakerModel):
+    """
+    Local stand-in for tests and benchmarks (no network, no spend)
+    
+    Writes a deterministic message per lead after latency_ms per request.
+    Counts requests and items so tests can assert on batching.
+    """
+    
+    name = "stub"
+    
+    OPENERS = ["Hi{name}!", "Hello{name},", "Good morning{name}!"]
+    
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self.items = 0
+    
+    async def generate_batch(self, client, items):
+        self.requests += 1
+        self.items += len(items)
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        
+        messages = {}
+        for item in items:
+            rng = random.Random(item["reference"])
+            name = f" {item['owner_first_name']}" if item.get("owner_first_name") else ""
+            detail = f" at ${item['price']:,}" if item.get("price") else ""
+            if item.get("previous_price"):
+                detail += " after the price update"
+            messages[item["reference"]] = (
+                f"{rng.choice(self.OPENERS).format(name=name)} I saw {item['address']} listed{detail}. "
+                f"I have buyers looking in {item.get('city') or 'the area'} - would you be open to a showing?"
+            )
+        tokens = PROMPT_TOKENS + estimate_tokens(json.dumps(items)) + len(items) * MESSAGE_TOKENS
+        return messages, tokens
+
+def build_model() -> Optional[IcebreakerModel]:
+    """Model from settings; None when OpenAI has no real API key"""
+    if settings.ICEBREAKER_PROVIDER == "stub":
+        return StubIcebreakerModel()
+    if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY == "sk-placeholder":
+        return None
+    return OpenAIIcebreakerModel(settings.OPENAI_API_KEY, settings.SCRAPER_MODEL, settings.ICEBREAKER_API_URL)
+
+class IcebreakerRunStats:
+    """Counters for one generation run"""
+    
+    def __init__(self):
+        self.leads = 0
+        self.unique = 0
+        self.cache_hits = 0
+        self.generated = 0
+        self.fallbacks = 0  # Template used (no model, failed request, or missing from the reply)
+        self.requests = 0
+        self.failed_requests = 0
+        self.tokens_used = 0
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            "leads": self.leads,
+            "unique": self.unique,
+            "cache_hits": self.cache_hits,
+            "generated": self.generated,
+            "fallbacks": self.fallbacks,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "tokens_used": self.tokens_used,
+            "leads_per_request": round(self.generated / self.requests, 1) if self.requests else 0.0,
+            "elapsed_seconds": round(elapsed, 3)
+        }
+
+def cache_key(lead: Any) -> Tuple[str, str]:
+    """(key, normalized address) for a lead under the current template version"""
+    normalized = normalize_address(lead.address, lead.city, lead.state, lead.zip_code)
+    key = hashlib.sha1(f"{TEMPLATE_VERSION}|{normalized}|{lead.price or ''}".encode()).hexdigest()
+    return key, normalized
+
+class IcebreakerGenerator:
+    """
+    Icebreaker stage for FSBOLeads (sets lead.icebreaker)
+    
+    Usage:
+        await icebreakers.generate(leads)
+        icebreakers.last_run_stats.to_dict()
+    """
+    
+    def __init__(
+        self,
+        model: Optional[IcebreakerModel] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 2,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self._model = model
+        self.batch_size = batch_size or settings.ICEBREAKER_BATCH_SIZE
+        self.max_concurrency = max_concurrency or settings.ICEBREAKER_MAX_CONCURRENCY
+        self.budget = TokenBudget(
+            settings.ICEBREAKER_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        )
+        self.max_retries = max_retries
+        self.session_factory = session_factory
+        self.last_run_stats: Optional[IcebreakerRunStats] = None
+    
+    @property
+    def model(self) -> Optional[IcebreakerModel]:
+        # Resolved lazily so settings changes (and tests) take effect
+        return self._model or build_model()
+    
+    @model.setter
+    def model(self, model: Optional[IcebreakerModel]) -> None:
+        self._model = model
+    
+    # Cache
+    
+    def _load_cached(self, keys: List[str]) -> Dict[str, str]:
+        db = self.session_factory()
+        try:
+            cached = {}
+            for start in range(0, len(keys), 500):
+                for row in db.query(IcebreakerResult.cache_key, IcebreakerResult.message).filter(
+                    IcebreakerResult.cache_key.in_(keys[start:start + 500])
+                ).all():
+                    cached[row.cache_key] = row.message
+            return cached
+        finally:
+            db.close()
+    
+    def _save_results(self, results: Dict[str, Dict[str, Any]], model_name: str) -> None:
+        """Insert {cache_key: {"normalized", "price", "message"}} into icebreaker_cache"""
+        if not results:
+            return
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            # Another run may have written some of these keys in the meantime
+            existing = set()
+            keys = list(results)
+            for start in range(0, len(keys), 500):
+                existing.update(row.cache_key for row in db.query(IcebreakerResult.cache_key).filter(
+                    IcebreakerResult.cache_key.in_(keys[start:start + 500])
+                ).all())
+            db.bulk_insert_mappings(IcebreakerResult, [
+                {
+                    "cache_key": key,
+                    "template_version": TEMPLATE_VERSION,
+                    "normalized_address": entry["normalized"],
+                    "price": entry["price"],
+                    "message": entry["message"],
+                    "model": model_name,
+                    "created_at": now
+                }
+                for key, entry in results.items() if key not in existing
+            ])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Could not cache icebreakers: {e}")
+        finally:
+            db.close()
+    
+    # Generation
+    
+    @staticmethod
+    def _item(key: str, lead: Any) -> Dict[str, Any]:
+        first_name = lead.owner_name.split()[0] if lead.owner_name else None
+        item = {
+            "reference": key[:12],
+            "address": lead.address,
+            "city": lead.city,
+            "state": lead.state,
+            "price": lead.price,
+            "previous_price": lead.previous_price,
+            "bedrooms": lead.bedrooms,
+            "bathrooms": lead.bathrooms,
+            "sqft": lead.sqft,
+            "owner_first_name": first_name
+        }
+        # Leave out empty fields; every token is paid for
+        return {k: v for k, v in item.items() if v not in (None, "")}
+    
+    async def generate(self, leads: List[Any], stats: Optional[IcebreakerRunStats] = None) -> List[Any]:
+        """
+        Set lead.icebreaker on each lead in place
+        
+        Leads with the same address and price share one message. Leads the
+        model didn't answer for get the template and aren't cached, so the
+        next run tries them again.
+        
+        Args:
+            stats: Accumulate into an existing run's stats (used by generate_stream)
+        """
+        stats = stats or IcebreakerRunStats()
+        self.last_run_stats = stats
+        stats.leads += len(leads)
+        
+        by_key: Dict[str, List[Any]] = {}
+        normalized: Dict[str, str] = {}
+        for lead in leads:
+            key, normalized[key] = cache_key(lead)
+            by_key.setdefault(key, []).append(lead)
+        stats.unique += len(by_key)
+        
+        cached = await asyncio.to_thread(self._load_cached, list(by_key))
+        stats.cache_hits += len(cached)
+        for key, message in cached.items():
+            self._apply(by_key[key], message)
+        
+        misses = [key for key in by_key if key not in cached]
+        model = self.model
+        if model is None:
+            for key in misses:
+                self._apply(by_key[key], template_icebreaker(by_key[key][0]))
+            stats.fallbacks += len(misses)
+            stats.finished_at = time.perf_counter()
+            return leads
+        
+        batches = [misses[i:i + self.batch_size] for i in range(0, len(misses), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_concurrency)
+        ) as client:
+            
+            async def run_batch(keys: List[str]) -> Dict[str, Dict[str, Any]]:
+                items = [self._item(key, by_key[key][0]) for key in keys]
+                estimated = PROMPT_TOKENS + estimate_tokens(json.dumps(items)) + len(items) * MESSAGE_TOKENS
+                messages: Dict[str, str] = {}
+                async with semaphore:
+                    for attempt in range(self.max_retries + 1):
+                        await self.budget.acquire(estimated)
+                        stats.requests += 1
+                        try:
+                            messages, tokens = await model.generate_batch(client, items)
+                            self.budget.settle(estimated, tokens or estimated)
+                            stats.tokens_used += tokens or estimated
+                            break
+                        except httpx.HTTPStatusError as e:
+                            if e.response.status_code == 429 and attempt < self.max_retries:
+                                try:
+                                    delay = float(e.response.headers.get("Retry-After", ""))
+                                except ValueError:
+                                    delay = 2.0 ** (attempt + 1)
+                                await asyncio.sleep(min(delay, 60.0))
+                                continue
+                            stats.failed_requests += 1
+                            print(f"Icebreaker request failed ({len(items)} leads): {e}")
+                            break
+                        except Exception as e:
+                            stats.failed_requests += 1
+                            print(f"Icebreaker request failed ({len(items)} leads): {e}")
+                            break
+                
+                generated = {}
+                for key, item in zip(keys, items):
+                    message = messages.get(item["reference"])
+                    if message:
+                        generated[key] = {
+                            "normalized": normalized[key],
+                            "price": by_key[key][0].price,
+                            "message": message
+                        }
+                        self._apply(by_key[key], message)
+                        stats.generated += 1
+                    else:
+                        self._apply(by_key[key], template_icebreaker(by_key[key][0]))
+                        stats.fallbacks += 1
+                return generated
+            
+            batch_results = await asyncio.gather(*[run_batch(keys) for keys in batches])
+        
+        to_cache = {}
+        for generated in batch_results:
+            to_cache.update(generated)
+        await asyncio.to_thread(self._save_results, to_cache, getattr(model, "model", model.name))
+        
+        stats.finished_at = time.perf_counter()
+        return leads
+    
+    async def generate_stream(
+        self,
+        leads: AsyncIterator[Any],
+        batch_size: int = 200,
+        stats: Optional[IcebreakerRunStats] = None
+    ) -> AsyncIterator[Any]:
+        """Generate for a lead stream in chunks, yielding leads as each chunk finishes"""
+        stats = stats or IcebreakerRunStats()
+        chunk = []
+        async for lead in leads:
+            chunk.append(lead)
+            if len(chunk) >= batch_size:
+                for lead_with_message in await self.generate(chunk, stats):
+                    yield lead_with_message
+                chunk = []
+        if chunk:
+            for lead_with_message in await self.generate(chunk, stats):
+                yield lead_with_message
+        self.last_run_stats = stats
+    
+    @staticmethod
+    def _apply(leads: List[Any], message: str) -> None:
+        for lead in leads:
+            lead.icebreaker = message
+
+# Singleton instance
+icebreakers = IcebreakerGenerator()
@@ -0,0 +1,153 @@
+"""
+Bulk Lead Assignment
+Set-based reassignment of many leads to one team member
+
+Leads are picked by id list and/or filter (current assignee, tag, status),
+always limited to leads owned by or assigned to someone on the team. Work is
+done in id-ordered chunks of TEAM_BULK_ASSIGN_CHUNK_SIZE, each its own short
+transaction: one SELECT for the chunk, one UPDATE ... WHERE id IN (...)
+RETURNING id, one bulk insert of team_events, plus the team_stats deltas.
+Handing a departing agent's 8,000 leads to someone else is 8 small
+transactions instead of 8,000 ORM round trips in one long one.
+"""
+
+import json
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import update, cast, String
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core import tenancy
+from app.models.user import User
+from app.models.leads import Lead, normalize_status
+from app.models.team_simple import TeamEvent
+from app.services import team_stats, team_events
+from app.services.team_events import team_event_bus
+from app.services.lead_routing import lead_router
+
+class BulkAssignResult:
+    """Counters for one bulk assignment"""
+    
+    def __init__(self):
+        self.matched = 0
+        self.assigned = 0
+        self.already_assigned = 0  # Matched but already with the assignee
+        self.chunks = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "matched": self.matched,
+            "assigned": self.assigned,
+            "already_assigned": self.already_assigned,
+            "chunks": self.chunks
+        }
+
+def lead_criteria(
+    db: Session,
+    team_id: int,
+    lead_ids: Optional[List[int]] = None,
+    current_assignee_id: Optional[int] = None,
+    unassigned_only: bool = False,
+    tag: Optional[str] = None,
+    status: Optional[str] = None
+) -> list:
+    """WHERE clauses for a bulk selection (all optional filters are ANDed)"""
+    criteria = [tenancy.team_filter(Lead, team_id)]
+    if lead_ids is not None:
+        criteria.append(Lead.id.in_(lead_ids))
+    if unassigned_only:
+        criteria.append(Lead.assigned_to.is_(None))
+    elif current_assignee_id is not None:
+        criteria.append(Lead.assigned_to == current_assignee_id)
+    if tag:
+        # tags is a JSON array; match the element as it is serialized ("tag")
+        criteria.append(cast(Lead.tags, String).contains(json.dumps(tag), autoescape=True))
+    if status:
+        criteria.append(Lead.status == normalize_status(status))
+    return criteria
+
+def bulk_assign(
+    team_id: int,
+    assignee: User,
+    actor_id: int,
+    chunk_size: Optional[int] = None,
+    **filters
+) -> Dict[str, Any]:
+    """
+    Assign every matching lead to assignee, chunk by chunk
+    
+    filters are lead_criteria's keyword arguments. Each chunk commits on its
+    own, so a failure part way keeps the chunks already done.
+    """
+    chunk_size = chunk_size or settings.TEAM_BULK_ASSIGN_CHUNK_SIZE
+    result = BulkAssignResult()
+    name = team_events.display_name(assignee)
+    last_id = 0
+    
+    db = SessionLocal()
+    try:
+        criteria = lead_criteria(db, team_id, **filters)
+        while True:
+            rows = db.query(Lead.id, Lead.assigned_to, Lead.first_name, Lead.last_name).filter(
+                *criteria, Lead.id > last_id
+            ).order_by(Lead.id).limit(chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            result.matched += len(rows)
+            
+            pending = {row.id: row for row in rows if row.assigned_to != assignee.id}
+            result.already_assigned += len(rows) - len(pending)
+            if not pending:
+                continue
+            
+            # Counters first: team_stats may seed a missing row in its own
+            # transaction, which has to happen before this one takes write locks
+            team_stats.record_leads_reassigned(db, [row.assigned_to for row in pending.values()], assignee.id)
+            
+            now = datetime.utcnow()
+            updated_ids = db.scalars(
+                update(Lead).where(
+                    Lead.id.in_(list(pending))
+                ).values(
+                    assigned_to=assignee.id,
+                    assigned_at=now,
+                    response_due_at=None
+                ).returning(Lead.id).execution_options(synchronize_session=False)
+            ).all()
+            
+            updated = [pending[lead_id] for lead_id in updated_ids]
+            if assignee.team_id is not None and updated:
+                db.bulk_insert_mappings(TeamEvent, [
+                    {
+                        "team_id": assignee.team_id,
+                        "event_type": "lead_assigned",
+                        "message": f"{name} was assigned lead: {team_events.lead_name(row)}",
+                        "user_id": assignee.id,
+                        "actor_id": actor_id,
+                        "lead_id": row.id,
+                        "user_name": name,
+                        "created_at": now
+                    }
+                    for row in updated
+                ])
+            db.commit()
+            
+            for lead_id in updated_ids:
+                lead_router.timers.cancel(lead_id)
+            result.assigned += len(updated_ids)
+            result.chunks += 1
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    
+    if result.assigned:
+        team_stats.invalidate_team(team_id, assignee.team_id)
+        team_event_bus.notify(assignee.team_id)
+        print(f"👥 Bulk assigned {result.assigned} leads to {name} in {result.chunks} chunks")
+    return result.to_dict()
@@ -0,0 +1,434 @@
+"""
+Lead Routing
+Assigns incoming leads to team members and reassigns them if nobody responds
+
+A team opts in by setting teams.routing_strategy:
+    round_robin   members in turn
+    weighted      smooth weighted round robin over teams.routing_weights
+    least_loaded  member with the fewest assigned leads (heap per batch)
+
+New leads from CSV import, webhooks and the Hunter push are routed to the
+team of the lead's owner. Each routed lead gets a response_due_at
+LEAD_RESPONSE_TIMEOUT_MINUTES out, kept in an in-memory min-heap
+(ResponseTimers: O(log n) arm, lazy O(1) cancel). One background task sleeps
+until the earliest deadline; when it passes, a lead whose last_contact_at
+hasn't moved since it was assigned goes to the next member. The heap is
+rebuilt from the indexed response_due_at column on startup, so no periodic
+table scans are needed.
+"""
+
+import asyncio
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.leads import Lead
+from app.models.team_simple import Team
+from app.services import team_stats, team_events
+from app.services.team_events import team_event_bus
+
+STRATEGIES = ("round_robin", "weighted", "least_loaded")
+
+class ResponseTimers:
+    """
+    Response deadlines keyed by lead id, earliest first
+    
+    Re-arming or cancelling a lead leaves its old heap entry behind; stale
+    entries are skipped when they reach the top. Thread-safe.
+    """
+    
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, int]] = []  # (due, lead_id, version)
+        self._due: Dict[int, Tuple[datetime, int]] = {}  # lead_id -> (due, version)
+        self._version = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._due)
+    
+    def arm(self, lead_id: int, due: datetime) -> bool:
+        """Set a lead's deadline; True if it is now the earliest one"""
+        with self._lock:
+            self._version += 1
+            self._due[lead_id] = (due, self._version)
+            heapq.heappush(self._heap, (due, lead_id, self._version))
+            return self._heap[0][2] == self._version
+    
+    def cancel(self, lead_id: int) -> None:
+        with self._lock:
+            self._due.pop(lead_id, None)
+    
+    def _drop_stale(self) -> None:
+        while self._heap:
+            due, lead_id, version = self._heap[0]
+            current = self._due.get(lead_id)
+            if current is not None and current[1] == version:
+                return
+            heapq.heappop(self._heap)
+    
+    def next_due(self) -> Optional[datetime]:
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+    
+    def pop_expired(self, now: datetime, limit: int = 500) -> List[int]:
+        """Remove and return up to limit leads whose deadline has passed"""
+        expired = []
+        with self._lock:
+            while len(expired) < limit:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, lead_id, _ = heapq.heappop(self._heap)
+                del self._due[lead_id]
+                expired.append(lead_id)
+        return expired
+
+class TeamRoute:
+    """A team's routing settings and eligible members, loaded once per batch"""
+    
+    def __init__(self, team: Team, members: List[User]):
+        self.team_id = team.id
+        self.strategy = team.routing_strategy
+        weights = {str(k): v for k, v in (team.routing_weights or {}).items()}
+        self.weights = {member.id: max(0, int(weights.get(str(member.id), 1))) for member in members}
+        self.members = sorted(member.id for member in members if self.weights[member.id] > 0)
+        self.names = {member.id: member.full_name or member.email for member in members}
+
+class LeadRouter:
+    """
+    Routing engine plus the response-timeout loop (started from the app lifespan)
+    
+    Usage:
+        lead_router.route_leads(new_lead_ids)   # after the leads are committed
+        lead_router.responded(lead)             # when an agent logs contact
+    """
+    
+    def __init__(self):
+        self.timers = ResponseTimers()
+        self._cursor: Dict[int, int] = {}  # team_id -> last member picked (round_robin)
+        self._current_weights: Dict[int, Dict[int, int]] = {}  # team_id -> smooth WRR state
+        self._pick_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.stats = {"routed": 0, "reassigned": 0, "responded": 0, "gave_up": 0}
+    
+    # Picking members
+    
+    def pick(
+        self,
+        route: TeamRoute,
+        count: int,
+        loads: Optional[Dict[int, int]] = None,
+        exclude: Optional[Iterable[int]] = None
+    ) -> List[Optional[int]]:
+        """count member ids in assignment order (None where nobody is eligible)"""
+        excluded = set(exclude or ())
+        members = [member for member in route.members if member not in excluded]
+        if not members:
+            return [None] * count
+        
+        with self._pick_lock:
+            if route.strategy == "weighted":
+                return [self._pick_weighted(route, members) for _ in range(count)]
+            if route.strategy == "least_loaded":
+                heap = [((loads or {}).get(member, 0), member) for member in members]
+                heapq.heapify(heap)
+                picks = []
+                for _ in range(count):
+                    load, member = heapq.heappop(heap)
+                    picks.append(member)
+                    heapq.heappush(heap, (load + 1, member))
+                return picks
+            return [self._pick_round_robin(route.team_id, members) for _ in range(count)]
+    
+    def _pick_round_robin(self, team_id: int, members: List[int]) -> int:
+        last = self._cursor.get(team_id)
+        member = next((m for m in members if last is None or m > last), members[0])
+        self._cursor[team_id] = member
+        return member
+    
+    def _pick_weighted(self, route: TeamRoute, members: List[int]) -> int:
+        # Smooth weighted round robin (nginx): spreads a heavy member's turns out
+        current = self._current_weights.setdefault(route.team_id, {})
+        total = 0
+        for member in members:
+            current[member] = current.get(member, 0) + route.weights[member]
+            total += route.weights[member]
+        chosen = max(members, key=lambda member: (current[member], -member))
+        current[chosen] -= total
+        return chosen
+    
+    # Loading teams
+    
+    @staticmethod
+    def _load_routes(db: Session, team_ids: Iterable[int]) -> Dict[int, TeamRoute]:
+        team_ids = {team_id for team_id in team_ids if team_id is not None}
+        if not team_ids:
+            return {}
+        teams = db.query(Team).filter(
+            Team.id.in_(team_ids),
+            Team.routing_strategy.in_(STRATEGIES)
+        ).all()
+        if not teams:
+            return {}
+        members: Dict[int, List[User]] = {}
+        for member in db.query(User).filter(
+            User.team_id.in_([team.id for team in teams]),
+            User.is_active.isnot(False)
+        ):
+            members.setdefault(member.team_id, []).append(member)
+        return {team.id: TeamRoute(team, members.get(team.id, [])) for team in teams}
+    
+    @staticmethod
+    def _loads(db: Session, routes: Iterable[TeamRoute]) -> Dict[int, int]:
+        member_ids = [member for route in routes if route.strategy == "least_loaded" for member in route.members]
+        if not member_ids:
+            return {}
+        return dict(db.query(Lead.assigned_to, func.count(Lead.id)).filter(
+            Lead.assigned_to.in_(member_ids)
+        ).group_by(Lead.assigned_to).all())
+    
+    # Routing new leads
+    
+    def route_leads(self, lead_ids: List[int]) -> Dict[int, int]:
+        """
+        Assign unassigned leads on routing-enabled teams; returns {lead_id: member_id}
+        
+        Runs in its own transaction, so call it after the leads are committed
+        (from a request or a worker thread).
+        """
+        if not lead_ids:
+            return {}
+        db = SessionLocal()
+        try:
+            assignments, team_ids = self._route(db, lead_ids)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Lead routing failed for {len(lead_ids)} leads: {e}")
+            return {}
+        finally:
+            db.close()
+        
+        self._arm_all(assignments)
+        team_event_bus.notify(*team_ids)
+        if assignments:
+            self.stats["routed"] += len(assignments)
+            print(f"🔀 Routed {len(assignments)} leads")
+        return {lead_id: member_id for lead_id, (member_id, _) in assignments.items()}
+    
+    def _route(self, db: Session, lead_ids: List[int]) -> Tuple[Dict[int, Tuple[int, datetime]], set]:
+        leads = db.query(Lead).filter(Lead.id.in_(lead_ids), Lead.assigned_to.is_(None)).order_by(Lead.id).all()
+        if not leads:
+            return {}, set()
+        owner_teams = dict(db.query(User.id, User.team_id).filter(
+            User.id.in_({lead.user_id for lead in leads})
+        ).all())
+        routes = self._load_routes(db, owner_teams.values())
+        loads = self._loads(db, routes.values())
+        # Seed missing rollup rows now: record() can't seed once this transaction has written
+        team_stats.prepare(*routes)
+        
+        by_team: Dict[int, List[Lead]] = {}
+        for lead in leads:
+            team_id = owner_teams.get(lead.user_id)
+            if team_id in routes:
+                by_team.setdefault(team_id, []).append(lead)
+        
+        now = datetime.utcnow()
+        due = now + timedelta(minutes=settings.LEAD_RESPONSE_TIMEOUT_MINUTES)
+        assignments: Dict[int, Tuple[int, datetime]] = {}
+        for team_id, team_leads in by_team.items():
+            route = routes[team_id]
+            picks = self.pick(route, len(team_leads), loads=loads)
+            per_member: Dict[int, List[Lead]] = {}
+            for lead, member_id in zip(team_leads, picks):
+                if member_id is None:
+                    continue
+                lead.assigned_to = member_id
+                lead.assigned_at = now
+                lead.response_due_at = due
+                lead.routing_attempts = 1
+                assignments[lead.id] = (member_id, due)
+                per_member.setdefault(member_id, []).append(lead)
+            
+            for member_id, member_leads in per_member.items():
+                team_stats.record_leads_reassigned(db, [None] * len(member_leads), member_id)
+                self._record_events(db, route, member_leads, member_id, "lead_assigned", route.strategy.replace("_", " "))
+        
+        return assignments, set(by_team)
+    
+    @staticmethod
+    def _record_events(db: Session, route: TeamRoute, leads: List[Lead], member_id: int, event_type: str, reason: str) -> None:
+        name = route.names.get(member_id)
+        verb = "was assigned" if event_type == "lead_assigned" else "was handed"
+        for lead in leads:
+            team_events.record(
+                db, route.team_id, event_type,
+                f"{name} {verb} lead: {team_events.lead_name(lead)} ({reason})",
+                user_id=member_id,
+                lead_id=lead.id,
+                user_name=name,
+                data={"reason": reason}
+            )
+    
+    # Response tracking
+    
+    def release(self, lead: Lead) -> bool:
+        """Stop a lead's response timer, e.g. when a leader assigns it by hand (caller commits)"""
+        if lead.response_due_at is None:
+            return False
+        lead.response_due_at = None
+        self.timers.cancel(lead.id)
+        return True
+    
+    def responded(self, lead: Lead) -> None:
+        """An agent contacted the lead (caller commits)"""
+        if self.release(lead):
+            self.stats["responded"] += 1
+    
+    def _arm_all(self, deadlines: Dict[int, Tuple[int, datetime]]) -> None:
+        """Arm {lead_id: (member_id, due)}; wake the loop if a new earliest deadline appeared"""
+        earliest = False
+        for lead_id, (_, due) in deadlines.items():
+            earliest = self.timers.arm(lead_id, due) or earliest
+        if earliest:
+            self._wake()
+    
+    # Timeout loop
+    
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def _wake(self) -> None:
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    async def _run(self) -> None:
+        pending = await asyncio.to_thread(self._load_pending)
+        print(f"⏱️  Lead routing started ({pending} leads awaiting a response)")
+        while True:
+            self._wakeup.clear()
+            expired = self.timers.pop_expired(datetime.utcnow())
+            if expired:
+                try:
+                    await asyncio.to_thread(self._handle_expired, expired)
+                except Exception as e:
+                    print(f"❌ Lead reassignment failed: {e}")
+                continue
+            
+            next_due = self.timers.next_due()
+            timeout = None if next_due is None else max(0.0, (next_due - datetime.utcnow()).total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def _load_pending(self) -> int:
+        """Re-arm every lead still awaiting a response (indexed on response_due_at)"""
+        db = SessionLocal()
+        try:
+            rows = db.query(Lead.id, Lead.response_due_at).filter(Lead.response_due_at.isnot(None)).all()
+        finally:
+            db.close()
+        for lead_id, due in rows:
+            self.timers.arm(lead_id, due)
+        return len(rows)
+    
+    def _handle_expired(self, lead_ids: List[int]) -> None:
+        db = SessionLocal()
+        try:
+            leads = db.query(Lead).filter(Lead.id.in_(lead_ids), Lead.response_due_at.isnot(None)).all()
+            now = datetime.utcnow()
+            rearm: Dict[int, Tuple[int, datetime]] = {}
+            
+            # Leads that were contacted (or reassigned by hand) since they were routed
+            unanswered = []
+            for lead in leads:
+                if lead.response_due_at > now:
+                    rearm[lead.id] = (lead.assigned_to, lead.response_due_at)
+                elif lead.last_contact_at and lead.assigned_at and lead.last_contact_at >= lead.assigned_at:
+                    lead.response_due_at = None
+                    self.stats["responded"] += 1
+                else:
+                    unanswered.append(lead)
+            
+            assignee_teams = dict(db.query(User.id, User.team_id).filter(
+                User.id.in_({lead.assigned_to for lead in unanswered if lead.assigned_to})
+            ).all()) if unanswered else {}
+            routes = self._load_routes(db, assignee_teams.values())
+            loads = self._loads(db, routes.values())
+            # Seed missing rollup rows now: record() can't seed once this transaction has written
+            team_stats.prepare(*routes)
+            
+            due = now + timedelta(minutes=settings.LEAD_RESPONSE_TIMEOUT_MINUTES)
+            team_ids = set()
+            reassigned = 0
+            for lead in unanswered:
+                route = routes.get(assignee_teams.get(lead.assigned_to))
+                member_id = None
+                if route is not None and (lead.routing_attempts or 0) <= settings.LEAD_ROUTING_MAX_REASSIGNMENTS:
+                    member_id = self.pick(route, 1, loads=loads, exclude=[lead.assigned_to])[0]
+                if member_id is None:
+                    # Routing was turned off, nobody else is available, or it has been
+                    # round enough times: leave it with the current agent
+                    lead.response_due_at = None
+                    self.stats["gave_up"] += 1
+                    continue
+                
+                previous = lead.assigned_to
+                lead.assigned_to = member_id
+                lead.assigned_at = now
+                lead.response_due_at = due
+                lead.routing_attempts = (lead.routing_attempts or 0) + 1
+                loads[member_id] = loads.get(member_id, 0) + 1
+                rearm[lead.id] = (member_id, due)
+                team_stats.record_leads_reassigned(db, [previous], member_id)
+                minutes = settings.LEAD_RESPONSE_TIMEOUT_MINUTES
+                self._record_events(
+                    db, route, [lead], member_id, "lead_reassigned",
+                    f"no response from {route.names.get(previous, 'previous agent')} in {minutes} min"
+                )
+                team_ids.add(route.team_id)
+                reassigned += 1
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        
+        self._arm_all(rearm)
+        team_event_bus.notify(*team_ids)
+        if reassigned:
+            self.stats["reassigned"] += reassigned
+            print(f"🔁 Reassigned {reassigned} leads with no response in {settings.LEAD_RESPONSE_TIMEOUT_MINUTES} min")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "awaiting_response": len(self.timers)}
+
+# Singleton instance
+lead_router = LeadRouter()
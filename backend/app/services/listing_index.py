@@ -0,0 +1,217 @@
+"""
+Seen-Listings Index
+Keeps Hunter runs incremental: only new or re-priced listings move on
+
+Every crawled listing is matched against hunter_seen_listings by normalized
+address hash, or by listing URL when the address text changed. Matches
+update last_seen/times_seen (and price history); only listings that are new,
+or whose price changed, are passed on to skip tracing and the CRM push.
+
+Pipelines that store the leads afterwards (the Hunter scheduler) filter with
+mark_seen=False and call mark_seen() in the transaction that stores them, so
+a listing is never marked seen if the run dies before its lead is saved.
+Sightings of unchanged listings are still recorded as the crawl goes.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.hunter import SeenListing
+from app.services.address_normalizer import normalize_address, address_hash
+
+class ListingIndex:
+    """
+    Batch filter over hunter_seen_listings
+    
+    Usage:
+        index = ListingIndex()
+        async for lead in index.filter_new(hunter_scraper.crawl(zip_codes=zips), user_id=user.id):
+            ...  # only new / price-changed listings
+    """
+    
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, chunk_size: int = 500):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.last_run_stats: Dict[str, int] = {}
+    
+    @staticmethod
+    def _identity(lead) -> Dict[str, Any]:
+        return {
+            "hash": address_hash(lead.address, lead.city, lead.state, lead.zip_code),
+            "normalized": normalize_address(lead.address, lead.city, lead.state, lead.zip_code),
+            "url": lead.listing_url or None
+        }
+    
+    def record(
+        self,
+        leads: List[Any],
+        user_id: int = 0,
+        db: Optional[Session] = None,
+        mark_fresh: bool = True
+    ) -> List[Any]:
+        """
+        Record one batch of FSBOLeads and return the ones worth processing
+        
+        Returned leads get listing_status "new" or "price_changed" (with
+        previous_price). Duplicates within the batch count as seen. With
+        mark_fresh=False only the unchanged listings are recorded; the
+        returned ones are left for mark_seen() once they are stored.
+        """
+        if not leads:
+            return []
+        
+        own_session = db is None
+        db = db or self.session_factory()
+        stats_before = dict(self.last_run_stats)
+        try:
+            try:
+                fresh = self._record(db, leads, user_id, self.last_run_stats, mark_fresh)
+                db.commit()
+            except IntegrityError:
+                # Another run inserted one of these addresses first; retry against its rows
+                db.rollback()
+                self.last_run_stats.clear()
+                self.last_run_stats.update(stats_before)
+                fresh = self._record(db, leads, user_id, self.last_run_stats, mark_fresh)
+                db.commit()
+            return fresh
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            if own_session:
+                db.close()
+    
+    def mark_seen(self, db: Session, leads: List[Any], user_id: int = 0) -> List[Any]:
+        """
+        Record checked leads as part of db's transaction (nothing is committed here)
+        
+        Returns the leads that are still new or re-priced; ones another run
+        (or an earlier batch) recorded since they were filtered come back
+        unchanged and should be dropped. The caller retries the transaction on IntegrityError.
+        """
+        if not leads:
+            return []
+        return self._record(db, leads, user_id, {})
+    
+    def _record(
+        self,
+        db: Session,
+        leads: List[Any],
+        user_id: int,
+        stats: Dict[str, int],
+        mark_fresh: bool = True
+    ) -> List[Any]:
+        identities = [self._identity(lead) for lead in leads]
+        hashes = list({identity["hash"] for identity in identities})
+        urls = list({identity["url"] for identity in identities if identity["url"]})
+        
+        by_hash: Dict[str, SeenListing] = {}
+        by_url: Dict[str, SeenListing] = {}
+        for start in range(0, max(len(hashes), len(urls)), self.chunk_size):
+            hash_chunk = hashes[start:start + self.chunk_size]
+            url_chunk = urls[start:start + self.chunk_size]
+            rows = db.query(SeenListing).filter(
+                SeenListing.user_id == user_id,
+                or_(
+                    SeenListing.address_hash.in_(hash_chunk),
+                    SeenListing.listing_url.in_(url_chunk)
+                )
+            ).all()
+            for row in rows:
+                by_hash[row.address_hash] = row
+                if row.listing_url:
+                    by_url[row.listing_url] = row
+        
+        now = datetime.utcnow()
+        fresh = []
+        for lead, identity in zip(leads, identities):
+            stats["seen"] = stats.get("seen", 0) + 1
+            row = by_hash.get(identity["hash"]) or (by_url.get(identity["url"]) if identity["url"] else None)
+            
+            if row is None:
+                row = SeenListing(
+                    user_id=user_id,
+                    address_hash=identity["hash"],
+                    normalized_address=identity["normalized"],
+                    listing_url=identity["url"],
+                    source=lead.source,
+                    zip_code=lead.zip_code or None,
+                    last_price=lead.price,
+                    first_seen_at=now,
+                    last_seen_at=now,
+                    times_seen=1
+                )
+                if mark_fresh:
+                    db.add(row)
+                by_hash[identity["hash"]] = row
+                if identity["url"]:
+                    by_url[identity["url"]] = row
+                lead.listing_status = "new"
+                fresh.append(lead)
+                stats["new"] = stats.get("new", 0) + 1
+                continue
+            
+            price_changed = bool(lead.price and row.last_price and lead.price != row.last_price)
+            if price_changed:
+                lead.listing_status = "price_changed"
+                lead.previous_price = row.last_price
+                fresh.append(lead)
+                stats["price_changed"] = stats.get("price_changed", 0) + 1
+                if not mark_fresh:
+                    # Left for mark_seen(), which records the sighting and the new price together
+                    continue
+            else:
+                stats["unchanged"] = stats.get("unchanged", 0) + 1
+            
+            row.last_seen_at = now
+            row.times_seen = (row.times_seen or 0) + 1
+            if identity["url"] and not row.listing_url:
+                row.listing_url = identity["url"]
+                by_url[identity["url"]] = row
+            
+            if price_changed:
+                row.previous_price = row.last_price
+                row.last_price = lead.price
+                row.price_changed_at = now
+            elif lead.price and not row.last_price:
+                row.last_price = lead.price
+        
+        return fresh
+    
+    async def filter_new(
+        self,
+        leads: AsyncIterator[Any],
+        user_id: int = 0,
+        batch_size: int = 100,
+        mark_seen: bool = True
+    ) -> AsyncIterator[Any]:
+        """
+        Stream only new / price-changed leads out of a crawl
+        
+        Leads are checked in batches of batch_size (one SELECT and one commit
+        per batch, run in a worker thread so the crawl keeps going). With
+        mark_seen=False only unchanged sightings are written; the caller marks
+        the yielded leads seen with mark_seen() when it stores them.
+        """
+        self.last_run_stats = {"seen": 0, "new": 0, "price_changed": 0, "unchanged": 0}
+        batch = []
+        async for lead in leads:
+            batch.append(lead)
+            if len(batch) >= batch_size:
+                for fresh in await asyncio.to_thread(self.record, batch, user_id, None, mark_seen):
+                    yield fresh
+                batch = []
+        
+        if batch:
+            for fresh in await asyncio.to_thread(self.record, batch, user_id, None, mark_seen):
+                yield fresh
+
+# Singleton instance
+listing_index = ListingIndex()
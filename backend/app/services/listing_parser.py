@@ -0,0 +1,346 @@
+"""
+Listing Page Parser
+Fast HTML parsing for The Hunter's search result pages
+
+Backends, fastest first:
+    selectolax  (optional) Lexbor-based CSS selectors
+    lxml        (optional) precompiled XPath
+    bs4         BeautifulSoup with html.parser (always available, fallback)
+
+Every backend only extracts raw strings; the shared *_fields helpers turn
+them into FSBOLead keyword arguments, so all backends return identical
+results. Parsers return plain dicts so they can run in a process pool.
+"""
+
+import asyncio
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from bs4 import BeautifulSoup
+
+from app.core.config import settings
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    from lxml import html as lxml_html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+ZILLOW_SOURCE = "Zillow FSBO"
+CRAIGSLIST_SOURCE = "Craigslist FSBO"
+
+# Compiled once at import instead of on every find() call
+NON_DIGIT_RE = re.compile(r'[^\d]')
+NUMBER_RE = re.compile(r'[\d.]+')
+LIST_CARD_RE = re.compile('list-card')
+PRICE_CLASS_RE = re.compile('price')
+DETAILS_CLASS_RE = re.compile('list-card-details')
+SQFT_RE = re.compile('sqft')
+
+def extract_price(price_text: str) -> Optional[int]:
+    """Extract numeric price from text like '$450,000'"""
+    numeric = NON_DIGIT_RE.sub('', price_text)
+    return int(numeric) if numeric else None
+
+def extract_number(text: str) -> Optional[float]:
+    """Extract first number from text"""
+    match = NUMBER_RE.search(text)
+    if not match:
+        return None
+    try:
+        return float(match.group())
+    except ValueError:
+        return None
+
+def _zillow_fields(
+    address_text: str,
+    price_text: Optional[str],
+    detail_texts: List[str],
+    sqft_text: Optional[str],
+    href: Optional[str],
+    zip_code: str
+) -> Dict[str, Any]:
+    # Example address: "123 Main St, Austin, TX 78701"
+    parts = address_text.split(',')
+    street = parts[0].strip() if len(parts) > 0 else ""
+    city = parts[1].strip() if len(parts) > 1 else ""
+    state_zip = parts[2].strip() if len(parts) > 2 else ""
+    
+    state = ""
+    extracted_zip = zip_code
+    if state_zip:
+        state_zip_parts = state_zip.split()
+        state = state_zip_parts[0] if len(state_zip_parts) > 0 else ""
+        extracted_zip = state_zip_parts[1] if len(state_zip_parts) > 1 else zip_code
+    
+    beds = None
+    baths = None
+    for text in detail_texts:
+        text = text.lower()
+        if 'bd' in text:
+            beds = extract_number(text)
+        elif 'ba' in text:
+            baths = extract_number(text)
+    
+    listing_url = None
+    if href:
+        listing_url = f"https://www.zillow.com{href}" if href.startswith('/') else href
+    
+    # Zillow FSBO pages don't show owner contact info; skip trace fills it in later
+    return {
+        "address": street,
+        "city": city,
+        "state": state,
+        "zip_code": extracted_zip,
+        "price": extract_price(price_text) if price_text else None,
+        "bedrooms": beds,
+        "bathrooms": baths,
+        "sqft": extract_number(sqft_text) if sqft_text else None,
+        "listing_url": listing_url,
+        "source": ZILLOW_SOURCE
+    }
+
+def _craigslist_fields(
+    title: str,
+    href: Optional[str],
+    price_text: Optional[str],
+    city: str,
+    state: str
+) -> Dict[str, Any]:
+    # Craigslist list view has no full address or ZIP; the title usually names the property
+    return {
+        "address": title,
+        "city": city,
+        "state": state,
+        "zip_code": "",
+        "price": extract_price(price_text) if price_text else None,
+        "listing_url": href,
+        "source": CRAIGSLIST_SOURCE
+    }
+
+# selectolax
+
+def _zillow_selectolax(html: str, zip_code: str) -> List[Dict[str, Any]]:
+    leads = []
+    tree = HTMLParser(html)
+    for card in tree.css('article[class*="list-card"]'):
+        address = card.css_first('address')
+        if address is None:
+            continue
+        price = card.css_first('span[class*="price"]')
+        details = card.css_first('ul[class*="list-card-details"]')
+        sqft = next((span for span in card.css('span') if 'sqft' in (span.text(deep=False) or '')), None)
+        link = card.css_first('a[href]')
+        leads.append(_zillow_fields(
+            address.text(strip=True),
+            price.text(strip=True) if price else None,
+            [li.text(strip=True) for li in details.css('li')] if details else [],
+            sqft.text(strip=True) if sqft else None,
+            link.attributes.get('href') if link else None,
+            zip_code
+        ))
+    return leads
+
+def _craigslist_selectolax(html: str, city: str, state: str) -> List[Dict[str, Any]]:
+    leads = []
+    tree = HTMLParser(html)
+    for row in tree.css('li.result-row'):
+        title = row.css_first('a.result-title')
+        if title is None:
+            continue
+        price = row.css_first('span.result-price')
+        leads.append(_craigslist_fields(
+            title.text(strip=True),
+            title.attributes.get('href'),
+            price.text(strip=True) if price else None,
+            city,
+            state
+        ))
+    return leads
+
+# lxml
+
+if LXML_AVAILABLE:
+    _X_CARDS = etree.XPath('//article[contains(@class, "list-card")]')
+    _X_ADDRESS = etree.XPath('(.//address)[1]')
+    _X_PRICE = etree.XPath('(.//span[contains(@class, "price")])[1]')
+    _X_DETAIL_ITEMS = etree.XPath('(.//ul[contains(@class, "list-card-details")])[1]//li')
+    _X_SQFT = etree.XPath('(.//span[contains(text(), "sqft")])[1]')
+    _X_LINK = etree.XPath('(.//a[@href])[1]/@href')
+    _X_ROWS = etree.XPath('//li[contains(concat(" ", normalize-space(@class), " "), " result-row ")]')
+    _X_TITLE = etree.XPath('(.//a[contains(concat(" ", normalize-space(@class), " "), " result-title ")])[1]')
+    _X_CL_PRICE = etree.XPath('(.//span[contains(concat(" ", normalize-space(@class), " "), " result-price ")])[1]')
+
+def _lxml_text(element) -> str:
+    """Same result as BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+def _first(elements):
+    return elements[0] if elements else None
+
+def _zillow_lxml(html: str, zip_code: str) -> List[Dict[str, Any]]:
+    leads = []
+    tree = lxml_html.fromstring(html)
+    for card in _X_CARDS(tree):
+        address = _first(_X_ADDRESS(card))
+        if address is None:
+            continue
+        price = _first(_X_PRICE(card))
+        sqft = _first(_X_SQFT(card))
+        leads.append(_zillow_fields(
+            _lxml_text(address),
+            _lxml_text(price) if price is not None else None,
+            [_lxml_text(li) for li in _X_DETAIL_ITEMS(card)],
+            _lxml_text(sqft) if sqft is not None else None,
+            _first(_X_LINK(card)),
+            zip_code
+        ))
+    return leads
+
+def _craigslist_lxml(html: str, city: str, state: str) -> List[Dict[str, Any]]:
+    leads = []
+    tree = lxml_html.fromstring(html)
+    for row in _X_ROWS(tree):
+        title = _first(_X_TITLE(row))
+        if title is None:
+            continue
+        price = _first(_X_CL_PRICE(row))
+        leads.append(_craigslist_fields(
+            _lxml_text(title),
+            title.get('href'),
+            _lxml_text(price) if price is not None else None,
+            city,
+            state
+        ))
+    return leads
+
+# BeautifulSoup (fallback)
+
+def _zillow_bs4(html: str, zip_code: str) -> List[Dict[str, Any]]:
+    leads = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.find_all('article', class_=LIST_CARD_RE):
+        address = card.find('address')
+        if not address:
+            continue
+        price = card.find('span', class_=PRICE_CLASS_RE)
+        details = card.find('ul', class_=DETAILS_CLASS_RE)
+        sqft = card.find('span', string=SQFT_RE)
+        link = card.find('a', href=True)
+        leads.append(_zillow_fields(
+            address.get_text(strip=True),
+            price.get_text(strip=True) if price else None,
+            [li.get_text(strip=True) for li in details.find_all('li')] if details else [],
+            sqft.get_text(strip=True) if sqft else None,
+            link['href'] if link else None,
+            zip_code
+        ))
+    return leads
+
+def _craigslist_bs4(html: str, city: str, state: str) -> List[Dict[str, Any]]:
+    leads = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for row in soup.find_all('li', class_='result-row'):
+        title = row.find('a', class_='result-title')
+        if not title:
+            continue
+        price = row.find('span', class_='result-price')
+        leads.append(_craigslist_fields(
+            title.get_text(strip=True),
+            title.get('href'),
+            price.get_text(strip=True) if price else None,
+            city,
+            state
+        ))
+    return leads
+
+PARSERS = {
+    "bs4": (_zillow_bs4, _craigslist_bs4)
+}
+if LXML_AVAILABLE:
+    PARSERS["lxml"] = (_zillow_lxml, _craigslist_lxml)
+if SELECTOLAX_AVAILABLE:
+    PARSERS["selectolax"] = (_zillow_selectolax, _craigslist_selectolax)
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Pick the requested backend, or the fastest installed one for "auto"/None"""
+    backend = backend or settings.HUNTER_PARSER_BACKEND
+    if backend in PARSERS:
+        return backend
+    if backend not in (None, "", "auto"):
+        print(f"⚠️  Parser backend '{backend}' not available, falling back")
+    for name in ("selectolax", "lxml", "bs4"):
+        if name in PARSERS:
+            return name
+    return "bs4"
+
+def parse_listing_page(
+    source: str,
+    html: str,
+    zip_code: str = "",
+    city: str = "",
+    state: str = "",
+    backend: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Parse one search results page into FSBOLead keyword arguments
+    
+    Args:
+        source: ZILLOW_SOURCE or CRAIGSLIST_SOURCE
+        backend: "selectolax", "lxml", "bs4" or "auto"
+    """
+    zillow_parser, craigslist_parser = PARSERS[resolve_backend(backend)]
+    try:
+        if source == ZILLOW_SOURCE:
+            return zillow_parser(html, zip_code)
+        return craigslist_parser(html, city, state)
+    except Exception as e:
+        print(f"Error parsing {source} page: {e}")
+        return []
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=settings.HUNTER_PARSE_WORKERS or None)
+    return _process_pool
+
+async def parse_listing_page_async(
+    source: str,
+    html: str,
+    zip_code: str = "",
+    city: str = "",
+    state: str = "",
+    backend: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    parse_listing_page without blocking the event loop on big pages
+    
+    Pages of HUNTER_PARSE_PROCESS_THRESHOLD_BYTES or more go to a process
+    pool (parsing holds the GIL, so threads wouldn't help); small pages are
+    cheaper to parse inline than to pickle across processes.
+    """
+    threshold = settings.HUNTER_PARSE_PROCESS_THRESHOLD_BYTES
+    if threshold <= 0 or len(html) < threshold:
+        return parse_listing_page(source, html, zip_code, city, state, backend)
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_process_pool(), parse_listing_page, source, html, zip_code, city, state, backend
+    )
+
+def shutdown_parse_pool() -> None:
+    """Stop the parser worker processes (call on app shutdown)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
@@ -0,0 +1,368 @@
+"""
+Skip Trace Enrichment
+Batched, cached owner lookups for Hunter leads
+
+Addresses are normalized and checked against skip_trace_cache first; only
+misses are sent to the provider, in bulk requests run concurrently under a
+limit. Results (including "not found") are cached per address, so the same
+owner is never paid for twice.
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.hunter import SkipTraceResult
+from app.services.address_normalizer import normalize_address, address_hash
+
+class SkipTraceProvider(ABC):
+    """
+    Bulk skip-trace API
+    
+    trace_batch receives a list of {"reference", "address", "city", "state", "zip"}
+    and returns {reference: {"owner_name", "phone", "email"} or None}.
+    """
+    
+    name = "base"
+    max_batch_size = 100
+    
+    @abstractmethod
+    async def trace_batch(
+        self,
+        client: httpx.AsyncClient,
+        addresses: List[Dict[str, Any]]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        pass
+
+class HTTPSkipTraceProvider(SkipTraceProvider):
+    """
+    Generic bulk endpoint: POST {api_url}/batch
+    
+    Request:  {"requests": [{"reference", "address", "city", "state", "zip"}, ...]}
+    Response: {"results": [{"reference", "owner_name", "phone", "email"}, ...]}
+    References missing from the response are treated as not found.
+    """
+    
+    name = "http"
+    
+    def __init__(self, api_url: str, api_key: str, max_batch_size: int = 100):
+        self.api_url = api_url.rstrip("/")
+        self.api_key = api_key
+        self.max_batch_size = max_batch_size
+    
+    async def trace_batch(self, client, addresses):
+        response = await client.post(
+            f"{self.api_url}/batch",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={"requests": addresses},
+            timeout=60.0
+        )
+        response.raise_for_status()
+        
+        results: Dict[str, Optional[Dict[str, Any]]] = {item["reference"]: None for item in addresses}
+        for item in response.json().get("results", []):
+            reference = item.get("reference")
+            if reference in results and (item.get("owner_name") or item.get("phone") or item.get("email")):
+                results[reference] = {
+                    "owner_name": item.get("owner_name"),
+                    "phone": item.get("phone"),
+                    "email": item.get("email")
+                }
+        return results
+
+class StubSkipTraceProvider(SkipTraceProvider):
+    """
+    Local stand-in for tests and benchmarks (no network, no spend)
+    
+    Returns a deterministic fake owner for hit_rate of addresses, after
+    latency_ms per batch. Counts calls so tests can assert on spend.
+    """
+    
+    name = "stub"
+    
+    def __init__(self, latency_ms: float = 0.0, hit_rate: float = 0.8, max_batch_size: int = 100):
+        self.latency_ms = latency_ms
+        self.hit_rate = hit_rate
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.addresses_traced = 0
+    
+    async def trace_batch(self, client, addresses):
+        self.batches += 1
+        self.addresses_traced += len(addresses)
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        
+        results = {}
+        for item in addresses:
+            seed = hashlib.sha1(f"{item['address']}|{item['zip']}".encode()).hexdigest()
+            rng = random.Random(seed)
+            if rng.random() >= self.hit_rate:
+                results[item["reference"]] = None
+                continue
+            results[item["reference"]] = {
+                "owner_name": f"Owner {seed[:6].upper()}",
+                "phone": f"512555{int(seed[6:10], 16) % 10000:04d}",
+                "email": f"owner.{seed[:8]}@example.com"
+            }
+        return results
+
+def build_provider() -> Optional[SkipTraceProvider]:
+    """Provider from settings; None when the HTTP provider has no API key"""
+    if settings.SKIP_TRACE_PROVIDER == "stub":
+        return StubSkipTraceProvider(max_batch_size=settings.SKIP_TRACE_BATCH_SIZE)
+    if not settings.SKIP_TRACE_API_KEY:
+        return None
+    return HTTPSkipTraceProvider(
+        settings.SKIP_TRACE_API_URL,
+        settings.SKIP_TRACE_API_KEY,
+        max_batch_size=settings.SKIP_TRACE_BATCH_SIZE
+    )
+
+class SkipTraceRunStats:
+    """Counters for one enrichment run"""
+    
+    def __init__(self):
+        self.leads = 0
+        self.unique_addresses = 0
+        self.cache_hits = 0
+        self.traced = 0
+        self.found = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            "leads": self.leads,
+            "unique_addresses": self.unique_addresses,
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": round(self.cache_hits / self.unique_addresses, 3) if self.unique_addresses else 0.0,
+            "traced": self.traced,
+            "found": self.found,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "elapsed_seconds": round(elapsed, 3),
+            "addresses_per_sec": round(self.unique_addresses / elapsed, 1) if elapsed else 0.0
+        }
+
+class SkipTraceEnricher:
+    """
+    Enrichment stage for FSBOLeads
+    
+    Usage:
+        leads = await skip_tracer.enrich(leads)
+        skip_tracer.last_run_stats.to_dict()
+    """
+    
+    def __init__(
+        self,
+        provider: Optional[SkipTraceProvider] = None,
+        max_concurrency: Optional[int] = None,
+        cache_ttl_days: Optional[int] = None,
+        negative_ttl_days: Optional[int] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self._provider = provider
+        self.max_concurrency = max_concurrency or settings.SKIP_TRACE_MAX_CONCURRENCY
+        self.cache_ttl = timedelta(days=cache_ttl_days or settings.SKIP_TRACE_CACHE_TTL_DAYS)
+        self.negative_ttl = timedelta(days=negative_ttl_days or settings.SKIP_TRACE_NEGATIVE_TTL_DAYS)
+        self.session_factory = session_factory
+        self.last_run_stats: Optional[SkipTraceRunStats] = None
+    
+    @property
+    def provider(self) -> Optional[SkipTraceProvider]:
+        # Resolved lazily so settings changes (and tests) take effect
+        return self._provider or build_provider()
+    
+    @provider.setter
+    def provider(self, provider: Optional[SkipTraceProvider]) -> None:
+        self._provider = provider
+    
+    # Cache
+    
+    def _load_cached(self, hashes: List[str]) -> Dict[str, SkipTraceResult]:
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            cached = {}
+            for start in range(0, len(hashes), 500):
+                rows = db.query(SkipTraceResult).filter(
+                    SkipTraceResult.address_hash.in_(hashes[start:start + 500])
+                ).all()
+                for row in rows:
+                    ttl = self.cache_ttl if row.found else self.negative_ttl
+                    if row.traced_at and row.traced_at + ttl > now:
+                        db.expunge(row)
+                        cached[row.address_hash] = row
+            return cached
+        finally:
+            db.close()
+    
+    def _save_results(self, results: Dict[str, Dict[str, Any]], provider_name: str) -> None:
+        """Upsert {address_hash: {"normalized", "result"}} into skip_trace_cache"""
+        if not results:
+            return
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            hashes = list(results)
+            existing = {}
+            for start in range(0, len(hashes), 500):
+                for row in db.query(SkipTraceResult).filter(
+                    SkipTraceResult.address_hash.in_(hashes[start:start + 500])
+                ).all():
+                    existing[row.address_hash] = row
+            
+            for key, entry in results.items():
+                result = entry["result"] or {}
+                row = existing.get(key)
+                if row is None:
+                    row = SkipTraceResult(address_hash=key, normalized_address=entry["normalized"])
+                    db.add(row)
+                row.found = entry["result"] is not None
+                row.owner_name = result.get("owner_name")
+                row.owner_phone = result.get("phone")
+                row.owner_email = result.get("email")
+                row.provider = provider_name
+                row.traced_at = now
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Could not cache skip trace results: {e}")
+        finally:
+            db.close()
+    
+    # Enrichment
+    
+    async def enrich(self, leads: List[Any], stats: Optional[SkipTraceRunStats] = None) -> List[Any]:
+        """
+        Fill owner_name / owner_phone / owner_email on each lead in place
+        
+        Leads sharing an address are traced once. Each batch is cached as soon
+        as it returns, so traces already paid for survive a crash or cancel
+        later in the run. Failed batches leave their leads unenriched and
+        uncached, so the next run retries them.
+        
+        Args:
+            stats: Accumulate into an existing run's stats (used by enrich_stream)
+        """
+        stats = stats or SkipTraceRunStats()
+        self.last_run_stats = stats
+        stats.leads += len(leads)
+        
+        provider = self.provider
+        if provider is None:
+            print("Skip trace API key not configured")
+            stats.finished_at = time.perf_counter()
+            return leads
+        
+        by_hash: Dict[str, List[Any]] = {}
+        requests: Dict[str, Dict[str, Any]] = {}
+        for lead in leads:
+            key = address_hash(lead.address, lead.city, lead.state, lead.zip_code)
+            by_hash.setdefault(key, []).append(lead)
+            if key not in requests:
+                requests[key] = {
+                    "reference": key,
+                    "address": lead.address,
+                    "city": lead.city,
+                    "state": lead.state,
+                    "zip": lead.zip_code,
+                    "normalized": normalize_address(lead.address, lead.city, lead.state, lead.zip_code)
+                }
+        stats.unique_addresses += len(requests)
+        
+        cached = await asyncio.to_thread(self._load_cached, list(requests))
+        stats.cache_hits += len(cached)
+        for key, row in cached.items():
+            if row.found:
+                self._apply(by_hash[key], {
+                    "owner_name": row.owner_name,
+                    "phone": row.owner_phone,
+                    "email": row.owner_email
+                })
+                stats.found += 1
+        
+        misses = [
+            {k: v for k, v in request.items() if k != "normalized"}
+            for key, request in requests.items() if key not in cached
+        ]
+        batch_size = max(1, provider.max_batch_size)
+        batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        save_lock = asyncio.Lock()  # One cache writer at a time (SQLite allows a single writer)
+        
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_concurrency)
+        ) as client:
+            
+            async def run_batch(batch: List[Dict[str, Any]]) -> None:
+                async with semaphore:
+                    stats.batches += 1
+                    try:
+                        results = await provider.trace_batch(client, batch)
+                    except Exception as e:
+                        stats.failed_batches += 1
+                        print(f"Skip trace batch failed ({len(batch)} addresses): {e}")
+                        return
+                
+                stats.traced += len(batch)
+                traced = {}
+                for item in batch:
+                    key = item["reference"]
+                    result = results.get(key)
+                    if result:
+                        self._apply(by_hash[key], result)
+                        stats.found += 1
+                    traced[key] = {"normalized": requests[key]["normalized"], "result": result}
+                
+                # Outside the semaphore, so a slow write doesn't hold up the next API call
+                async with save_lock:
+                    await asyncio.to_thread(self._save_results, traced, provider.name)
+            
+            await asyncio.gather(*[run_batch(batch) for batch in batches])
+        
+        stats.finished_at = time.perf_counter()
+        return leads
+    
+    async def enrich_stream(
+        self,
+        leads: AsyncIterator[Any],
+        batch_size: int = 200,
+        stats: Optional[SkipTraceRunStats] = None
+    ) -> AsyncIterator[Any]:
+        """Enrich a lead stream (e.g. crawl_new) in chunks, yielding leads as each chunk finishes"""
+        stats = stats or SkipTraceRunStats()
+        chunk = []
+        async for lead in leads:
+            chunk.append(lead)
+            if len(chunk) >= batch_size:
+                for enriched in await self.enrich(chunk, stats):
+                    yield enriched
+                chunk = []
+        if chunk:
+            for enriched in await self.enrich(chunk, stats):
+                yield enriched
+        self.last_run_stats = stats
+    
+    @staticmethod
+    def _apply(leads: List[Any], result: Dict[str, Any]) -> None:
+        for lead in leads:
+            lead.owner_name = result.get("owner_name") or lead.owner_name
+            lead.owner_phone = result.get("phone") or lead.owner_phone
+            lead.owner_email = result.get("email") or lead.owner_email
+
+# Singleton instance
+skip_tracer = SkipTraceEnricher()
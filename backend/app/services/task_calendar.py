@@ -0,0 +1,109 @@
+"""
+Task Calendar Invites
+One shared Google Calendar event per assigned task
+
+When a task with a due date is assigned, the creator's calendar gets a single
+event with every assignee invited, instead of one event per person. Later
+assignments to the same task add attendees to that event with one PATCH.
+Needs the creator to have connected Google with a calendar scope; otherwise
+the task is left alone. Runs as a background task after the response, with
+the database work and any token refresh in worker threads; calendar_sync.py
+pulls the attendees' responses back.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.team_simple import Task, TaskAssignment
+from app.services.calendar_sync import calendar_sync, calendar_credentials, CALENDAR_ID
+
+EVENT_DURATION = timedelta(minutes=30)
+
+def _attendee_emails(db: Session, task_id: int) -> List[str]:
+    """Emails of everyone assigned to the task who hasn't declined (one query)"""
+    rows = db.query(User.email).join(
+        TaskAssignment, TaskAssignment.assignee_id == User.id
+    ).filter(
+        TaskAssignment.task_id == task_id,
+        TaskAssignment.status != "declined"
+    ).order_by(TaskAssignment.id).all()
+    return [row.email for row in rows if row.email]
+
+def _load_invite(task_id: int) -> Optional[Dict[str, Any]]:
+    """Everything the invite needs, or None if the task has nothing to send (DB and token refresh; blocking)"""
+    db = SessionLocal()
+    try:
+        task = db.query(Task).filter(Task.id == task_id).first()
+        if not task or not task.due_date:
+            return None
+        token = calendar_credentials(db, task.creator_id)
+        if not token:
+            return None
+        emails = _attendee_emails(db, task_id)
+        if not emails:
+            return None
+        return {
+            "creator_id": task.creator_id,
+            "access_token": token.access_token,
+            "event_id": task.google_calendar_event_id,
+            "title": task.title,
+            "description": task.description or "",
+            "due_date": task.due_date,
+            "emails": emails
+        }
+    finally:
+        db.close()
+
+def _save_event_id(task_id: int, event_id: str) -> None:
+    db = SessionLocal()
+    try:
+        db.query(Task).filter(Task.id == task_id).update(
+            {"google_calendar_event_id": event_id}, synchronize_session=False
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def sync_task_invites(task_id: int) -> None:
+    """Create or update the task's shared event so all current assignees are invited"""
+    try:
+        # Queries and a possible token refresh block, so they run off the event loop
+        invite = await asyncio.to_thread(_load_invite, task_id)
+        if not invite:
+            return
+        emails = invite["emails"]
+        
+        calendar = calendar_sync.calendar(invite["creator_id"], invite["access_token"])
+        if invite["event_id"]:
+            result = await calendar.update_event(
+                CALENDAR_ID,
+                invite["event_id"],
+                {"attendees": [{"email": email} for email in emails]},
+                send_notifications=True
+            )
+        else:
+            result = await calendar.create_event(
+                CALENDAR_ID,
+                title=invite["title"],
+                description=invite["description"],
+                start_time=invite["due_date"],
+                end_time=invite["due_date"] + EVENT_DURATION,
+                attendees=emails
+            )
+            if result.get("success"):
+                await asyncio.to_thread(_save_event_id, task_id, result["event"]["id"])
+        
+        if result.get("success"):
+            print(f"📅 Task {task_id} calendar invite sent to {len(emails)} assignees")
+        else:
+            print(f"⚠️ Task {task_id} calendar invite failed: {result.get('error')}")
+    except Exception as e:
+        print(f"⚠️ Task {task_id} calendar sync error: {e}")
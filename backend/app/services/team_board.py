@@ -0,0 +1,64 @@
+"""
+Team Lead Board
+Read-optimized projection of every lead across a team
+
+The board selects only the columns a lead card shows (no notes, property
+preferences or CRM fields) and pages newest first by id, so each page is one
+index-driven query however many leads the team has. Filters are the same as
+bulk assignment's: assignee (or unassigned only), status and tag. Composite
+indexes on (user_id, assigned_to, status) and (assigned_to, status, id)
+cover the two halves of the team scope (leads owned by a member, leads
+assigned to one).
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.leads import Lead
+from app.services.lead_assignment import lead_criteria
+
+BOARD_COLUMNS = (
+    Lead.id,
+    Lead.first_name,
+    Lead.last_name,
+    Lead.email,
+    Lead.phone,
+    Lead.status,
+    Lead.tags,
+    Lead.user_id,
+    Lead.assigned_to,
+    Lead.assigned_at,
+    Lead.last_contact_at,
+    Lead.created_at
+)
+
+def _card(row) -> Dict[str, Any]:
+    card = row._asdict()
+    card["tags"] = card["tags"] or []
+    for key in ("assigned_at", "last_contact_at", "created_at"):
+        card[key] = card[key].isoformat() if card[key] else None
+    return card
+
+def page(
+    db: Session,
+    team_id: int,
+    limit: int = 50,
+    before: Optional[int] = None,
+    **filters
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Newest-first page of the team's leads
+    
+    filters are lead_criteria's (current_assignee_id, unassigned_only, tag,
+    status). Returns (leads, next_cursor); pass next_cursor back as before=.
+    """
+    limit = max(1, min(limit, settings.TEAM_LEADS_PAGE_MAX))
+    query = db.query(*BOARD_COLUMNS).filter(*lead_criteria(db, team_id, **filters))
+    if before is not None:
+        query = query.filter(Lead.id < before)
+    rows = query.order_by(Lead.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return [_card(row) for row in rows[:limit]], next_cursor
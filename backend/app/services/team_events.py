@@ -0,0 +1,257 @@
+"""
+Team Events
+Append-only team activity feed with keyset paging and live updates
+
+Routes write a team_events row in the same transaction as the change
+(lead assignment, task completion, lead status change), with the message
+already rendered, so a page of the feed is one indexed range read on
+(team_id, id) with no per-row user / task lookups. Pages go newest first and
+continue from the last id seen, so page N costs the same as page 1.
+
+Live updates: after committing, routes call notify(team_id) to wake that
+team's SSE streams in this process; streams also poll every
+TEAM_EVENTS_POLL_SECONDS so events written by other workers still arrive.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.leads import Lead
+from app.models.team_simple import TeamEvent, Task, TaskAssignment
+
+def display_name(user: Optional[User]) -> Optional[str]:
+    if user is None:
+        return None
+    return user.full_name or user.email
+
+def lead_name(lead: Lead) -> str:
+    return " ".join(part for part in (lead.first_name, lead.last_name) if part) or f"Lead #{lead.id}"
+
+# Writing (caller commits)
+
+def record(db: Session, team_id: Optional[int], event_type: str, message: str, **fields) -> Optional[TeamEvent]:
+    """Add one event to db's transaction; events without a team are dropped"""
+    if team_id is None:
+        return None
+    event = TeamEvent(team_id=team_id, event_type=event_type, message=message, **fields)
+    db.add(event)
+    return event
+
+def record_leads_assigned(db: Session, leads: List[Lead], assignee: User, actor_id: Optional[int] = None) -> None:
+    name = display_name(assignee)
+    now = datetime.utcnow()
+    for lead in leads:
+        record(
+            db, assignee.team_id, "lead_assigned",
+            f"{name} was assigned lead: {lead_name(lead)}",
+            user_id=assignee.id,
+            actor_id=actor_id,
+            lead_id=lead.id,
+            user_name=name,
+            created_at=now
+        )
+
+def record_task_completed(db: Session, assignment: TaskAssignment, assignee: User, task: Optional[Task]) -> None:
+    name = display_name(assignee)
+    title = task.title if task else f"Task #{assignment.task_id}"
+    record(
+        db, assignee.team_id, "task_completed",
+        f"{name} completed task: {title}",
+        user_id=assignee.id,
+        actor_id=assignee.id,
+        task_id=assignment.task_id,
+        user_name=name,
+        data={"assignment_id": assignment.id}
+    )
+
+def record_lead_status_changed(
+    db: Session,
+    lead: Lead,
+    old_status: Optional[str],
+    new_status: Optional[str],
+    actor: User
+) -> Optional[TeamEvent]:
+    """Logged on the team of the lead's assignee, or the actor's team if unassigned"""
+    if old_status == new_status:
+        return None
+    team_id = actor.team_id
+    if lead.assigned_to and lead.assigned_to != actor.id:
+        team_id = db.query(User.team_id).filter(User.id == lead.assigned_to).scalar()
+    name = display_name(actor)
+    return record(
+        db, team_id, "lead_status_changed",
+        f"{name} moved lead {lead_name(lead)} from {old_status or 'none'} to {new_status}",
+        user_id=lead.assigned_to or actor.id,
+        actor_id=actor.id,
+        lead_id=lead.id,
+        user_name=name,
+        data={"from": old_status, "to": new_status}
+    )
+
+# Reading
+
+def page(db: Session, team_id: int, limit: int = 20, before: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Newest-first page of a team's feed
+    
+    Returns (events, next_cursor); pass next_cursor back as before= for the
+    following page. next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, settings.TEAM_EVENTS_PAGE_MAX))
+    query = db.query(TeamEvent).filter(TeamEvent.team_id == team_id)
+    if before is not None:
+        query = query.filter(TeamEvent.id < before)
+    rows = query.order_by(TeamEvent.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return [row.to_dict() for row in rows[:limit]], next_cursor
+
+def events_after(team_id: int, after: int, limit: int) -> List[Dict[str, Any]]:
+    """Oldest-first events newer than after (own session; run in a thread)"""
+    db = SessionLocal()
+    try:
+        rows = db.query(TeamEvent).filter(
+            TeamEvent.team_id == team_id,
+            TeamEvent.id > after
+        ).order_by(TeamEvent.id).limit(limit).all()
+        return [row.to_dict() for row in rows]
+    finally:
+        db.close()
+
+def latest_id(team_id: int) -> int:
+    db = SessionLocal()
+    try:
+        row = db.query(TeamEvent.id).filter(TeamEvent.team_id == team_id).order_by(TeamEvent.id.desc()).first()
+        return row[0] if row else 0
+    finally:
+        db.close()
+
+# Live updates
+
+class TeamEventBus:
+    """
+    Wakes a team's SSE streams in this process when it gets new events
+    
+    notify() is safe to call from worker threads (webhook / push writers).
+    """
+    
+    def __init__(self):
+        self._listeners: Dict[int, set] = {}
+    
+    def notify(self, *team_ids: Optional[int]) -> None:
+        for team_id in team_ids:
+            for loop, wakeup in list(self._listeners.get(team_id, ())):
+                loop.call_soon_threadsafe(wakeup.set)
+    
+    async def stream(self, team_id: int, after: Optional[int] = None) -> AsyncIterator[Tuple[str, Any, str]]:
+        """
+        ("activity", event, id) for every new event, oldest first
+        
+        Starts after the given id (e.g. the SSE Last-Event-ID), or at the
+        newest event if None.
+        """
+        if after is None:
+            after = await asyncio.to_thread(latest_id, team_id)
+        wakeup = asyncio.Event()
+        listener = (asyncio.get_running_loop(), wakeup)
+        self._listeners.setdefault(team_id, set()).add(listener)
+        try:
+            while True:
+                wakeup.clear()
+                while True:
+                    events = await asyncio.to_thread(
+                        events_after, team_id, after, settings.TEAM_EVENTS_PAGE_MAX
+                    )
+                    for event in events:
+                        after = event["id"]
+                        yield "activity", event, str(event["id"])
+                    if len(events) < settings.TEAM_EVENTS_PAGE_MAX:
+                        break
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=settings.TEAM_EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            listeners = self._listeners.get(team_id)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del self._listeners[team_id]
+
+def backfill() -> int:
+    """
+    Seed an empty team_events from existing assignments and completions
+    
+    Runs once, on the first startup after the table is added; returns the
+    number of events written.
+    """
+    db = SessionLocal()
+    try:
+        return _backfill(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def _backfill(db: Session) -> int:
+    if db.query(TeamEvent.id).first() is not None:
+        return 0
+    
+    events = []
+    for lead, assignee in db.query(Lead, User).join(
+        User, User.id == Lead.assigned_to
+    ).filter(
+        User.team_id.isnot(None),
+        Lead.assigned_at.isnot(None)
+    ):
+        name = display_name(assignee)
+        events.append({
+            "team_id": assignee.team_id,
+            "event_type": "lead_assigned",
+            "message": f"{name} was assigned lead: {lead_name(lead)}",
+            "user_id": assignee.id,
+            "lead_id": lead.id,
+            "user_name": name,
+            "created_at": lead.assigned_at
+        })
+    
+    for assignment, title, assignee in db.query(TaskAssignment, Task.title, User).join(
+        User, User.id == TaskAssignment.assignee_id
+    ).outerjoin(
+        Task, Task.id == TaskAssignment.task_id
+    ).filter(
+        User.team_id.isnot(None),
+        TaskAssignment.status == "completed",
+        TaskAssignment.completed_at.isnot(None)
+    ):
+        name = display_name(assignee)
+        events.append({
+            "team_id": assignee.team_id,
+            "event_type": "task_completed",
+            "message": f"{name} completed task: {title or f'Task #{assignment.task_id}'}",
+            "user_id": assignee.id,
+            "actor_id": assignee.id,
+            "task_id": assignment.task_id,
+            "user_name": name,
+            "data": {"assignment_id": assignment.id},
+            "created_at": assignment.completed_at
+        })
+    
+    if not events:
+        return 0
+    # Insert oldest first so id order matches time order
+    events.sort(key=lambda event: event["created_at"])
+    db.bulk_insert_mappings(TeamEvent, events)
+    db.commit()
+    print(f"✅ Backfilled {len(events)} team events")
+    return len(events)
+
+# Singleton instance
+team_event_bus = TeamEventBus()
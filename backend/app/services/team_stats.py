@@ -0,0 +1,379 @@
+"""
+Team Stats
+Per-member performance and the team_stats dashboard rollup
+
+Lead and task counts are aggregated with GROUP BY on leads.assigned_to and
+task_assignments.assignee_id (both indexed) and joined to the team's
+members, so the cost no longer grows with the number of agents. Results are
+cached per team for TEAM_STATS_CACHE_TTL_SECONDS; routes that assign leads
+or change task status call invalidate_team() so leaders see changes at once.
+
+The dashboard counters live in team_stats, one row per team. Routes apply
+deltas to it in the same transaction as the change itself (record_*), so
+the dashboard is a single row read. TeamStatsReconciler recounts every team
+on an interval and repairs any drift from writes that bypass the routes.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable
+
+from sqlalchemy import func, case, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.leads import Lead
+from app.models.team_simple import Team, TeamStats, Task, TaskAssignment
+
+COUNTERS = ("member_count", "total_tasks", "pending_tasks", "completed_tasks", "total_leads")
+
+_performance_cache = TTLCache(ttl_seconds=settings.TEAM_STATS_CACHE_TTL_SECONDS, max_entries=1024)
+
+def compute_team_performance(db: Session, team_id: int) -> List[Dict[str, Any]]:
+    """One row per team member: assigned leads, completed and pending tasks"""
+    member_ids = db.query(User.id).filter(User.team_id == team_id)
+    
+    lead_counts = db.query(
+        Lead.assigned_to.label("user_id"),
+        func.count(Lead.id).label("assigned_leads")
+    ).filter(
+        Lead.assigned_to.in_(member_ids)
+    ).group_by(Lead.assigned_to).subquery()
+    
+    task_counts = db.query(
+        TaskAssignment.assignee_id.label("user_id"),
+        func.sum(case((TaskAssignment.status == "completed", 1), else_=0)).label("completed_tasks"),
+        func.sum(case((TaskAssignment.status == "pending", 1), else_=0)).label("pending_tasks")
+    ).filter(
+        TaskAssignment.assignee_id.in_(member_ids),
+        TaskAssignment.status.in_(("completed", "pending"))
+    ).group_by(TaskAssignment.assignee_id).subquery()
+    
+    rows = db.query(
+        User.id,
+        User.full_name,
+        User.email,
+        User.is_team_leader,
+        func.coalesce(lead_counts.c.assigned_leads, 0),
+        func.coalesce(task_counts.c.completed_tasks, 0),
+        func.coalesce(task_counts.c.pending_tasks, 0)
+    ).outerjoin(
+        lead_counts, lead_counts.c.user_id == User.id
+    ).outerjoin(
+        task_counts, task_counts.c.user_id == User.id
+    ).filter(
+        User.team_id == team_id
+    ).order_by(User.id).all()
+    
+    return [
+        {
+            'user_id': user_id,
+            'name': full_name or email,
+            'email': email,
+            'is_leader': is_leader,
+            'assigned_leads': int(assigned_leads),
+            'completed_tasks': int(completed_tasks),
+            'pending_tasks': int(pending_tasks)
+        }
+        for user_id, full_name, email, is_leader, assigned_leads, completed_tasks, pending_tasks in rows
+    ]
+
+def get_team_performance(db: Session, team_id: int) -> List[Dict[str, Any]]:
+    """compute_team_performance, served from the per-team cache when fresh"""
+    cached = _performance_cache.get(team_id)
+    if cached is not None:
+        return cached
+    
+    performance = compute_team_performance(db, team_id)
+    _performance_cache.set(team_id, performance)
+    return performance
+
+def invalidate_team(*team_ids: Optional[int]) -> None:
+    """Drop cached stats after an assignment or status change (None ids are ignored)"""
+    for team_id in set(team_ids):
+        if team_id is not None:
+            _performance_cache.invalidate(team_id)
+
+def team_stats_cache_stats() -> Dict[str, Any]:
+    return _performance_cache.stats()
+
+# Dashboard rollup
+
+def count_team_stats(db: Session, team_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, int]]:
+    """
+    Recount the rollup from the source tables (every team, or just team_ids)
+    
+    Four grouped queries however many teams there are; used to seed missing
+    rows and by the reconciler.
+    """
+    team_query = db.query(Team.id)
+    if team_ids is not None:
+        team_query = team_query.filter(Team.id.in_(list(team_ids)))
+    counts = {team_id: dict.fromkeys(COUNTERS, 0) for (team_id,) in team_query.all()}
+    if not counts:
+        return counts
+    ids = list(counts)
+    
+    for team_id, members in db.query(User.team_id, func.count(User.id)).filter(
+        User.team_id.in_(ids)
+    ).group_by(User.team_id):
+        counts[team_id]["member_count"] = members
+    
+    for team_id, tasks in db.query(Task.team_id, func.count(Task.id)).filter(
+        Task.team_id.in_(ids)
+    ).group_by(Task.team_id):
+        counts[team_id]["total_tasks"] = tasks
+    
+    for team_id, pending, completed in db.query(
+        Task.team_id,
+        func.sum(case((TaskAssignment.status == "pending", 1), else_=0)),
+        func.sum(case((TaskAssignment.status == "completed", 1), else_=0))
+    ).join(
+        TaskAssignment, TaskAssignment.task_id == Task.id
+    ).filter(
+        Task.team_id.in_(ids),
+        TaskAssignment.status.in_(("pending", "completed"))
+    ).group_by(Task.team_id):
+        counts[team_id]["pending_tasks"] = int(pending or 0)
+        counts[team_id]["completed_tasks"] = int(completed or 0)
+    
+    for team_id, leads in db.query(User.team_id, func.count(Lead.id)).join(
+        Lead, Lead.assigned_to == User.id
+    ).filter(
+        User.team_id.in_(ids)
+    ).group_by(User.team_id):
+        counts[team_id]["total_leads"] = leads
+    
+    return counts
+
+def _ensure_rows(team_ids: Iterable[int]) -> None:
+    """
+    Seed missing team_stats rows from a fresh count, in their own transaction
+    
+    Called before the caller's change is flushed, so the count doesn't
+    include it and the caller's delta still applies on top.
+    """
+    team_ids = set(team_ids)
+    if not team_ids:
+        return
+    db = SessionLocal()
+    try:
+        existing = {team_id for (team_id,) in db.query(TeamStats.team_id).filter(TeamStats.team_id.in_(team_ids))}
+        missing = team_ids - existing
+        if not missing:
+            return
+        now = datetime.utcnow()
+        for team_id, counts in count_team_stats(db, missing).items():
+            db.add(TeamStats(team_id=team_id, reconciled_at=now, **counts))
+        db.commit()
+    except IntegrityError:
+        # Another request seeded the same row first
+        db.rollback()
+    finally:
+        db.close()
+
+def prepare(*team_ids: Optional[int]) -> None:
+    """
+    Seed team_stats rows ahead of a write whose deltas are only known after it runs
+    
+    record() seeds them itself, but must then be called before the caller's
+    first write; call this first when the counts come from the write (e.g.
+    INSERT ... RETURNING).
+    """
+    _ensure_rows(team_id for team_id in team_ids if team_id is not None)
+
+def record(db: Session, deltas: Dict[Optional[int], Dict[str, int]]) -> None:
+    """
+    Apply {team_id: {counter: delta}} to team_stats as part of db's transaction
+    
+    Each counter is bumped with UPDATE ... SET n = n + delta, so concurrent
+    changes don't overwrite each other. Nothing is committed here.
+    """
+    deltas = {
+        team_id: {counter: delta for counter, delta in changes.items() if delta}
+        for team_id, changes in deltas.items()
+        if team_id is not None
+    }
+    deltas = {team_id: changes for team_id, changes in deltas.items() if changes}
+    if not deltas:
+        return
+    
+    _ensure_rows(deltas)
+    now = datetime.utcnow()
+    for team_id, changes in deltas.items():
+        db.execute(
+            update(TeamStats).where(TeamStats.team_id == team_id).values(
+                updated_at=now,
+                **{counter: getattr(TeamStats, counter) + delta for counter, delta in changes.items()}
+            )
+        )
+
+def status_deltas(old_status: Optional[str], new_status: Optional[str]) -> Dict[str, int]:
+    """Counter changes for a task assignment moving between statuses"""
+    deltas = {"pending_tasks": 0, "completed_tasks": 0}
+    for status, sign in ((old_status, -1), (new_status, 1)):
+        if status == "pending":
+            deltas["pending_tasks"] += sign
+        elif status == "completed":
+            deltas["completed_tasks"] += sign
+    return deltas
+
+def record_member_moved(db: Session, user_id: int, old_team_id: Optional[int], new_team_id: Optional[int]) -> None:
+    """A user changed teams: their membership and assigned leads move with them"""
+    if old_team_id == new_team_id:
+        return
+    assigned = db.query(func.count(Lead.id)).filter(Lead.assigned_to == user_id).scalar() or 0
+    record(db, {
+        old_team_id: {"member_count": -1, "total_leads": -assigned},
+        new_team_id: {"member_count": 1, "total_leads": assigned}
+    })
+
+def record_leads_reassigned(db: Session, previous_assignees: List[Optional[int]], new_assignee_id: int) -> None:
+    """
+    Leads moved to new_assignee_id; previous_assignees has one entry per lead
+    
+    Leads count toward the team of whoever they're assigned to.
+    """
+    user_ids = {user_id for user_id in previous_assignees if user_id is not None} | {new_assignee_id}
+    teams = dict(db.query(User.id, User.team_id).filter(User.id.in_(user_ids)).all())
+    
+    deltas: Dict[Optional[int], Dict[str, int]] = {}
+    
+    def bump(team_id: Optional[int], delta: int) -> None:
+        changes = deltas.setdefault(team_id, {"total_leads": 0})
+        changes["total_leads"] += delta
+    
+    for user_id in previous_assignees:
+        if user_id == new_assignee_id:
+            continue
+        if user_id is not None:
+            bump(teams.get(user_id), -1)
+        bump(teams.get(new_assignee_id), 1)
+    record(db, deltas)
+
+def get_team_stats(db: Session, team_id: int) -> Optional[tuple]:
+    """(Team, TeamStats) in one read, seeding the rollup row on first use"""
+    row = db.query(Team, TeamStats).outerjoin(
+        TeamStats, TeamStats.team_id == Team.id
+    ).filter(Team.id == team_id).first()
+    if row is None or row[1] is not None:
+        return row
+    
+    _ensure_rows([team_id])
+    return db.query(Team, TeamStats).join(
+        TeamStats, TeamStats.team_id == Team.id
+    ).filter(Team.id == team_id).first()
+
+def reconcile(db: Session, team_ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+    """
+    Recount team_stats and overwrite rows that drifted (or are missing)
+    
+    The rows are locked (UPDATE, then SELECT ... FOR UPDATE) before the
+    recount and held until the commit: a record() already in flight commits
+    first and is counted, later ones wait and apply their delta on top.
+    Returns {"teams": checked, "repaired": {team_id: {counter: [stored, actual]}}}.
+    """
+    team_query = db.query(Team.id)
+    if team_ids is not None:
+        team_query = team_query.filter(Team.id.in_(list(team_ids)))
+    ids = [team_id for (team_id,) in team_query.all()]
+    if not ids:
+        return {"teams": 0, "repaired": {}}
+    
+    existing = {team_id for (team_id,) in db.query(TeamStats.team_id).filter(TeamStats.team_id.in_(ids))}
+    missing = set(ids) - existing
+    _ensure_rows(missing)
+    
+    now = datetime.utcnow()
+    db.execute(
+        update(TeamStats).where(TeamStats.team_id.in_(ids)).values(reconciled_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    stored = {
+        row.team_id: row
+        for row in db.query(TeamStats).filter(TeamStats.team_id.in_(ids)).with_for_update()
+    }
+    actual = count_team_stats(db, ids)
+    
+    repaired: Dict[int, Dict[str, list]] = {}
+    for team_id, counts in actual.items():
+        row = stored.get(team_id)
+        if row is None:
+            continue
+        if team_id in missing:
+            repaired[team_id] = {counter: [None, value] for counter, value in counts.items()}
+        else:
+            drift = {
+                counter: [getattr(row, counter), value]
+                for counter, value in counts.items()
+                if getattr(row, counter) != value
+            }
+            if drift:
+                repaired[team_id] = drift
+        for counter, value in counts.items():
+            setattr(row, counter, value)
+    db.commit()
+    
+    return {"teams": len(actual), "repaired": repaired}
+
+class TeamStatsReconciler:
+    """
+    Periodic team_stats recount (started from the app lifespan)
+    
+    Catches drift from writes that don't go through the team routes, such
+    as a lead deleted or reassigned elsewhere.
+    """
+    
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.last_result: Optional[Dict[str, Any]] = None
+    
+    def start(self) -> None:
+        if settings.TEAM_STATS_RECONCILE_INTERVAL_MINUTES <= 0:
+            return
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._loop())
+        print(f"🧮 Team stats reconciler started (every {settings.TEAM_STATS_RECONCILE_INTERVAL_MINUTES} min)")
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run()
+            except Exception as e:
+                print(f"❌ Team stats reconcile failed: {e}")
+            await asyncio.sleep(settings.TEAM_STATS_RECONCILE_INTERVAL_MINUTES * 60)
+    
+    async def run(self, team_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        result = await asyncio.to_thread(self._run, team_ids)
+        self.last_result = result
+        if result["repaired"]:
+            print(f"🧮 Team stats: repaired drift on {len(result['repaired'])} of {result['teams']} teams")
+        return result
+    
+    @staticmethod
+    def _run(team_ids: Optional[List[int]]) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            return reconcile(db, team_ids)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+# Singleton instance
+team_stats_reconciler = TeamStatsReconciler()
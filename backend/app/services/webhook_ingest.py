@@ -0,0 +1,326 @@
+"""
+Webhook Ingestion Pipeline
+Buffers incoming lead webhooks and writes them to the leads table in batches
+
+Request path (fast):  verify signature -> idempotency check -> enqueue -> 202
+Background flusher:   every N records or M milliseconds, bulk-upsert into leads
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import insert, func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.leads import Lead, normalize_status
+from app.services.lead_routing import lead_router
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Check an HMAC-SHA256 signature of the raw request body
+    
+    Accepts either the bare hex digest or "sha256=<hex>" (GitHub/Zapier style).
+    """
+    if not signature:
+        return False
+    if signature.startswith("sha256="):
+        signature = signature[len("sha256="):]
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+def user_webhook_secret(user_id: int, secret: str) -> str:
+    """
+    Per-user signing key, derived from WEBHOOK_SECRET
+    
+    A webhook signed with it can only create leads for that user, so the
+    user_id in the URL can't be swapped for someone else's.
+    """
+    return hmac.new(secret.encode(), f"webhook-user:{user_id}".encode(), hashlib.sha256).hexdigest()
+
+def map_webhook_lead(data: Dict[str, Any], user_id: int) -> Dict[str, Any]:
+    """Map a BoldTrail/Zapier payload to leads table columns"""
+    tags = data.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(",") if t.strip()]
+    
+    email = data.get("email")
+    return {
+        "user_id": user_id,
+        "first_name": data.get("first_name") or data.get("firstName"),
+        "last_name": data.get("last_name") or data.get("lastName"),
+        "email": email.strip().lower() if email else None,
+        "phone": data.get("phone") or data.get("phoneNumber"),
+        "status": normalize_status(data.get("status")),  # None keeps an existing lead's status
+        "tags": tags,
+        "source": "BoldTrail (Zapier)",
+        "imported_from": "Webhook",
+        "imported_by": user_id
+    }
+
+def upsert_leads(leads: List[Dict[str, Any]]) -> Tuple[List[int], int]:
+    """
+    Bulk-upsert lead column dicts into leads; returns (inserted ids, updated count)
+    
+    Existing leads are matched on (user_id, lower(email)) with one SELECT; the rest
+    are inserted with one multi-row INSERT. Leads without an email are
+    always inserted. Later duplicates in the same batch win.
+    """
+    by_key: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    without_email: List[Dict[str, Any]] = []
+    for lead in leads:
+        if lead.get("email"):
+            by_key[(lead["user_id"], lead["email"])] = lead
+        else:
+            without_email.append(lead)
+    
+    db = SessionLocal()
+    try:
+        existing: Dict[Tuple[int, str], int] = {}
+        if by_key:
+            user_ids = {user_id for user_id, _ in by_key}
+            emails = {email for _, email in by_key}
+            # Stored emails may be mixed case; incoming ones are lowercased
+            email_key = func.lower(Lead.email)
+            rows = db.query(Lead.id, Lead.user_id, email_key.label("email_key")).filter(
+                Lead.user_id.in_(user_ids),
+                email_key.in_(emails)
+            ).order_by(Lead.id).all()
+            existing = {}
+            for row in rows:
+                existing.setdefault((row.user_id, row.email_key), row.id)
+        
+        now = datetime.utcnow()
+        updates = []
+        inserts = list(without_email)
+        for key, lead in by_key.items():
+            if key in existing:
+                update = {
+                    k: v for k, v in lead.items()
+                    if v not in (None, []) and k not in ("imported_from", "imported_by")
+                }
+                update["id"] = existing[key]
+                update["updated_at"] = now
+                updates.append(update)
+            else:
+                inserts.append(lead)
+        
+        for lead in inserts:
+            lead["status"] = lead.get("status") or "New"
+            lead.setdefault("created_at", now)
+            lead.setdefault("updated_at", now)
+        
+        if updates:
+            db.bulk_update_mappings(Lead, updates)
+        inserted_ids = []
+        if inserts:
+            inserted_ids = list(db.scalars(
+                insert(Lead).returning(Lead.id, sort_by_parameter_order=True), inserts
+            ).all())
+        db.commit()
+        return inserted_ids, len(updates)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+class IdempotencySet:
+    """Bounded set of recently seen idempotency keys (oldest evicted first)"""
+    
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+    
+    def add(self, key: str) -> bool:
+        """Record a key; returns False if it was already seen"""
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return True
+    
+    def discard(self, key: str) -> None:
+        self._keys.pop(key, None)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
+class WebhookIngestor:
+    """
+    In-memory queue of webhook leads with a background batch flusher
+    
+    Records are (enqueued_at, idempotency_key, lead_columns). The flusher
+    wakes when flush_max_records are waiting or flush_interval_ms has
+    passed since the oldest record arrived, whichever comes first.
+    """
+    
+    def __init__(
+        self,
+        flush_max_records: int = 500,
+        flush_interval_ms: int = 1000,
+        max_queue: int = 50_000,
+        max_retries: int = 3
+    ):
+        self.flush_max_records = flush_max_records
+        self.flush_interval_ms = flush_interval_ms
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        
+        self._queue: deque = deque()
+        self._seen = IdempotencySet()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._retries = 0
+        
+        self.metrics = {
+            "received": 0,
+            "duplicates": 0,
+            "rejected_full": 0,
+            "flushed": 0,
+            "inserted": 0,
+            "updated": 0,
+            "flush_batches": 0,
+            "flush_failures": 0,
+            "dropped": 0,
+            "last_flush_ms": 0.0,
+            "last_flush_at": None
+        }
+    
+    # Request path
+    
+    def enqueue(self, idempotency_key: str, lead: Dict[str, Any]) -> str:
+        """
+        Queue one lead for the next flush
+        
+        Returns:
+            "queued", "duplicate", or "full" (caller should answer 503)
+        """
+        if len(self._queue) >= self.max_queue:
+            self.metrics["rejected_full"] += 1
+            return "full"
+        
+        if not self._seen.add(idempotency_key):
+            self.metrics["duplicates"] += 1
+            return "duplicate"
+        
+        self._queue.append((time.monotonic(), idempotency_key, lead))
+        self.metrics["received"] += 1
+        
+        if self._wakeup and len(self._queue) >= self.flush_max_records:
+            self._wakeup.set()
+        
+        return "queued"
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+    
+    @property
+    def lag_ms(self) -> float:
+        """Age of the oldest record still waiting to be written"""
+        if not self._queue:
+            return 0.0
+        return (time.monotonic() - self._queue[0][0]) * 1000
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "queue_depth": self.queue_depth,
+            "lag_ms": round(self.lag_ms, 1),
+            "idempotency_keys": len(self._seen),
+            "running": self._task is not None and not self._task.done()
+        }
+    
+    # Background flusher
+    
+    def start(self) -> None:
+        """Start the flusher on the running event loop (call from app lifespan)"""
+        if self._task and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the flusher and write whatever is still queued"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue:
+            if not await self.flush():
+                break
+    
+    async def _run(self) -> None:
+        interval = self.flush_interval_ms / 1000
+        while True:
+            timeout = interval
+            if self._queue:
+                timeout = max(0.0, interval - self.lag_ms / 1000)
+            
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            
+            if self._queue and (
+                len(self._queue) >= self.flush_max_records or self.lag_ms >= self.flush_interval_ms
+            ):
+                if not await self.flush():
+                    await asyncio.sleep(interval)  # Back off before retrying a failed batch
+    
+    async def flush(self) -> bool:
+        """Write up to flush_max_records queued leads in one transaction"""
+        batch: List[Tuple[float, str, Dict[str, Any]]] = []
+        while self._queue and len(batch) < self.flush_max_records:
+            batch.append(self._queue.popleft())
+        if not batch:
+            return True
+        
+        started = time.perf_counter()
+        try:
+            inserted_ids, updated = await asyncio.to_thread(upsert_leads, [item[2] for item in batch])
+        except Exception as e:
+            self.metrics["flush_failures"] += 1
+            self._retries += 1
+            print(f"❌ Webhook flush failed ({len(batch)} leads, attempt {self._retries}): {e}")
+            
+            if self._retries >= self.max_retries:
+                # Give up on this batch; forget the keys so a resend is accepted
+                for _, key, _ in batch:
+                    self._seen.discard(key)
+                self.metrics["dropped"] += len(batch)
+                self._retries = 0
+            else:
+                self._queue.extendleft(reversed(batch))
+            return False
+        
+        self._retries = 0
+        self.metrics["flushed"] += len(batch)
+        self.metrics["inserted"] += len(inserted_ids)
+        self.metrics["updated"] += updated
+        self.metrics["flush_batches"] += 1
+        self.metrics["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.metrics["last_flush_at"] = datetime.utcnow().isoformat()
+        
+        # New leads go to the owner's team routing (a no-op for teams without it)
+        if inserted_ids:
+            await asyncio.to_thread(lead_router.route_leads, inserted_ids)
+        return True
+
+# Singleton instance
+webhook_ingestor = WebhookIngestor(
+    flush_max_records=settings.WEBHOOK_FLUSH_MAX_RECORDS,
+    flush_interval_ms=settings.WEBHOOK_FLUSH_INTERVAL_MS,
+    max_queue=settings.WEBHOOK_QUEUE_MAX
+)
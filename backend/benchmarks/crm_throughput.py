@@ -0,0 +1,176 @@
+"""
+CRM Throughput Benchmark
+Measures leads/sec through app/crm against the local fake CRM server
+
+Scenarios:
+    full_sync         iter_leads over the whole account
+    incremental_sync  iter_leads(updated_since=...) over the recently updated slice
+    bulk_writes       concurrent create_lead calls
+
+Run from backend/:
+    python -m benchmarks.crm_throughput --leads 5000 --latency-ms 20
+    python -m benchmarks.crm_throughput --min-rate full_sync=2000 --json bench.json
+
+With --min-rate the command exits non-zero when a scenario falls below its
+floor or returns an incomplete result, so it can gate a deploy.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, Any, List
+
+from app.crm import FollowUpBossCRM, BoldTrailCRM, CRM_Handler
+from benchmarks.fake_crm import FakeCRMServer
+
+def build_handler(provider: str, server: FakeCRMServer) -> CRM_Handler:
+    if provider == "followupboss":
+        handler = FollowUpBossCRM({"api_key": "fake-key"})
+    elif provider == "boldtrail":
+        handler = BoldTrailCRM({"zapier_key": "fake-zapier-key"})
+    elif provider == "boldtrail-api":
+        handler = BoldTrailCRM({"api_key": "fake-jwt"})
+    else:
+        raise ValueError(f"Unknown provider: {provider}")
+    handler.transport = server.transport()
+    return handler
+
+def _result(scenario: str, provider: str, count: int, expected: int,
+            elapsed: float, server: FakeCRMServer) -> Dict[str, Any]:
+    return {
+        "scenario": scenario,
+        "provider": provider,
+        "leads": count,
+        "expected": expected,
+        "complete": count == expected,
+        "seconds": round(elapsed, 3),
+        "leads_per_sec": round(count / elapsed, 1) if elapsed else 0.0,
+        "requests": server.stats["requests"],
+        "rate_limited": server.stats["rate_limited"],
+        "errors_injected": server.stats["errors_injected"]
+    }
+
+def _fresh_server(args) -> FakeCRMServer:
+    return FakeCRMServer(
+        lead_count=args.leads,
+        latency_ms=args.latency_ms,
+        max_page_size=args.server_page_size,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=0
+    )
+
+async def bench_full_sync(provider: str, args) -> Dict[str, Any]:
+    server = _fresh_server(args)
+    handler = build_handler(provider, server)
+    
+    started = time.perf_counter()
+    count = 0
+    async for _ in handler.iter_leads(page_size=args.page_size):
+        count += 1
+    elapsed = time.perf_counter() - started
+    
+    return _result("full_sync", provider, count, args.leads, elapsed, server)
+
+async def bench_incremental_sync(provider: str, args) -> Dict[str, Any]:
+    server = _fresh_server(args)
+    handler = build_handler(provider, server)
+    
+    started = time.perf_counter()
+    count = 0
+    async for _ in handler.iter_leads(page_size=args.page_size, updated_since=server.incremental_cutoff):
+        count += 1
+    elapsed = time.perf_counter() - started
+    
+    return _result("incremental_sync", provider, count, server.expected_incremental, elapsed, server)
+
+async def bench_bulk_writes(provider: str, args) -> Dict[str, Any]:
+    server = _fresh_server(args)
+    handler = build_handler(provider, server)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    
+    async def create(i: int):
+        async with semaphore:
+            return await handler.create_lead({
+                "first_name": "Bench",
+                "last_name": f"Lead{i}",
+                "email": f"bench{i}@example.com",
+                "tags": ["Benchmark"],
+                "status": "New"
+            })
+    
+    started = time.perf_counter()
+    ids = await asyncio.gather(*[create(i) for i in range(args.writes)])
+    elapsed = time.perf_counter() - started
+    
+    return _result("bulk_writes", provider, sum(1 for i in ids if i), args.writes, elapsed, server)
+
+SCENARIOS = {
+    "full_sync": bench_full_sync,
+    "incremental_sync": bench_incremental_sync,
+    "bulk_writes": bench_bulk_writes
+}
+
+def parse_min_rates(values: List[str]) -> Dict[str, float]:
+    rates = {}
+    for value in values or []:
+        scenario, _, rate = value.partition("=")
+        rates[scenario] = float(rate)
+    return rates
+
+async def run(args) -> List[Dict[str, Any]]:
+    results = []
+    for provider in args.providers:
+        for scenario in args.scenarios:
+            results.append(await SCENARIOS[scenario](provider, args))
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the CRM layer against a fake CRM server")
+    parser.add_argument("--providers", nargs="+", default=["followupboss", "boldtrail"],
+                        choices=["followupboss", "boldtrail", "boldtrail-api"])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--leads", type=int, default=5000, help="Leads in the fake account")
+    parser.add_argument("--writes", type=int, default=500, help="Leads created in bulk_writes")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent writes")
+    parser.add_argument("--page-size", type=int, default=100, help="Page size requested by the client")
+    parser.add_argument("--server-page-size", type=int, default=100, help="Page size cap enforced by the server")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--min-rate", action="append", metavar="SCENARIO=LEADS_PER_SEC",
+                        help="Fail if a scenario is slower than this (repeatable)")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args(argv)
+    
+    results = asyncio.run(run(args))
+    min_rates = parse_min_rates(args.min_rate)
+    failures = []
+    
+    print(f"{'scenario':<18}{'provider':<15}{'leads':>8}{'expected':>10}{'sec':>9}{'leads/sec':>12}{'reqs':>7}{'429s':>6}")
+    for result in results:
+        print(f"{result['scenario']:<18}{result['provider']:<15}{result['leads']:>8}{result['expected']:>10}"
+              f"{result['seconds']:>9}{result['leads_per_sec']:>12}{result['requests']:>7}{result['rate_limited']:>6}")
+        
+        floor = min_rates.get(result["scenario"])
+        if floor is not None and result["leads_per_sec"] < floor:
+            failures.append(f"{result['scenario']}/{result['provider']}: {result['leads_per_sec']} < {floor} leads/sec")
+        if floor is not None and not result["complete"]:
+            failures.append(f"{result['scenario']}/{result['provider']}: {result['leads']} of {result['expected']} leads")
+    
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    
+    if failures:
+        print("\n❌ Performance regression:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
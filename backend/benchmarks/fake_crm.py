@@ -0,0 +1,268 @@
+"""
+Fake CRM Server
+Local stand-in for the Follow Up Boss and BoldTrail (kvCORE) APIs
+
+Serves the same request/response shapes that app/crm/followupboss.py and
+app/crm/boldtrail.py use, through an httpx.MockTransport, so the CRM layer
+can be exercised and benchmarked without touching the real APIs.
+
+Usage:
+    server = FakeCRMServer(lead_count=5000, latency_ms=20, rate_limit_rate=0.02)
+    handler = FollowUpBossCRM({"api_key": "fake"})
+    handler.transport = server.transport()
+    async for lead in handler.iter_leads():
+        ...
+"""
+
+import asyncio
+import json
+import random
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+import httpx
+
+FIRST_NAMES = ["James", "Maria", "Robert", "Linda", "Michael", "Sarah", "David", "Karen", "Daniel", "Lisa"]
+LAST_NAMES = ["Smith", "Garcia", "Johnson", "Brown", "Lee", "Martinez", "Davis", "Lopez", "Wilson", "Clark"]
+CITIES = [("Austin", "TX"), ("Denver", "CO"), ("Phoenix", "AZ"), ("Tampa", "FL"), ("Raleigh", "NC")]
+STAGES = ["New", "Attempted Contact", "Contacted", "Qualified", "Appointment Set"]
+TAGS = ["Zillow Lead", "Buyer", "Seller", "Open House", "Referral"]
+
+class FakeCRMServer:
+    """
+    In-process fake of both CRM APIs
+    
+    Args:
+        lead_count: Number of people/contacts in the fake account
+        latency_ms: Added latency per request
+        max_page_size: Server-side cap on page size (like the real APIs)
+        error_rate: Fraction of requests answered with a 500
+        rate_limit_rate: Fraction of requests answered with a 429
+        retry_after: Retry-After header value (seconds) sent with 429s
+        recent_fraction: Fraction of leads updated in the last hour, the
+            slice an incremental sync should pick up
+        seed: Random seed so runs are reproducible
+    """
+    
+    def __init__(
+        self,
+        lead_count: int = 1000,
+        latency_ms: float = 0.0,
+        max_page_size: int = 100,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 0.0,
+        recent_fraction: float = 0.1,
+        seed: int = 42
+    ):
+        self.latency_ms = latency_ms
+        self.max_page_size = max_page_size
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.incremental_cutoff = self.now - timedelta(hours=1)
+        self.records = self._generate(lead_count, recent_fraction)
+        self._by_id = {record["id"]: record for record in self.records}
+        self._next_id = lead_count + 1
+        
+        self.stats = {
+            "requests": 0,
+            "errors_injected": 0,
+            "rate_limited": 0,
+            "created": 0,
+            "events": 0
+        }
+    
+    def _generate(self, count: int, recent_fraction: float) -> List[Dict[str, Any]]:
+        recent_count = int(count * recent_fraction)
+        records = []
+        for i in range(1, count + 1):
+            first = self._random.choice(FIRST_NAMES)
+            last = self._random.choice(LAST_NAMES)
+            city, state = self._random.choice(CITIES)
+            if i <= recent_count:
+                updated = self.now - timedelta(minutes=self._random.randint(0, 59))
+            else:
+                updated = self.now - timedelta(days=self._random.randint(1, 365))
+            records.append({
+                "id": i,
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "phone": f"512555{i % 10000:04d}",
+                "stage": self._random.choice(STAGES),
+                "tags": self._random.sample(TAGS, 2),
+                "city": city,
+                "state": state,
+                "price_min": 250000,
+                "price_max": 450000,
+                "updated": updated
+            })
+        records.sort(key=lambda record: record["updated"], reverse=True)
+        return records
+    
+    @property
+    def expected_incremental(self) -> int:
+        """How many leads an incremental sync from incremental_cutoff should return"""
+        return sum(1 for record in self.records if record["updated"] >= self.incremental_cutoff)
+    
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+    
+    # Provider shapes
+    
+    def _person(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Follow Up Boss 'person'"""
+        return {
+            "id": record["id"],
+            "firstName": record["first_name"],
+            "lastName": record["last_name"],
+            "emails": [record["email"]],
+            "phones": [{"value": record["phone"]}],
+            "stage": record["stage"],
+            "tags": record["tags"],
+            "addresses": [{"city": record["city"], "state": record["state"]}],
+            "customFields": {"priceRangeMin": record["price_min"], "priceRangeMax": record["price_max"]},
+            "updated": record["updated"].isoformat() + "Z"
+        }
+    
+    def _contact(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """BoldTrail / kvCORE contact"""
+        return {
+            "id": record["id"],
+            "first_name": record["first_name"],
+            "last_name": record["last_name"],
+            "email": record["email"],
+            "phone": record["phone"],
+            "status": record["stage"],
+            "tags": record["tags"],
+            "address": {"city": record["city"], "state": record["state"]},
+            "price_min": record["price_min"],
+            "price_max": record["price_max"],
+            "updated_at": record["updated"].isoformat() + "Z",
+            "custom_fields": {}
+        }
+    
+    def _create(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        record = {
+            "id": self._next_id,
+            "first_name": payload.get("firstName") or payload.get("first_name"),
+            "last_name": payload.get("lastName") or payload.get("last_name"),
+            "email": (payload.get("emails") or [payload.get("email")])[0],
+            "phone": None,
+            "stage": payload.get("stage") or payload.get("status") or "New",
+            "tags": payload.get("tags", []),
+            "city": None,
+            "state": None,
+            "price_min": None,
+            "price_max": None,
+            "updated": datetime.utcnow()
+        }
+        self._next_id += 1
+        self.records.insert(0, record)
+        self._by_id[record["id"]] = record
+        self.stats["created"] += 1
+        return record
+    
+    def _page_size(self, request: httpx.Request, default: int = 100) -> int:
+        try:
+            requested = int(request.url.params.get("limit", default))
+        except ValueError:
+            requested = default
+        return max(1, min(requested, self.max_page_size))
+    
+    # Request handling
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.stats["requests"] += 1
+        
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return httpx.Response(429, headers={"Retry-After": str(self.retry_after)},
+                                  json={"error": "Too Many Requests"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.stats["errors_injected"] += 1
+            return httpx.Response(500, json={"error": "Injected server error"})
+        
+        path = request.url.path
+        method = request.method
+        payload = json.loads(request.content) if request.content else {}
+        
+        # Follow Up Boss (/v1/...)
+        if path == "/v1/users" and method == "GET":
+            return httpx.Response(200, json={"users": [{"id": 1}]})
+        
+        if path == "/v1/people" and method == "GET":
+            limit = self._page_size(request)
+            offset = int(request.url.params.get("offset", 0))
+            page = self.records[offset:offset + limit]
+            return httpx.Response(200, json={
+                "_metadata": {"offset": offset, "limit": limit, "total": len(self.records)},
+                "people": [self._person(record) for record in page]
+            })
+        
+        if path == "/v1/people" and method == "POST":
+            return httpx.Response(201, json=self._person(self._create(payload)))
+        
+        match = re.fullmatch(r"/v1/people/(\d+)", path)
+        if match:
+            record = self._by_id.get(int(match.group(1)))
+            if not record:
+                return httpx.Response(404, json={"error": "Not found"})
+            if method == "PUT":
+                if "stage" in payload:
+                    record["stage"] = payload["stage"]
+                if "tags" in payload:
+                    record["tags"] = payload["tags"]
+            return httpx.Response(200, json=self._person(record))
+        
+        if path == "/v1/events" and method == "POST":
+            self.stats["events"] += 1
+            return httpx.Response(201, json={"id": self.stats["events"]})
+        
+        # BoldTrail / kvCORE
+        match = re.fullmatch(r"/export/leads/([^/]+)/(\d+)", path)
+        if match and method == "GET":
+            page_number = int(match.group(2))
+            start = (page_number - 1) * self.max_page_size
+            page = self.records[start:start + self.max_page_size]
+            return httpx.Response(200, json=[self._contact(record) for record in page])
+        
+        if path in ("/public/leads", "/v2/leads", "/leads") and method == "GET":
+            limit = self._page_size(request)
+            page_number = int(request.url.params.get("page", 1))
+            start = (page_number - 1) * limit
+            page = self.records[start:start + limit]
+            return httpx.Response(200, json={"leads": [self._contact(record) for record in page]})
+        
+        if path == "/v2/public/users/me" and method == "GET":
+            return httpx.Response(200, json={"id": 1})
+        
+        if path == "/contacts" and method == "POST":
+            return httpx.Response(201, json=self._contact(self._create(payload)))
+        
+        match = re.fullmatch(r"/contacts/(\d+)", path)
+        if match:
+            record = self._by_id.get(int(match.group(1)))
+            if not record:
+                return httpx.Response(404, json={"error": "Not found"})
+            if method == "PATCH":
+                if "status" in payload:
+                    record["stage"] = payload["status"]
+                if "tags" in payload:
+                    record["tags"] = payload["tags"]
+            return httpx.Response(200, json=self._contact(record))
+        
+        if path == "/activities" and method == "POST":
+            self.stats["events"] += 1
+            return httpx.Response(201, json={"id": self.stats["events"]})
+        
+        return httpx.Response(404, json={"error": f"No fake route for {method} {path}"})
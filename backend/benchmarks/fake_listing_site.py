@@ -0,0 +1,180 @@
+"""
+Fake Listing Site
+Local stand-in for the Zillow FSBO and Craigslist search pages
+
+Serves the recorded pages in benchmarks/fixtures/hunter/ through an
+httpx.MockTransport, so The Hunter can be crawled end to end without
+touching the real sites. Each URL gets its own copy of a fixture with the
+ZIP / city and listing URLs rewritten, so every ZIP and city yields distinct
+listings, like the real search results would.
+
+Usage:
+    site = FakeListingSite(latency_ms=50, max_rps_per_host=5)
+    hunter_scraper.transport = site.transport()
+    async for lead in hunter_scraper.crawl(zip_codes=["78701", "78702"]):
+        ...
+"""
+
+import asyncio
+import hashlib
+import os
+import random
+import re
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "hunter")
+
+# Recorded pages per site; a URL is served one of these, picked by weight
+CORPUS: Dict[str, List[tuple]] = {
+    "zillow": [
+        ("zillow_fsbo_small.html", 6),
+        ("zillow_fsbo_large.html", 1),
+        ("zillow_fsbo_empty.html", 1)
+    ],
+    "craigslist": [
+        ("craigslist_reo.html", 1),
+        ("craigslist_reo_small.html", 3)
+    ]
+}
+
+_ZILLOW_ZIP_RE = re.compile(r"(<address[^>]*>[^<]*?\b[A-Z]{2} )\d{5}(</address>)")
+_ZILLOW_ZPID_RE = re.compile(r"/homedetails/(\d+)_zpid/")
+_ZILLOW_PATH_RE = re.compile(r"/homes/for_sale/fsbo/(\d{5})_rb/")
+_CRAIGSLIST_HOST_RE = re.compile(r"https://[a-z]+\.craigslist\.org/")
+
+class FakeListingSite:
+    """
+    In-process fake of both listing sites
+    
+    Args:
+        latency_ms: Added latency per request
+        jitter_ms: Random extra latency, up to this much
+        max_rps_per_host: Requests per second a host allows before answering
+            429 (like the real sites' throttling); None disables it
+        retry_after: Retry-After header value (seconds) sent with 429s
+        error_rate: Fraction of requests answered with a 500
+        etags: Send ETags and answer If-None-Match with 304
+        seed: Random seed so runs are reproducible
+    """
+    
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        max_rps_per_host: Optional[float] = None,
+        retry_after: float = 1.0,
+        error_rate: float = 0.0,
+        etags: bool = True,
+        seed: int = 42
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.max_rps_per_host = max_rps_per_host
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.etags = etags
+        self._random = random.Random(seed)
+        
+        self._fixtures = {
+            site: [(self._load(name), weight) for name, weight in pages]
+            for site, pages in CORPUS.items()
+        }
+        self._pages: Dict[str, tuple] = {}  # url -> (body, etag)
+        self._recent: Dict[str, deque] = {}  # host -> request times in the last second
+        
+        self.stats = {
+            "requests": 0,
+            "pages_served": 0,
+            "not_modified": 0,
+            "rate_limited": 0,
+            "errors_injected": 0,
+            "bytes_served": 0
+        }
+    
+    @staticmethod
+    def _load(name: str) -> str:
+        with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+            return f.read()
+    
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+    
+    # Pages
+    
+    def _pick(self, site: str, url: str) -> str:
+        # Seeded by the URL so a page's content is the same on every crawl
+        pages = self._fixtures[site]
+        rng = random.Random(hashlib.sha1(url.encode()).hexdigest())
+        return rng.choices([body for body, _ in pages], weights=[weight for _, weight in pages])[0]
+    
+    def page(self, url: httpx.URL) -> Optional[tuple]:
+        """(body, etag) for a search URL, or None if it isn't one"""
+        key = str(url)
+        if key in self._pages:
+            return self._pages[key]
+        
+        host = url.host
+        if host.endswith("zillow.com"):
+            match = _ZILLOW_PATH_RE.search(url.path)
+            if not match:
+                return None
+            zip_code = match.group(1)
+            body = _ZILLOW_ZIP_RE.sub(lambda m: f"{m.group(1)}{zip_code}{m.group(2)}", self._pick("zillow", key))
+            body = _ZILLOW_ZPID_RE.sub(lambda m: f"/homedetails/{zip_code}{m.group(1)}_zpid/", body)
+        elif host.endswith("craigslist.org") and url.path.startswith("/search/reo"):
+            body = _CRAIGSLIST_HOST_RE.sub(f"https://{host}/", self._pick("craigslist", key))
+        else:
+            return None
+        
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()[:16]}"'
+        self._pages[key] = (body, etag)
+        return self._pages[key]
+    
+    def _throttled(self, host: str) -> bool:
+        if not self.max_rps_per_host:
+            return False
+        now = time.monotonic()
+        recent = self._recent.setdefault(host, deque())
+        while recent and now - recent[0] >= 1.0:
+            recent.popleft()
+        if len(recent) >= self.max_rps_per_host:
+            return True
+        recent.append(now)
+        return False
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.stats["requests"] += 1
+        
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep((self.latency_ms + self._random.random() * self.jitter_ms) / 1000)
+        
+        if self._throttled(request.url.host):
+            self.stats["rate_limited"] += 1
+            return httpx.Response(429, headers={"Retry-After": str(self.retry_after)}, text="Too Many Requests")
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats["errors_injected"] += 1
+            return httpx.Response(500, text="Injected server error")
+        
+        page = self.page(request.url)
+        if page is None:
+            return httpx.Response(404, text="Not Found")
+        body, etag = page
+        
+        if self.etags and request.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            return httpx.Response(304, headers={"ETag": etag})
+        
+        content = body.encode()
+        self.stats["pages_served"] += 1
+        self.stats["bytes_served"] += len(content)
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if self.etags:
+            headers["ETag"] = etag
+        return httpx.Response(200, headers=headers, content=content)
+    
+    def summary(self) -> Dict[str, Any]:
+        return dict(self.stats)
@@ -0,0 +1,99 @@
+"""
+Hunter Parse Benchmark
+Times each listing parser backend over the saved fixture pages
+
+Fixtures live in benchmarks/fixtures/hunter/. Every backend's output is
+checked against BeautifulSoup's before timing, so a faster backend can't
+win by parsing less.
+
+Run from backend/:
+    python -m benchmarks.hunter_parse --repeat 20
+    python -m benchmarks.hunter_parse --pool-pages 32   # also time the process pool
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from app.services import listing_parser
+from app.services.listing_parser import (
+    ZILLOW_SOURCE, CRAIGSLIST_SOURCE, PARSERS, parse_listing_page, parse_listing_page_async
+)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "hunter")
+
+# fixture file -> (source, parse kwargs)
+FIXTURES: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "zillow_fsbo_small.html": (ZILLOW_SOURCE, {"zip_code": "78701"}),
+    "zillow_fsbo_large.html": (ZILLOW_SOURCE, {"zip_code": "78701"}),
+    "craigslist_reo.html": (CRAIGSLIST_SOURCE, {"city": "austin", "state": "tx"})
+}
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+def time_backend(backend: str, source: str, html: str, kwargs: Dict[str, str], repeat: int) -> Tuple[float, int]:
+    """Best-of-repeat seconds per page, and listings found"""
+    best = None
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = len(parse_listing_page(source, html, backend=backend, **kwargs))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+async def time_pool(source: str, html: str, kwargs: Dict[str, str], pages: int, threshold: int) -> float:
+    """Wall time to parse `pages` copies of a page concurrently with the given pool threshold"""
+    listing_parser.settings.HUNTER_PARSE_PROCESS_THRESHOLD_BYTES = threshold
+    # Warm the pool so process start-up isn't counted
+    await parse_listing_page_async(source, html, **kwargs)
+    started = time.perf_counter()
+    await asyncio.gather(*[parse_listing_page_async(source, html, **kwargs) for _ in range(pages)])
+    return time.perf_counter() - started
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Hunter listing parser backends")
+    parser.add_argument("--backends", nargs="+", default=list(PARSERS), choices=list(PARSERS))
+    parser.add_argument("--repeat", type=int, default=10, help="Parses per fixture per backend (best is reported)")
+    parser.add_argument("--pool-pages", type=int, default=0,
+                        help="Also parse this many large pages inline vs in the process pool")
+    args = parser.parse_args(argv)
+    
+    mismatches: List[str] = []
+    print(f"{'fixture':<26}{'backend':<12}{'KB':>7}{'listings':>10}{'ms/page':>10}{'speedup':>9}")
+    for name, (source, kwargs) in FIXTURES.items():
+        html = load_fixture(name)
+        reference = parse_listing_page(source, html, backend="bs4", **kwargs)
+        baseline = None
+        for backend in ["bs4"] + [b for b in args.backends if b != "bs4"]:
+            if backend != "bs4" and parse_listing_page(source, html, backend=backend, **kwargs) != reference:
+                mismatches.append(f"{name}/{backend}")
+            seconds, count = time_backend(backend, source, html, kwargs, args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:<26}{backend:<12}{len(html) // 1024:>7}{count:>10}"
+                  f"{seconds * 1000:>10.2f}{baseline / seconds:>8.1f}x")
+        print()
+    
+    if args.pool_pages:
+        source, kwargs = FIXTURES["zillow_fsbo_large.html"]
+        html = load_fixture("zillow_fsbo_large.html")
+        inline = asyncio.run(time_pool(source, html, kwargs, args.pool_pages, threshold=0))
+        pooled = asyncio.run(time_pool(source, html, kwargs, args.pool_pages, threshold=1))
+        listing_parser.shutdown_parse_pool()
+        print(f"{args.pool_pages} large pages: inline {inline:.2f}s, process pool {pooled:.2f}s")
+    
+    if mismatches:
+        print("\n❌ Backends disagree with BeautifulSoup:")
+        for mismatch in mismatches:
+            print(f"   {mismatch}")
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Hunter Pipeline Benchmark
+Runs crawl -> parse -> dedupe -> skip trace against the fake listing site
+
+Each pass crawls every ZIP and city through the real HunterScraper,
+ListingIndex and SkipTraceEnricher, using a throwaway SQLite database and
+the stub skip-trace provider. Pass 1 is a cold crawl; later passes re-crawl
+the same pages, so they show what the HTTP cache and the seen-listings index
+save on a daily run.
+
+Run from backend/:
+    python -m benchmarks.hunter_pipeline --zips 50 --cities 10 --latency-ms 50
+    python -m benchmarks.hunter_pipeline --max-rps-per-host 5 --host-interval 0.2
+    python -m benchmarks.hunter_pipeline --min-rate pages=50 --min-rate listings=1000 --json bench.json
+
+With --min-rate the command exits non-zero when the cold pass falls below a
+floor, so it can gate a deploy.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.hunter import SeenListing, SkipTraceResult
+from app.services import listing_parser
+from app.services.http_cache import HTTPResponseCache
+from app.services.hunter import HunterScraper, HostRateLimiter, CrawlStats
+from app.services.listing_index import ListingIndex
+from app.services.skip_trace import SkipTraceEnricher, StubSkipTraceProvider, SkipTraceRunStats
+from benchmarks.fake_listing_site import FakeListingSite
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def build_markets(zips: int, cities: int) -> tuple:
+    zip_codes = [f"{78700 + i:05d}" for i in range(zips)]
+    craigslist_cities = [(f"city{i}", "tx") for i in range(cities)]
+    return zip_codes, craigslist_cities
+
+async def run_pass(args, scraper: HunterScraper, index: ListingIndex, enricher: SkipTraceEnricher) -> Dict[str, Any]:
+    zip_codes, craigslist_cities = build_markets(args.zips, args.cities)
+    crawl_stats = CrawlStats()
+    trace_stats = SkipTraceRunStats()
+    limiter = HostRateLimiter(min_interval=args.host_interval, per_host_concurrency=args.host_concurrency)
+    
+    started = time.perf_counter()
+    first_lead = None
+    leads = index.filter_new(
+        scraper.crawl(
+            zip_codes, craigslist_cities,
+            max_concurrency=args.concurrency,
+            limiter=limiter,
+            stats=crawl_stats
+        ),
+        user_id=1
+    )
+    leads = enricher.enrich_stream(leads, batch_size=args.trace_batch, stats=trace_stats)
+    
+    new_leads = 0
+    with_owner = 0
+    async for lead in leads:
+        if first_lead is None:
+            first_lead = time.perf_counter() - started
+        new_leads += 1
+        with_owner += 1 if lead.owner_name else 0
+    seconds = time.perf_counter() - started
+    
+    return {
+        "seconds": round(seconds, 2),
+        "pages": crawl_stats.pages_fetched,
+        "pages_per_sec": round(crawl_stats.pages_fetched / seconds, 1) if seconds else 0.0,
+        "listings": crawl_stats.listings_found,
+        "listings_per_sec": round(crawl_stats.listings_found / seconds, 1) if seconds else 0.0,
+        "new_leads": new_leads,
+        "with_owner": with_owner,
+        "first_lead_sec": round(first_lead, 2) if first_lead is not None else None,
+        "unchanged_pages": crawl_stats.pages_unchanged,
+        "failed_pages": crawl_stats.pages_failed,
+        "rate_limited": crawl_stats.rate_limited,
+        "mb_downloaded": round(crawl_stats.bytes_downloaded / (1024 * 1024), 2),
+        "skip_traced": trace_stats.traced,
+        "skip_trace_batches": trace_stats.batches,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+async def run(args, workdir: str) -> List[Dict[str, Any]]:
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'hunter_bench.db')}")
+    Base.metadata.create_all(bind=engine, tables=[SeenListing.__table__, SkipTraceResult.__table__])
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    
+    site = FakeListingSite(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        max_rps_per_host=args.max_rps_per_host,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate
+    )
+    scraper = HunterScraper()
+    scraper.transport = site.transport()
+    scraper.http_cache = None if args.no_cache else HTTPResponseCache(os.path.join(workdir, "http_cache"))
+    index = ListingIndex(session_factory=session_factory)
+    enricher = SkipTraceEnricher(
+        provider=StubSkipTraceProvider(latency_ms=args.trace_latency_ms),
+        session_factory=session_factory
+    )
+    
+    results = []
+    try:
+        for number in range(1, args.passes + 1):
+            result = await run_pass(args, scraper, index, enricher)
+            result["pass"] = number
+            results.append(result)
+    finally:
+        listing_parser.shutdown_parse_pool()
+        engine.dispose()
+    return results
+
+def parse_min_rates(values: List[str]) -> Dict[str, float]:
+    rates = {}
+    for value in values or []:
+        metric, _, rate = value.partition("=")
+        if metric not in ("pages", "listings") or not rate:
+            raise SystemExit(f"--min-rate expects pages=N or listings=N, got {value!r}")
+        rates[metric] = float(rate)
+    return rates
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark The Hunter end to end against a fake listing site")
+    parser.add_argument("--zips", type=int, default=50, help="Zillow ZIP codes to crawl")
+    parser.add_argument("--cities", type=int, default=10, help="Craigslist cities to crawl")
+    parser.add_argument("--passes", type=int, default=2, help="Crawls of the same market (pass 1 is cold)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight across all hosts")
+    parser.add_argument("--host-concurrency", type=int, default=2, help="Requests in flight per host")
+    parser.add_argument("--host-interval", type=float, default=0.0, help="Scraper's gap between requests to one host")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--max-rps-per-host", type=float, default=None, help="Site answers 429 above this rate")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--trace-latency-ms", type=float, default=20.0, help="Stub skip-trace latency per batch")
+    parser.add_argument("--trace-batch", type=int, default=200, help="Leads per enrichment chunk")
+    parser.add_argument("--parser", choices=["auto"] + list(listing_parser.PARSERS), default=None,
+                        help="Listing parser backend (default: HUNTER_PARSER_BACKEND)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the HTTP response cache")
+    parser.add_argument("--min-rate", action="append", metavar="pages|listings=PER_SEC",
+                        help="Fail if the cold pass is slower than this (repeatable)")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args(argv)
+    
+    if args.parser:
+        listing_parser.settings.HUNTER_PARSER_BACKEND = args.parser
+    min_rates = parse_min_rates(args.min_rate)
+    
+    baseline_rss = peak_rss_mb()
+    with tempfile.TemporaryDirectory(prefix="hunter_bench_") as workdir:
+        results = asyncio.run(run(args, workdir))
+    
+    print(f"{args.zips} ZIPs + {args.cities} cities, parser {listing_parser.resolve_backend()}, "
+          f"baseline RSS {baseline_rss} MB")
+    print(f"{'pass':<6}{'sec':>8}{'pages':>7}{'pages/s':>9}{'listings':>10}{'list/s':>9}{'new':>7}"
+          f"{'1st(s)':>8}{'304s':>6}{'429s':>6}{'MB':>7}{'RSS MB':>8}")
+    for result in results:
+        print(f"{result['pass']:<6}{result['seconds']:>8}{result['pages']:>7}{result['pages_per_sec']:>9}"
+              f"{result['listings']:>10}{result['listings_per_sec']:>9}{result['new_leads']:>7}"
+              f"{result['first_lead_sec'] if result['first_lead_sec'] is not None else '-':>8}"
+              f"{result['unchanged_pages']:>6}{result['rate_limited']:>6}{result['mb_downloaded']:>7}"
+              f"{result['peak_rss_mb']:>8}")
+    
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"baseline_rss_mb": baseline_rss, "passes": results}, f, indent=2)
+    
+    failures = []
+    cold = results[0] if results else None
+    if cold:
+        if min_rates.get("pages") is not None and cold["pages_per_sec"] < min_rates["pages"]:
+            failures.append(f"pages: {cold['pages_per_sec']} < {min_rates['pages']} pages/sec")
+        if min_rates.get("listings") is not None and cold["listings_per_sec"] < min_rates["listings"]:
+            failures.append(f"listings: {cold['listings_per_sec']} < {min_rates['listings']} listings/sec")
+        if min_rates and cold["failed_pages"]:
+            failures.append(f"{cold['failed_pages']} pages failed")
+    
+    if failures:
+        print("\n❌ Performance regression:")
+        for failure in failures:
+            print(f"   {failure}")
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
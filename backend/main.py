@@ -9,8 +9,17 @@ from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import init_db
-from app.api.routes import test, auth, teams, team_leads, activities, google_oauth, tasks, campaigns, gmail
+from app.core.tenancy import check_tenant_indexes
+from app.api.routes import test, auth, teams, team_leads, activities, google_oauth, tasks, campaigns, gmail, crm, webhooks, hunter
 from app.api.routes import leads as leads_routes
+from app.services.webhook_ingest import webhook_ingestor
+from app.services.listing_parser import shutdown_parse_pool
+from app.services.hunter_scheduler import hunter_scheduler
+from app.services.team_stats import team_stats_reconciler
+from app.services import team_events
+from app.services.lead_routing import lead_router
+from app.services.calendar_sync import calendar_sync
+from app.integrations.google_calendar import close_shared_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -27,13 +36,50 @@ async def lifespan(app: FastAPI):
             migrate()
         except Exception as e:
             print(f"⚠️ Migration warning (may already be applied): {e}")
+        
+        # Seed the team activity feed from existing history (first run only)
+        try:
+            team_events.backfill()
+        except Exception as e:
+            print(f"⚠️ Team events backfill warning: {e}")
             
     except Exception as e:
         print(f"⚠️ Database initialization error: {e}")
     
+    # Every tenant-scoped query needs a composite index led by its tenant column
+    missing_indexes = check_tenant_indexes()
+    if missing_indexes:
+        message = f"Tenant columns without a composite index: {', '.join(missing_indexes)}"
+        if settings.TENANT_INDEX_STRICT:
+            raise RuntimeError(message)
+        print(f"⚠️ {message}")
+    
+    # Background flusher for buffered webhook leads
+    webhook_ingestor.start()
+    
+    # Daily Hunter crawl (off unless HUNTER_SCHEDULER_ENABLED)
+    if settings.HUNTER_SCHEDULER_ENABLED:
+        hunter_scheduler.start()
+    
+    # Periodic team_stats recount (off if TEAM_STATS_RECONCILE_INTERVAL_MINUTES is 0)
+    team_stats_reconciler.start()
+    
+    # Lead routing response timers (re-armed from leads.response_due_at)
+    lead_router.start()
+    
+    # Task invite RSVPs from Google Calendar (off if CALENDAR_SYNC_INTERVAL_MINUTES is 0)
+    calendar_sync.start()
+    
     yield
     
     # Shutdown
+    await webhook_ingestor.stop()
+    await hunter_scheduler.stop()
+    await team_stats_reconciler.stop()
+    await lead_router.stop()
+    await calendar_sync.stop()
+    await close_shared_client()
+    shutdown_parse_pool()
     print("👋 AgentAssist API shutting down")
 
 app = FastAPI(
@@ -63,6 +109,9 @@ app.include_router(team_leads.router, prefix="/api/team-leads", tags=["Team Lead
 app.include_router(tasks.router, prefix="/api/tasks", tags=["Tasks"])
 app.include_router(campaigns.router, prefix="/api/campaigns", tags=["Campaigns"])
 app.include_router(gmail.router, prefix="/api/gmail", tags=["Gmail"])
+app.include_router(crm.router, prefix="/api/crm", tags=["CRM"])
+app.include_router(webhooks.router, prefix="/api/webhooks", tags=["Webhooks"])
+app.include_router(hunter.router, prefix="/api/hunter", tags=["The Hunter"])
 
 @app.get("/")
 async def root():